@@ -0,0 +1,319 @@
+# core/bitmask.py
+# Compact card encoding for search and simulation
+# A hand is an int where bit i is the card with card_strength i:
+# bit 0 = 3♠, bit 1 = 3♣, ..., bit 51 = 2♥ (rank value * 4 + suit)
+# A play is a tuple (mask, kind, size, top) where top is the bit of its strongest card
+
+from core.card import Card
+from core.rules import card_strength
+
+FULL_DECK = (1 << 52) - 1
+THREE_OF_SPADES = 1
+TWO_RANK = 12
+TWOS_MASK = 0xF << (4 * TWO_RANK)
+
+# Rank values (0 = 3 ... 12 = 2) back to Card ranks
+RANK_VALUE_TO_RANK = [3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 2]
+SUIT_SYMBOLS = ["♠", "♣", "♦", "♥"]
+
+# Play kinds
+SINGLE = 1
+PAIR = 2
+TRIPLE = 3
+QUADRUPLE = 4
+STRAIGHT = 5
+CONSECUTIVE_PAIRS = 6
+
+PLAY_TYPE_NAMES = {
+    SINGLE: "single",
+    PAIR: "pair",
+    TRIPLE: "triple",
+    QUADRUPLE: "quadruple",
+    STRAIGHT: "straight",
+    CONSECUTIVE_PAIRS: "consecutive_pairs"
+}
+PLAY_TYPE_CODES = {name: kind for kind, name in PLAY_TYPE_NAMES.items()}
+BOMB_KINDS = (QUADRUPLE, CONSECUTIVE_PAIRS)
+GROUP_KINDS = {1: SINGLE, 2: PAIR, 3: TRIPLE, 4: QUADRUPLE}
+
+# Per-nibble lookup tables (a nibble is the four suits of one rank)
+NIBBLE_COUNT = [bin(n).count("1") for n in range(16)]
+NIBBLE_HIGH = [n.bit_length() - 1 for n in range(16)]
+NIBBLE_LOW = [(n & -n).bit_length() - 1 for n in range(16)]
+# NIBBLE_LOWEST[n][k] = the k lowest suits of nibble n (0 if it has fewer)
+NIBBLE_LOWEST = []
+# NIBBLE_SUBSETS[n][k] = every k-card subset of nibble n
+NIBBLE_SUBSETS = []
+for _n in range(16):
+    _lowest = [0] * 5
+    _bits = [1 << b for b in range(4) if _n >> b & 1]
+    for _k in range(1, len(_bits) + 1):
+        _lowest[_k] = sum(_bits[:_k])
+    NIBBLE_LOWEST.append(_lowest)
+    _subsets = [[] for _ in range(5)]
+    for _sub in range(1, 16):
+        if _sub & _n == _sub:
+            _subsets[NIBBLE_COUNT[_sub]].append(_sub)
+    NIBBLE_SUBSETS.append(_subsets)
+
+
+# ===== ENCODING =====
+
+def card_bit(card):
+    """Bit for a single Card"""
+    return 1 << card_strength(card)
+
+def cards_to_mask(cards):
+    """Encode a list of Cards as a bitmask"""
+    mask = 0
+    for card in cards:
+        mask |= 1 << card_strength(card)
+    return mask
+
+def mask_to_cards(mask):
+    """Decode a bitmask into new Card objects, weakest first"""
+    cards = []
+    while mask:
+        low = mask & -mask
+        index = low.bit_length() - 1
+        cards.append(Card(RANK_VALUE_TO_RANK[index >> 2], SUIT_SYMBOLS[index & 3]))
+        mask ^= low
+    return cards
+
+def select_cards(hand_cards, mask):
+    """Pick the Card objects of a hand that are set in mask"""
+    return [card for card in hand_cards if mask >> card_strength(card) & 1]
+
+def rank_nibbles(mask):
+    """Return the 13 per-rank suit nibbles of a mask"""
+    return [(mask >> (4 * r)) & 0xF for r in range(13)]
+
+def rank_counts(mask):
+    """Return the number of cards held in each of the 13 ranks"""
+    return [NIBBLE_COUNT[(mask >> (4 * r)) & 0xF] for r in range(13)]
+
+
+# ===== CLASSIFICATION =====
+
+def classify(mask):
+    """
+    Classify a card mask as a play tuple (mask, kind, size, top)
+    Returns None if the cards are not a valid combination (same rules as rules.get_play_type)
+    """
+    size = mask.bit_count()
+    if size == 0:
+        return None
+    top = mask.bit_length() - 1
+    low_rank = ((mask & -mask).bit_length() - 1) >> 2
+    high_rank = top >> 2
+
+    if low_rank == high_rank:
+        return (mask, GROUP_KINDS[size], size, top)
+
+    if size < 3 or high_rank == TWO_RANK:
+        return None
+
+    span = high_rank - low_rank + 1
+    per_rank = 0
+    for r in range(low_rank, high_rank + 1):
+        count = NIBBLE_COUNT[(mask >> (4 * r)) & 0xF]
+        if per_rank == 0:
+            per_rank = count
+        if count != per_rank:
+            return None
+    if per_rank == 1 and span == size:
+        return (mask, STRAIGHT, size, top)
+    if per_rank == 2 and span >= 3 and span * 2 == size:
+        return (mask, CONSECUTIVE_PAIRS, size, top)
+    return None
+
+def classify_cards(cards):
+    """Classify a list of Cards as a play tuple (or None)"""
+    return classify(cards_to_mask(cards))
+
+def is_bomb_play(play):
+    return play[1] in BOMB_KINDS
+
+def bomb_strength(play):
+    """Same ordering as rules._compare_bombs: top rank first, then length"""
+    return (play[3] >> 2) * 100 + play[2]
+
+def beats_play(play, table):
+    """
+    Bitmask version of rules.beats for two play tuples
+    table=None means the table is empty
+    """
+    if table is None:
+        return True
+
+    play_bomb = play[1] in BOMB_KINDS
+    table_bomb = table[1] in BOMB_KINDS
+    table_has_two = table[0] & TWOS_MASK
+
+    if play_bomb and table_bomb:
+        return bool(table_has_two) and bomb_strength(play) > bomb_strength(table)
+    if play_bomb:
+        return bool(table_has_two)
+    if table_bomb:
+        return False
+    if play[1] != table[1]:
+        return False
+    if play[1] == STRAIGHT and play[2] != table[2]:
+        return False
+    return play[3] > table[3]
+
+
+# ===== MOVE GENERATION =====
+
+def _group_plays(nibbles, size, min_top, plays):
+    kind = GROUP_KINDS[size]
+    for r in range(13):
+        nibble = nibbles[r]
+        if NIBBLE_COUNT[nibble] < size:
+            continue
+        shift = 4 * r
+        for sub in NIBBLE_SUBSETS[nibble][size]:
+            top = shift + NIBBLE_HIGH[sub]
+            if top > min_top:
+                plays.append((sub << shift, kind, size, top))
+
+def _run_plays(nibbles, width, exact_ranks, min_top, plays):
+    """Straights (width=1) and consecutive pairs (width=2)"""
+    kind = STRAIGHT if width == 1 else CONSECUTIVE_PAIRS
+    min_ranks = 3
+    for start in range(TWO_RANK):
+        base = 0
+        r = start
+        while r < TWO_RANK and NIBBLE_COUNT[nibbles[r]] >= width:
+            length = r - start + 1
+            if length >= min_ranks and (exact_ranks is None or length == exact_ranks):
+                # Weakest suits below the top rank; every choice at the top rank,
+                # since only the top card decides what the run beats
+                shift = 4 * r
+                for sub in NIBBLE_SUBSETS[nibbles[r]][width]:
+                    top = shift + NIBBLE_HIGH[sub]
+                    if top > min_top:
+                        plays.append((base | (sub << shift), kind, length * width, top))
+            base |= NIBBLE_LOWEST[nibbles[r]][width] << (4 * r)
+            r += 1
+
+def _bomb_plays(nibbles, table, plays):
+    strength = bomb_strength(table) if table[1] in BOMB_KINDS else -1
+    candidates = []
+    _group_plays(nibbles, 4, -1, candidates)
+    _run_plays(nibbles, 2, None, -1, candidates)
+    for play in candidates:
+        if bomb_strength(play) > strength:
+            plays.append(play)
+
+def generate_plays(hand, table=None, must_include=0):
+    """
+    List the legal plays from a hand mask against a table play (None = lead)
+    Runs use the weakest suits below their top rank, so equivalent
+    variants that only swap low cards are not listed separately.
+    """
+    nibbles = rank_nibbles(hand)
+    plays = []
+
+    if table is None:
+        for size in (1, 2, 3, 4):
+            _group_plays(nibbles, size, -1, plays)
+        _run_plays(nibbles, 1, None, -1, plays)
+        _run_plays(nibbles, 2, None, -1, plays)
+    else:
+        kind = table[1]
+        table_has_two = table[0] & TWOS_MASK
+        if kind in BOMB_KINDS:
+            if table_has_two:
+                _bomb_plays(nibbles, table, plays)
+        else:
+            if kind == STRAIGHT:
+                _run_plays(nibbles, 1, table[2], table[3], plays)
+            else:
+                _group_plays(nibbles, table[2], table[3], plays)
+            if table_has_two:
+                _bomb_plays(nibbles, table, plays)
+
+    if must_include:
+        plays = [play for play in plays if play[0] & must_include]
+    return plays
+
+
+# ===== FAST PLAYOUT POLICY =====
+
+def lead_play(hand):
+    """
+    Cheap lead for playouts: shed the weakest rank, as the longest
+    straight starting there if there is one, otherwise all its cards
+    """
+    low_rank = ((hand & -hand).bit_length() - 1) >> 2
+    r = low_rank
+    run = 0
+    while r < TWO_RANK:
+        nibble = (hand >> (4 * r)) & 0xF
+        if not nibble:
+            break
+        run |= NIBBLE_LOWEST[nibble][1] << (4 * r)
+        r += 1
+    length = r - low_rank
+    if length >= 3:
+        return (run, STRAIGHT, length, run.bit_length() - 1)
+    shift = 4 * low_rank
+    group = hand & (0xF << shift)
+    size = NIBBLE_COUNT[group >> shift]
+    return (group, GROUP_KINDS[size], size, group.bit_length() - 1)
+
+def smallest_beating_play(hand, table):
+    """Weakest play from hand that beats table, or None (bombs only on 2s)"""
+    kind = table[1]
+    top = table[3]
+
+    if kind == SINGLE:
+        above = hand >> (top + 1) << (top + 1)
+        if above:
+            low = above & -above
+            return (low, SINGLE, 1, low.bit_length() - 1)
+    elif kind == PAIR or kind == TRIPLE:
+        size = table[2]
+        top_rank = top >> 2
+        for r in range(top_rank, 13):
+            nibble = (hand >> (4 * r)) & 0xF
+            if NIBBLE_COUNT[nibble] < size:
+                continue
+            if r == top_rank:
+                # Same rank: the top card has to outrank the table's top card
+                sub = 0
+                for candidate in NIBBLE_SUBSETS[nibble][size]:
+                    if NIBBLE_HIGH[candidate] > (top & 3) and (not sub or candidate < sub):
+                        sub = candidate
+                if not sub:
+                    continue
+            else:
+                sub = NIBBLE_LOWEST[nibble][size]
+            mask = sub << (4 * r)
+            return (mask, kind, size, mask.bit_length() - 1)
+    elif kind == STRAIGHT:
+        size = table[2]
+        top_rank = top >> 2
+        for end in range(max(top_rank, size - 1), TWO_RANK):
+            start = end - size + 1
+            run = 0
+            for r in range(start, end):
+                nibble = (hand >> (4 * r)) & 0xF
+                if not nibble:
+                    break
+                run |= NIBBLE_LOWEST[nibble][1] << (4 * r)
+            else:
+                nibble = (hand >> (4 * end)) & 0xF
+                if end == top_rank:
+                    nibble = nibble >> ((top & 3) + 1) << ((top & 3) + 1)
+                if nibble:
+                    run |= NIBBLE_LOWEST[nibble][1] << (4 * end)
+                    return (run, STRAIGHT, size, run.bit_length() - 1)
+
+    if table[0] & TWOS_MASK:
+        bombs = []
+        _bomb_plays(rank_nibbles(hand), table, bombs)
+        if bombs:
+            return min(bombs, key=bomb_strength)
+    return None
@@ -0,0 +1,104 @@
+# core/decompose.py
+# Hand decomposition into the fewest plays
+# Works on the rank histogram of a hand (how many cards of each rank, suits
+# ignored), so every hand with the same shape shares one memoized answer.
+# The histogram is packed into an int, 3 bits per rank.
+
+from functools import lru_cache
+
+from core.bitmask import (BOMB_KINDS, NIBBLE_COUNT, NIBBLE_LOWEST, TWO_RANK, TWOS_MASK,
+                          classify, generate_plays)
+
+RANK_BITS = 3
+RANK_FIELD = (1 << RANK_BITS) - 1
+
+# Combination shapes in a decomposition: (kind, start rank, ranks, cards per rank)
+GROUP = "group"
+RUN = "run"
+
+def pack_histogram(hand):
+    """Packed rank histogram of a hand mask"""
+    histogram = 0
+    for r in range(13):
+        histogram |= NIBBLE_COUNT[(hand >> (4 * r)) & 0xF] << (RANK_BITS * r)
+    return histogram
+
+@lru_cache(maxsize=65536)
+def _solve(histogram):
+    """
+    Best decomposition of a packed histogram as (plays, singles, shapes)
+    Fewest plays first, then fewest singles. Only combinations holding the
+    lowest remaining rank are tried: nothing below it can cover those cards.
+    """
+    if not histogram:
+        return (0, 0, ())
+
+    low = ((histogram & -histogram).bit_length() - 1) // RANK_BITS
+    shift = RANK_BITS * low
+    count = (histogram >> shift) & RANK_FIELD
+    best = None
+
+    # Groups of the lowest rank (single, pair, triple, quadruple)
+    for size in range(1, count + 1):
+        plays, singles, shapes = _solve(histogram - (size << shift))
+        candidate = (plays + 1, singles + (size == 1), ((GROUP, low, 1, size),) + shapes)
+        if best is None or candidate[:2] < best[:2]:
+            best = candidate
+
+    # Straights (width 1) and pair runs (width 2) starting at the lowest rank
+    for width in (1, 2):
+        rest = histogram
+        r = low
+        while r < TWO_RANK and (histogram >> (RANK_BITS * r)) & RANK_FIELD >= width:
+            rest -= width << (RANK_BITS * r)
+            length = r - low + 1
+            if length >= 3:
+                plays, singles, shapes = _solve(rest)
+                candidate = (plays + 1, singles, ((RUN, low, length, width),) + shapes)
+                if candidate[:2] < best[:2]:
+                    best = candidate
+            r += 1
+
+    return best
+
+def min_plays(hand):
+    """Fewest plays needed to shed a hand mask, ignoring opponents"""
+    return _solve(pack_histogram(hand))[0]
+
+def decompose(hand):
+    """
+    Split a hand mask into the fewest play tuples
+    Each combination takes the weakest suits left at its ranks.
+    """
+    plays = []
+    for kind, start, ranks, width in _solve(pack_histogram(hand))[2]:
+        mask = 0
+        for r in range(start, start + ranks):
+            shift = 4 * r
+            mask |= NIBBLE_LOWEST[(hand >> shift) & 0xF][width] << shift
+        hand ^= mask
+        plays.append(classify(mask))
+    return plays
+
+def suggest_play(hand, table=None, must_include=0):
+    """
+    Recommend a play tuple for a hand mask, or None to pass
+
+    Picks the legal play that leaves the easiest hand to shed, keeping 2s
+    and bombs back and the weakest cards first on ties. Against a table it
+    suggests passing when no play makes progress on the decomposition.
+    """
+    plays = generate_plays(hand, table, must_include)
+    if not plays:
+        return None
+
+    def score(play):
+        rest = hand ^ play[0]
+        return (min_plays(rest) if rest else -1,
+                bool(play[0] & TWOS_MASK) or play[1] in BOMB_KINDS,
+                play[3])
+
+    best = min(plays, key=score)
+    if table is not None and best[0] != hand and min_plays(hand ^ best[0]) >= min_plays(hand):
+        return None
+    return best
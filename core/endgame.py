@@ -0,0 +1,189 @@
+# core/endgame.py
+# Exact endgame search for small remaining hands
+# Once few cards are left, the unseen cards are dealt to the opponents in
+# every possible way (or a sample of them) and each deal is solved with
+# paranoid alpha-beta: the bot only counts a win if it goes out first
+# whatever the other players do. Positions are stepped with GameState
+# apply/undo and solved ones are kept in a transposition table keyed on
+# their Zobrist hash. A solved position does not depend on the game it came
+# from, so every solver of the process shares one bounded table.
+
+import itertools
+import math
+import random
+import threading
+
+from core.bitmask import FULL_DECK, generate_plays
+from core.state import GameState
+from core.zobrist import TranspositionCache
+
+ENDGAME_THRESHOLD = 16       # Solve when this many cards or fewer are left in all hands
+ENDGAME_NODE_LIMIT = 40000   # Search nodes per decision before falling back to the heuristic
+ENDGAME_MAX_SPLITS = 24      # Deals of the unseen cards; sampled when there are more
+ENDGAME_TABLE_SIZE = 100000  # Transposition entries kept per process (least recently used are dropped)
+
+# Mixed into position hashes so results for different searching seats never collide
+_root_rng = random.Random(0xE4D6)
+ROOT_KEYS = [_root_rng.getrandbits(64) for _ in range(4)]
+
+# Shared by every solver; the lock keeps LRU updates from bot threads apart
+SHARED_TABLE = TranspositionCache(ENDGAME_TABLE_SIZE)
+TABLE_LOCK = threading.Lock()
+
+class EndgameBudgetExpired(Exception):
+    """Raised inside the search when the node budget runs out"""
+    pass
+
+class EndgameSolver:
+    """
+    Paranoid alpha-beta endgame solver on bitmask hands
+
+    solve() returns (True, move) when it found a move that wins in at least
+    one solved deal, and (False, None) when the endgame does not apply, every
+    move loses or the budget ran out before a deal was solved. The caller
+    then uses its own heuristic.
+    """
+    def __init__(self, threshold=ENDGAME_THRESHOLD, node_limit=ENDGAME_NODE_LIMIT,
+                 max_splits=ENDGAME_MAX_SPLITS, seed=None):
+        self.threshold = threshold
+        self.node_limit = node_limit
+        self.max_splits = max_splits
+        self.rng = random.Random(seed)
+        self.table = SHARED_TABLE  # Position hash ^ root key -> root wins
+        self.nodes = 0          # Nodes searched for the current decision
+        self.last_splits = 0    # Deals solved for the last decision
+
+    def applies(self, observation):
+        """True when few enough cards are left to search the endgame"""
+        return (not observation.is_first_play_of_game
+                and sum(observation.hand_sizes) <= self.threshold)
+
+    def solve(self, observation, moves, budget, preferred=None):
+        """
+        Pick the move that wins in the most deals of the unseen cards
+        preferred breaks ties (e.g. the heuristic's own choice).
+        """
+        self.nodes = 0
+        self.last_splits = 0
+        if not moves or not self.applies(observation):
+            return False, None
+
+        seat = observation.seat
+        hand = observation.hand_mask
+        sizes = observation.hand_sizes
+        unseen = [i for i in range(52) if (FULL_DECK & ~hand & ~observation.played_mask) >> i & 1]
+        opponents = [other for other in range(len(sizes)) if other != seat]
+        if len(unseen) != sum(sizes[other] for other in opponents):
+            return False, None  # History and hands disagree
+
+        wins = [0] * len(moves)
+        root_key = ROOT_KEYS[seat]
+
+        try:
+            for deal in self._deals(unseen, [sizes[other] for other in opponents]):
+                hands = [0] * len(sizes)
+                hands[seat] = hand
+                for other, mask in zip(opponents, deal):
+                    hands[other] = mask
+                state = GameState.from_observation(observation, hands)
+                results = []
+                for move in moves:
+                    record = state.apply(move)
+                    results.append(state.winner == seat or
+                                   (state.winner is None and self._wins(state, seat, root_key, budget)))
+                    state.undo(move, record)
+                for index, won in enumerate(results):
+                    if won:
+                        wins[index] += 1
+                self.last_splits += 1
+        except EndgameBudgetExpired:
+            pass
+        budget.spend(self.nodes & 255)
+
+        if not self.last_splits or not max(wins):
+            return False, None
+
+        best = max(wins)
+        if preferred in moves and wins[moves.index(preferred)] == best:
+            move = preferred
+        else:
+            move = moves[wins.index(best)]
+        print(f"🎯 Endgame: {wins[moves.index(move)]}/{self.last_splits} deals won, {self.nodes} nodes")
+        return True, move
+
+    def _deals(self, unseen, sizes):
+        """Every split of the unseen cards into the opponents' hand sizes, or a random sample"""
+        count = math.factorial(len(unseen))
+        for size in sizes:
+            count //= math.factorial(size)
+
+        if count <= self.max_splits:
+            yield from _all_deals(unseen, sizes)
+            return
+
+        cards = list(unseen)
+        for _ in range(self.max_splits):
+            self.rng.shuffle(cards)
+            deal = []
+            position = 0
+            for size in sizes:
+                mask = 0
+                for i in cards[position:position + size]:
+                    mask |= 1 << i
+                deal.append(mask)
+                position += size
+            yield deal
+
+    def _wins(self, state, root, root_key, budget):
+        """Paranoid search: does root go out first against every reply?"""
+        key = state.hash ^ root_key
+        with TABLE_LOCK:
+            cached = self.table.get(key)
+        if cached is not None:
+            return cached
+
+        self.nodes += 1
+        if not self.nodes & 255:
+            if not budget.spend(256) or self.nodes >= self.node_limit:
+                raise EndgameBudgetExpired()
+
+        hand = state.hands[state.turn]
+        maximizing = state.turn == root
+        plays = generate_plays(hand, state.table)
+
+        # Going out ends the game at once
+        for play in plays:
+            if play[0] == hand:
+                with TABLE_LOCK:
+                    self.table.put(key, maximizing)
+                return maximizing
+
+        # Big plays first: they shed cards and tend to keep control
+        plays.sort(key=lambda play: (-play[2], -play[3]))
+        if state.table is not None:
+            plays.append(None)  # Pass last
+        result = not maximizing
+        for play in plays:
+            record = state.apply(play)
+            value = self._wins(state, root, root_key, budget)
+            state.undo(play, record)
+            if value == maximizing:
+                result = maximizing
+                break
+
+        with TABLE_LOCK:
+            self.table.put(key, result)
+        return result
+
+def _all_deals(cards, sizes):
+    """Yield every split of cards into groups of the given sizes as masks"""
+    if not sizes:
+        yield []
+        return
+    for combo in itertools.combinations(cards, sizes[0]):
+        mask = 0
+        for i in combo:
+            mask |= 1 << i
+        rest = [i for i in cards if not mask >> i & 1]
+        for tail in _all_deals(rest, sizes[1:]):
+            yield [mask] + tail
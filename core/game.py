@@ -6,9 +6,12 @@
 from core.deck import Deck
 from core.player import Player
 from core.rules import is_valid_play, beats, get_play_type, is_single, is_pair, is_triple, is_straight
-import random
-from collections import defaultdict
-from datetime import datetime
+from core.bitmask import BOMB_KINDS, THREE_OF_SPADES, cards_to_mask, classify, classify_cards, generate_plays, select_cards
+from core.decompose import suggest_play
+from core.history import PlayHistory
+from core.opening_book import recommend_lead
+from core.zobrist import hand_key, pass_key, position_hash, table_key, turn_key
+from core.strategy import GreedyStrategy, build_observation, create_strategy, legal_moves, run_strategy
 
 class Game:
     def __init__(self, is_fresh_game=True, previous_winner_index=None, previous_winner_name=None):
@@ -32,9 +35,13 @@ class Game:
 
         self.last_play = []       # Current cards on table
         self.pass_count = 0       # Consecutive passes
-        self.play_history = []    # Track all plays in current round
+        self.play_history = PlayHistory(len(self.players))  # Every play and pass of the game
         self.total_plays = 0      # Total plays in game
         self.bomb_used = False    # Track if a bomb has been used this round
+        self.strategies = {}      # Per-seat BotStrategy overrides (seat -> strategy)
+        self.default_strategy = GreedyStrategy()
+        self.last_decision = None # DecisionStats of the most recent bot decision
+        self.undo_stack = []      # One entry per play_cards/pass_turn, see undo()
         
         # Track round winner and starter
         self.round_winner = None           # Who won the current round
@@ -60,6 +67,9 @@ class Game:
         
         # Initialize current player to the starter
         self.current_player_index = self.first_player_index
+        
+        # Zobrist hash of the position, kept up to date by play_cards/pass_turn
+        self.position_hash = self.compute_position_hash()
 
     def _initialize_first_round(self):
         """Initialize first round - find player with 3♠ for fresh games only"""
@@ -200,13 +210,18 @@ class Game:
             if not beats(cards, self.last_play):
                 return False, "Your play doesn't beat the table"
         
-        # Remove cards from player's hand
+        # Check every card before changing anything
         for card in cards:
-            if card in player.hand:
-                player.hand.remove(card)
-            else:
+            if card not in player.hand:
                 return False, f"Card {card} not in player's hand"
         
+        # Remove cards from player's hand, remembering where they were for undo
+        position_before = self._position_features()
+        undo_entry = self._undo_entry(player_index)
+        for card in cards:
+            index = player.hand.index(card)
+            undo_entry[2].append((index, player.hand.pop(index)))
+        
         # Record the play
         self._record_play(player, cards)
         
@@ -223,6 +238,8 @@ class Game:
         
         # Advance to next player
         self._advance_turn()
+        self._update_position_hash(position_before, player_index, cards_to_mask(cards))
+        self.undo_stack.append(undo_entry)
         
         return True, f"{player.name} played {' '.join(str(c) for c in cards)}"
 
@@ -252,6 +269,8 @@ class Game:
             return False, f"Not your turn. It's {self.players[self.current_player_index].name}'s turn"
         
         # Record pass
+        position_before = self._position_features()
+        undo_entry = self._undo_entry(player_index)
         self._record_pass(player)
         
         # Increment pass count
@@ -265,12 +284,10 @@ class Game:
             # Round ended - set round winner to last player who played
             if self.last_play:
                 # Find who played last
-                current_round_plays = self.get_current_round_plays()
-                non_pass_plays = [p for p in current_round_plays if not p['is_pass']]
-                if non_pass_plays:
-                    last_play = non_pass_plays[-1]
-                    winner_index = last_play['player_index']
-                    self.round_winner = self.players[winner_index]
+                last_play = self.play_history.last_play_record(self.round_number)
+                if last_play:
+                    self.round_winner = self.players[last_play.player_index]
+                    self.play_history.close_round(last_play.player_index)
                     print(f"   Round winner: {self.round_winner.name}")
             
             # Start new round
@@ -278,6 +295,8 @@ class Game:
         else:
             # Advance to next player
             self._advance_turn()
+        self._update_position_hash(position_before)
+        self.undo_stack.append(undo_entry)
         
         return True, f"{player.name} passed"
 
@@ -325,15 +344,13 @@ class Game:
             print(f"🏆 {self.round_winner.name} won round {self.round_number} and starts round {self.round_number + 1}")
         else:
             # Find last non-pass play to determine round winner
-            current_round_plays = self.get_current_round_plays()
-            for play in reversed(current_round_plays):
-                if not play.get('is_pass', False):
-                    winner_index = play.get('player_index')
-                    if 0 <= winner_index < len(self.players) and not self.players[winner_index].has_won():
-                        self.round_winner = self.players[winner_index]
-                        self.first_player_index = winner_index
-                        print(f"🏆 {self.round_winner.name} won round {self.round_number} and starts round {self.round_number + 1}")
-                        break
+            for play in self.play_history.iter_plays_reversed(self.round_number):
+                winner_index = play.player_index
+                if 0 <= winner_index < len(self.players) and not self.players[winner_index].has_won():
+                    self.round_winner = self.players[winner_index]
+                    self.first_player_index = winner_index
+                    print(f"🏆 {self.round_winner.name} won round {self.round_number} and starts round {self.round_number + 1}")
+                    break
             
             # If still no winner, find first available player
             if self.first_player_index is None:
@@ -359,9 +376,50 @@ class Game:
         print(f"Round {self.round_number} started. {self.players[self.first_player_index].name} goes first.")
         print(f"{'='*60}\n")
 
-    def bot_turn(self, bot):
+    def bot_turn(self, bot, budget=None):
         """
         CORRECTED bot AI with automatic win checking
+        budget: optional SearchBudget bounding the decision time/nodes
+        """
+        # Sort bot's hand for consistent selection
+        bot.sort_hand()
+        
+        return self.apply_bot_play(bot, self.choose_bot_play(bot, budget))
+
+    def choose_bot_play(self, bot, budget=None):
+        """
+        Decide the bot's move without changing the game
+        Returns the cards to play, or None to pass.
+        Only reads game state, so it can run on a worker thread while the
+        caller keeps rendering; apply the result with apply_bot_play().
+        Telemetry of the decision is stored in self.last_decision.
+        """
+        bot_index = self.get_player_index(bot)
+        
+        if not bot.hand:
+            return None
+        
+        observation = self.get_observation(bot_index)
+        
+        if observation.is_lead:
+            print(f"🤖 {bot.name} starts round {self.round_number}")
+            if observation.is_first_play_of_game:
+                print(f"🤖 First play of FRESH GAME (Round 1) - must include 3♠")
+            else:
+                print(f"🤖 First play of ROUND {self.round_number} - any valid combination")
+        
+        move, self.last_decision = run_strategy(self.get_strategy(bot_index), observation,
+                                                legal_moves(observation), budget)
+        print(f"🤖 {bot.name} ({self.last_decision.strategy}) decided in "
+              f"{self.last_decision.elapsed_ms:.1f}ms, {self.last_decision.nodes} nodes"
+              f"{' (budget exhausted)' if self.last_decision.budget_exhausted else ''}")
+        
+        return select_cards(bot.hand, move[0]) if move else None
+
+    def apply_bot_play(self, bot, play):
+        """
+        Apply a move decided by choose_bot_play (None means pass)
+        Returns the cards played, or None if the bot passed
         """
         # ===== AUTOMATIC WIN CHECK =====
         auto_winner, reason = self.check_automatic_wins()
@@ -382,52 +440,8 @@ class Game:
         if not bot.hand:
             return None
         
-        # Sort bot's hand for consistent selection
-        bot.sort_hand()
-        
-        # Check if this is first play of round
-        is_first_play = self.is_first_play_of_round()
-        
-        # If table is empty and this bot starts the round
-        if is_first_play and bot_index == self.current_player_index:
-            print(f"🤖 {bot.name} starts round {self.round_number}")
-            
-            # Check if this is first play of FRESH GAME (round 1)
-            if self.is_first_play_of_game():
-                print(f"🤖 First play of FRESH GAME (Round 1) - must include 3♠")
-                # First play of fresh game - must include 3♠
-                play = self._play_with_three_spades(bot)
-            else:
-                print(f"🤖 First play of ROUND {self.round_number} - any valid combination")
-                # First play of round (round 2+) - any valid combination
-                play = self._play_best_first_combination(bot)
-            
-            if play:
-                # Use the new play_cards method to handle everything
-                success, message = self.play_cards(bot_index, play)
-                if success:
-                    print(f"🤖 {message}")
-                    return play
-                else:
-                    print(f"🤖 Bot play failed: {message}")
-                    # Bot should pass if it can't make a valid first play
-                    self.pass_turn(bot_index)
-                    return None
-            else:
-                # Bot can't make a valid first play - should pass
-                self.pass_turn(bot_index)
-                return None
-        
-        # Normal turn - try to beat the table
-        table_type = get_play_type(self.last_play) if self.last_play else None
-        
-        # Check if table contains 2 - bombs can only be used against 2
-        table_has_two = any(card.rank == 2 for card in self.last_play) if self.last_play else False
-        
-        # Try to find a combination that beats the table
-        play = self._find_beating_play(bot, table_type, table_has_two)
-        
         if play:
+            # Use the play_cards method to handle everything
             success, message = self.play_cards(bot_index, play)
             if success:
                 print(f"🤖 {message}")
@@ -465,459 +479,157 @@ class Game:
         self.round_winner = player
         self.game_winner_index = self.get_player_index(player)
         self.game_winner_name = player.name
+        self.position_hash = self.compute_position_hash()
+        self.undo_stack.clear()  # An automatic win is final
         
         return f"{player.name} wins automatically with {reason}!"
 
-    # ===== BOT PLAY HELPER METHODS =====
+    # ===== UNDO =====
     
-    def _play_with_three_spades(self, bot):
-        """Find a valid combination that includes 3♠ for bot's first play of FRESH GAME"""
-        hand = bot.hand.copy()
-        
-        # Find 3♠
-        three_spades = None
-        for card in hand:
-            if card.rank == 3 and card.suit == "♠":
-                three_spades = card
-                break
-        
-        if not three_spades:
-            print(f"🤖 ERROR: {bot.name} should have 3♠ but doesn't!")
-            return None
-        
-        print(f"🤖 {bot.name} has 3♠ and must include it in first play of fresh game")
-        
-        # Try different combinations with 3♠:
-        # 1. Single 3♠ (always valid)
-        return [three_spades]
-
-    def _play_best_first_combination(self, bot):
-        """Play the best combination when starting a new round (round 2+)"""
-        hand = bot.hand.copy()
-        
-        if not hand:
-            return None
-        
-        # For rounds after round 1, any valid combination is OK
-        
-        # Try to play various combinations in order of preference:
-        # 1. Consecutive pairs (reduces hand size the most)
-        # 2. Straight
-        # 3. Quadruple (four of a kind)
-        # 4. Triple
-        # 5. Pair
-        # 6. Single (last resort)
-        
-        # Check for consecutive pairs (3+ pairs = 6+ cards)
-        consecutive_pairs = self._find_all_consecutive_pairs(hand)
-        if consecutive_pairs:
-            # Play the longest consecutive pairs
-            longest_pairs = max(consecutive_pairs, key=len)
-            if len(longest_pairs) >= 6:  # At least 3 pairs
-                return longest_pairs
-        
-        # Check for straights
-        straights = self._find_all_straights(hand)
-        if straights:
-            # Play the longest straight
-            longest_straight = max(straights, key=len)
-            if len(longest_straight) >= 3:
-                return longest_straight
-        
-        # Check for quadruples (four of a kind)
-        quadruples = self._find_all_quadruples(hand)
-        if quadruples:
-            # Play the smallest quadruple
-            smallest_quadruple = min(quadruples, key=lambda q: max(card_strength(card) for card in q))
-            return smallest_quadruple
-        
-        # Check for triples
-        triples = self._find_all_triples(hand)
-        if triples:
-            # Play the smallest triple
-            smallest_triple = min(triples, key=lambda t: max(card_strength(card) for card in t))
-            return smallest_triple
-        
-        # Check for pairs
-        pairs = self._find_all_pairs(hand)
-        if pairs:
-            # Play the smallest pair
-            smallest_pair = min(pairs, key=lambda p: max(card_strength(card) for card in p))
-            return smallest_pair
-        
-        # Last resort: play smallest single card
-        if hand:
-            smallest_card = min(hand, key=lambda c: card_strength(c))
-            return [smallest_card]
-        
-        return None
-
-    def _find_beating_play(self, bot, table_type, table_has_two):
+    def _undo_entry(self, player_index):
+        """Everything play_cards/pass_turn may change, except the hand (filled in by the caller)"""
+        return (
+            player_index,
+            len(self.play_history),
+            [],  # (index, card) removed from the player's hand, in removal order
+            (self.last_play, self.pass_count, self.current_player_index, self.first_player_index,
+             self.round_number, self.round_winner, self.bomb_used, self.total_plays,
+             self.game_winner_index, self.game_winner_name, self.position_hash),
+            tuple(p.has_passed for p in self.players)
+        )
+    
+    def can_undo(self):
+        return bool(self.undo_stack)
+    
+    def undo(self):
         """
-        Find a play that beats the current table combination
-        BOMBS CAN ONLY BE USED AGAINST PLAYS CONTAINING 2
+        Revert the last play_cards/pass_turn exactly
+        Returns: (success, message)
         """
-        hand = bot.hand.copy()
-        
-        # CRITICAL FIX: Bombs can only be used against plays containing 2
-        if table_has_two:
-            # Table contains 2 - check if bot has bombs and should use them
-            bombs = self._find_all_bombs(hand)
-            if bombs and self._should_use_bomb(bot):
-                # Use the smallest appropriate bomb
-                for bomb in sorted(bombs, key=lambda b: max(card_strength(card) for card in b)):
-                    if beats(bomb, self.last_play):
-                        print(f"🤖 {bot.name} using bomb on 2 play")
-                        return bomb
-        
-        # Normal play logic for all other cases (no 2 on table)
-        if table_type == "single":
-            # Find a single card that beats the table
-            table_card = self.last_play[0]
-            for card in hand:
-                if beats([card], [table_card]):
-                    return [card]
-        
-        elif table_type == "pair":
-            # Find a pair that beats the table pair
-            table_rank = self.last_play[0].rank
-            
-            # Group cards by rank
-            rank_groups = defaultdict(list)
-            for card in hand:
-                rank_groups[card.rank].append(card)
-            
-            # Look for pairs with higher rank
-            for rank, cards in sorted(rank_groups.items(), key=lambda x: card_strength(x[1][0])):
-                if len(cards) >= 2 and beats(cards[:2], self.last_play):
-                    return cards[:2]
-        
-        elif table_type == "triple":
-            # Find a triple that beats the table triple
-            table_rank = self.last_play[0].rank
-            
-            # Group cards by rank
-            rank_groups = defaultdict(list)
-            for card in hand:
-                rank_groups[card.rank].append(card)
-            
-            # Look for triples with higher rank
-            for rank, cards in sorted(rank_groups.items(), key=lambda x: card_strength(x[1][0])):
-                if len(cards) >= 3 and beats(cards[:3], self.last_play):
-                    return cards[:3]
-        
-        elif table_type == "straight":
-            # Find a straight that beats the table straight
-            straights = self._find_all_straights(hand)
-            table_straight = self.last_play
-            
-            for straight in straights:
-                if len(straight) == len(table_straight) and beats(straight, table_straight):
-                    return straight
-        
-        elif table_type == "quadruple":
-            # Find a quadruple that beats the table quadruple
-            # Only if table contains 2 (handled above) or we need a higher quadruple
-            if not table_has_two:
-                table_rank = self.last_play[0].rank
-                
-                # Group cards by rank
-                rank_groups = defaultdict(list)
-                for card in hand:
-                    rank_groups[card.rank].append(card)
-                
-                # Look for quadruples with higher rank
-                for rank, cards in sorted(rank_groups.items(), key=lambda x: card_strength(x[1][0])):
-                    if len(cards) >= 4 and beats(cards[:4], self.last_play):
-                        return cards[:4]
-        
-        elif table_type == "consecutive_pairs":
-            # Find consecutive pairs that beat the table
-            # Check if table has 2 (bomb case already handled)
-            if not table_has_two:
-                consecutive_pairs_plays = self._find_all_consecutive_pairs(hand)
-                table_pairs = self.last_play
-                
-                for pairs in consecutive_pairs_plays:
-                    if len(pairs) == len(table_pairs) and beats(pairs, table_pairs):
-                        return pairs
-        
-        return None
-
-    # ===== HELPER METHODS FOR FINDING COMBINATIONS =====
-    
-    def _find_all_straights(self, hand):
-        """Find all possible straights in hand"""
-        if len(hand) < 3:
-            return []
+        if not self.undo_stack:
+            return False, "Nothing to undo"
         
-        # Sort by card strength
-        sorted_hand = sorted(hand, key=lambda c: card_strength(c))
-        
-        straights = []
-        
-        # Check for straights starting from each card
-        for i in range(len(sorted_hand)):
-            current_straight = [sorted_hand[i]]
-            
-            for j in range(i + 1, len(sorted_hand)):
-                next_card = sorted_hand[j]
-                
-                # Check if this card continues the straight
-                last_rank_val = card_strength(current_straight[-1]) // 4
-                next_rank_val = card_strength(next_card) // 4
-                
-                # 2 cannot be in straight (rank value 12)
-                if last_rank_val == 12 or next_rank_val == 12:
-                    continue
-                
-                if next_rank_val == last_rank_val + 1:
-                    current_straight.append(next_card)
-                elif next_rank_val > last_rank_val + 1:
-                    # Gap too big, can't continue this straight
-                    break
-            
-            if len(current_straight) >= 3:
-                straights.append(current_straight)
-        
-        return straights
+        player_index, history_length, removed, fields, passed = self.undo_stack.pop()
+        player = self.players[player_index]
+        for index, card in reversed(removed):
+            player.hand.insert(index, card)
+        self.play_history.truncate(history_length)
+        (self.last_play, self.pass_count, self.current_player_index, self.first_player_index,
+         self.round_number, self.round_winner, self.bomb_used, self.total_plays,
+         self.game_winner_index, self.game_winner_name, self.position_hash) = fields
+        for other, has_passed in zip(self.players, passed):
+            other.has_passed = has_passed
+        
+        if removed:
+            return True, f"Undid {player.name}'s play of {' '.join(str(card) for _, card in removed)}"
+        return True, f"Undid {player.name}'s pass"
     
-    def _find_all_bombs(self, hand):
-        """Find all bombs (quadruples and consecutive pairs) in hand"""
-        bombs = []
-        
-        # Find quadruples
-        rank_groups = defaultdict(list)
-        for card in hand:
-            rank_groups[card.rank].append(card)
-        
-        for cards in rank_groups.values():
-            if len(cards) >= 4:
-                bombs.append(cards[:4])
-        
-        # Find consecutive pairs (minimum 3 pairs = 6 cards)
-        pairs_list = []
-        for rank, cards in rank_groups.items():
-            if len(cards) >= 2:
-                pairs_list.append((rank, cards[:2]))
-        
-        if len(pairs_list) >= 3:
-            # Sort by rank
-            pairs_list.sort(key=lambda x: card_strength(x[1][0]))
-            
-            # Find consecutive pairs
-            for i in range(len(pairs_list) - 2):
-                # Check if next 3 ranks are consecutive
-                rank1_val = card_strength(pairs_list[i][1][0]) // 4
-                rank2_val = card_strength(pairs_list[i+1][1][0]) // 4
-                rank3_val = card_strength(pairs_list[i+2][1][0]) // 4
-                
-                # 2 cannot be in consecutive pairs
-                if rank1_val == 12 or rank2_val == 12 or rank3_val == 12:
-                    continue
-                
-                if rank2_val == rank1_val + 1 and rank3_val == rank2_val + 1:
-                    bomb_cards = []
-                    bomb_cards.extend(pairs_list[i][1])
-                    bomb_cards.extend(pairs_list[i+1][1])
-                    bomb_cards.extend(pairs_list[i+2][1])
-                    bombs.append(bomb_cards)
-        
-        return bombs
+    def undo_to_player(self, player_index):
+        """
+        Undo moves until the last move of player_index is reverted
+        (e.g. the human's own move plus the bot replies after it)
+        Returns: (success, message, number of moves undone)
+        """
+        if not any(entry[0] == player_index for entry in self.undo_stack):
+            return False, f"{self.players[player_index].name} has no move to undo", 0
+        
+        count = 0
+        while True:
+            mover = self.undo_stack[-1][0]
+            success, message = self.undo()
+            count += 1
+            if mover == player_index:
+                return True, message, count
     
-    def _find_all_consecutive_pairs(self, hand):
-        """Find all consecutive pairs combinations"""
-        pairs_list = []
-        rank_groups = defaultdict(list)
-        
-        for card in hand:
-            rank_groups[card.rank].append(card)
-        
-        for cards in rank_groups.values():
-            if len(cards) >= 2:
-                pairs_list.append((cards[0].rank, cards[:2]))
-        
-        if len(pairs_list) < 3:
-            return []
-        
-        # Sort by rank
-        pairs_list.sort(key=lambda x: card_strength(x[1][0]))
-        
-        consecutive_pairs = []
-        
-        # Find all possible consecutive pairs combinations
-        for start in range(len(pairs_list) - 2):
-            for end in range(start + 3, len(pairs_list) + 1):
-                # Check if all ranks in this range are consecutive
-                is_consecutive = True
-                for i in range(start, end - 1):
-                    rank1_val = card_strength(pairs_list[i][1][0]) // 4
-                    rank2_val = card_strength(pairs_list[i+1][1][0]) // 4
-                    
-                    # 2 cannot be in consecutive pairs
-                    if rank1_val == 12 or rank2_val == 12:
-                        is_consecutive = False
-                        break
-                    
-                    if rank2_val != rank1_val + 1:
-                        is_consecutive = False
-                        break
-                
-                if is_consecutive:
-                    # Create the combination
-                    combination = []
-                    for i in range(start, end):
-                        combination.extend(pairs_list[i][1])
-                    consecutive_pairs.append(combination)
-        
-        return consecutive_pairs
+    # ===== POSITION HASHING =====
     
-    def _should_use_bomb(self, bot):
+    def compute_position_hash(self):
         """
-        Determine if bot should use a bomb
-        Bots should be conservative with bombs - only use when necessary
+        Zobrist hash of the position computed from scratch
+        Use it to resync position_hash after changing the game state directly.
         """
-        # If bot has few cards left, be more aggressive with bombs
-        if len(bot.hand) <= 3:
-            return True
-        
-        # If bot has many cards, save bombs for later
-        if len(bot.hand) >= 10:
-            return random.random() < 0.4  # 40% chance to use bomb
-        
-        # Check if many players are still in the round
-        active_players = sum(1 for p in self.players if not p.has_won())
-        if active_players > 2:
-            # Save bomb for later when fewer players remain
-            return random.random() < 0.3  # 30% chance to use bomb
-        
-        # Default: use bomb
-        return True
+        return position_hash([cards_to_mask(p.hand) for p in self.players],
+                             cards_to_mask(self.last_play), self.pass_count,
+                             self.current_player_index or 0)
     
-    def _find_all_pairs(self, hand):
-        """Find all pairs in hand"""
-        pairs = []
-        rank_groups = defaultdict(list)
-        
-        for card in hand:
-            rank_groups[card.rank].append(card)
-        
-        for cards in rank_groups.values():
-            if len(cards) >= 2:
-                pairs.append(cards[:2])
-        
-        return pairs
+    def _position_features(self):
+        """Table, pass count and turn, to diff against after a move"""
+        return (cards_to_mask(self.last_play), self.pass_count, self.current_player_index or 0)
     
-    def _find_all_triples(self, hand):
-        """Find all triples in hand"""
-        triples = []
-        rank_groups = defaultdict(list)
-        
-        for card in hand:
-            rank_groups[card.rank].append(card)
-        
-        for cards in rank_groups.values():
-            if len(cards) >= 3:
-                triples.append(cards[:3])
-        
-        return triples
+    def _update_position_hash(self, before, player_index=None, played_mask=0):
+        """XOR the changes of one move into position_hash"""
+        table_before, passes_before, turn_before = before
+        table_after, passes_after, turn_after = self._position_features()
+        key = self.position_hash
+        if played_mask:
+            key ^= hand_key(player_index, played_mask)
+        if table_after != table_before:
+            key ^= table_key(table_before) ^ table_key(table_after)
+        if passes_after != passes_before:
+            key ^= pass_key(passes_before) ^ pass_key(passes_after)
+        if turn_after != turn_before:
+            key ^= turn_key(turn_before) ^ turn_key(turn_after)
+        self.position_hash = key
     
-    def _find_all_quadruples(self, hand):
-        """Find all quadruples in hand"""
-        quadruples = []
-        rank_groups = defaultdict(list)
-        
-        for card in hand:
-            rank_groups[card.rank].append(card)
-        
-        for cards in rank_groups.values():
-            if len(cards) >= 4:
-                quadruples.append(cards[:4])
-        
-        return quadruples
+    # ===== BOT STRATEGIES =====
+    
+    def set_strategy(self, seat, strategy):
+        """Use a BotStrategy (or registry name) for the player at seat"""
+        if isinstance(strategy, str):
+            strategy = create_strategy(strategy)
+        self.strategies[seat] = strategy
+        return strategy
+    
+    def get_strategy(self, seat):
+        """Strategy used for the player at seat"""
+        return self.strategies.get(seat) or self.default_strategy
+    
+    def get_observation(self, seat):
+        """Immutable view of the game from the player at seat"""
+        return build_observation(self, seat)
     
     def get_valid_plays(self, player):
         """Get all valid plays for a player"""
-        valid_plays = []
-        hand = player.hand.copy()
-        
-        if not hand:
-            return valid_plays
+        if not player.hand:
+            return []
         
-        # Check if it's first play of round
-        if self.is_first_play_of_round():
-            # Must start with valid combination
-            # Check all possible combinations
-            from itertools import combinations
-            
-            # Check singles
-            for card in hand:
-                if is_valid_play([card]):
-                    valid_plays.append([card])
-            
-            # Check pairs, triples, etc.
-            for r in range(2, min(5, len(hand) + 1)):
-                for combo in combinations(hand, r):
-                    combo_list = list(combo)
-                    if is_valid_play(combo_list):
-                        valid_plays.append(combo_list)
-            
-            # Check straights (3+ cards)
-            straights = self._find_all_straights(hand)
-            valid_plays.extend(straights)
-            
-            # Check consecutive pairs
-            consecutive_pairs = self._find_all_consecutive_pairs(hand)
-            valid_plays.extend(consecutive_pairs)
-        else:
-            # Must beat last play
-            for play in self.get_valid_plays(player):  # Recursive but with empty table
-                if beats(play, self.last_play):
-                    valid_plays.append(play)
+        # Runs are listed once per top card (weakest suits below it)
+        table = classify_cards(self.last_play) if self.last_play else None
+        plays = generate_plays(cards_to_mask(player.hand), table)
+        return [select_cards(player.hand, play[0]) for play in plays]
+
+    def get_hint(self, player):
+        """
+        Suggest a play for a player based on the fewest-plays decomposition
+        Returns the cards to play, or None when passing is suggested.
+        """
+        if not player.hand:
+            return None
         
-        return valid_plays
+        table = classify_cards(self.last_play) if self.last_play else None
+        must_include = THREE_OF_SPADES if table is None and self.is_first_play_of_game() else 0
+        hand = cards_to_mask(player.hand)
+        play = recommend_lead(hand, must_include) if table is None else suggest_play(hand, table)
+        return select_cards(player.hand, play[0]) if play else None
     
     # ===== PLAY HISTORY TRACKING =====
     
     def _record_play(self, player, cards):
         """Record a play in the history"""
-        play_type = get_play_type(cards)
+        mask = cards_to_mask(cards)
+        kind = classify(mask)[1]
         
         # Check if this is a bomb
-        is_bomb = False
-        if play_type == "quadruple" or (play_type == "consecutive_pairs" and len(cards) >= 6):
-            is_bomb = True
+        if kind in BOMB_KINDS:
             self.bomb_used = True
         
-        play_record = {
-            'player': player.name,
-            'player_index': self.get_player_index(player),
-            'cards': cards.copy(),
-            'play_type': play_type,
-            'is_bomb': is_bomb,
-            'timestamp': datetime.now(),
-            'round': self.round_number,
-            'play_number': self.total_plays + 1,
-            'is_pass': False
-        }
-        self.play_history.append(play_record)
+        self.play_history.append_play(self.get_player_index(player), player.name, mask, kind, self.round_number)
         self.total_plays += 1
         self.last_play = cards.copy()
     
     def _record_pass(self, player):
         """Record a pass in the history"""
-        pass_record = {
-            'player': player.name,
-            'player_index': self.get_player_index(player),
-            'cards': [],
-            'play_type': 'pass',
-            'is_bomb': False,
-            'timestamp': datetime.now(),
-            'round': self.round_number,
-            'play_number': self.total_plays + 1,
-            'is_pass': True
-        }
-        self.play_history.append(pass_record)
+        self.play_history.append_pass(self.get_player_index(player), player.name, self.round_number)
         self.total_plays += 1
     
     # ===== GAME STATE METHODS =====
@@ -950,12 +662,12 @@ class Game:
         self.bomb_used = False
         
         # Set round winner if there was a last play
-        current_round_plays = self.get_current_round_plays()
-        non_pass_plays = [p for p in current_round_plays if not p['is_pass']]
-        if non_pass_plays:
-            last_play = non_pass_plays[-1]
-            winner_index = last_play['player_index']
-            self.round_winner = self.players[winner_index]
+        last_play = self.play_history.last_play_record(self.round_number)
+        if last_play:
+            self.round_winner = self.players[last_play.player_index]
+        
+        # Called outside play_cards/pass_turn, so rebuild the hash
+        self.position_hash = self.compute_position_hash()
     
     def get_player_by_name(self, name):
         """Get player object by name"""
@@ -974,16 +686,11 @@ class Game:
     def get_player_stats(self):
         """Get statistics for all players"""
         stats = {}
-        for player in self.players:
+        for i, player in enumerate(self.players):
             stats[player.name] = {
                 'cards_remaining': len(player.hand),
                 'has_won': player.has_won(),
-                'plays_made': len([p for p in self.play_history 
-                                 if p['player'] == player.name and not p['is_pass']]),
-                'passes_made': len([p for p in self.play_history 
-                                  if p['player'] == player.name and p['is_pass']]),
-                'bombs_used': len([p for p in self.play_history 
-                                 if p['player'] == player.name and p.get('is_bomb', False)])
+                **self.play_history.player_stats(i)
             }
         return stats
     
@@ -1017,32 +724,18 @@ class Game:
     
     def get_current_round_plays(self):
         """Get all plays in the current round"""
-        return [play for play in self.play_history 
-                if play['round'] == self.round_number]
+        return self.play_history.round_plays(self.round_number)
     
     def get_recent_plays(self, count=5, current_round_only=True):
         """Get recent plays, optionally filtered to current round only"""
-        if not self.play_history:
-            return []
-        
-        if current_round_only:
-            recent_plays = [play for play in self.play_history 
-                          if play['round'] == self.round_number]
-        else:
-            recent_plays = self.play_history
-        
-        return recent_plays[-count:]
+        return self.play_history.recent(count, self.round_number if current_round_only else None)
     
     def get_round_winner(self):
         """Get the player who won the current round"""
-        current_round_plays = self.get_current_round_plays()
-        if not current_round_plays:
+        last_play = self.play_history.last_play_record(self.round_number)
+        if last_play is None:
             return None
-        
-        for play in reversed(current_round_plays):
-            if not play['is_pass']:
-                return self.players[play['player_index']]
-        return None
+        return self.players[last_play.player_index]
     
     def get_play_string(self, play_record):
         """Convert a play record to a readable string"""
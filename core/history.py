@@ -0,0 +1,208 @@
+# core/history.py
+# Typed, append-only play history
+# Each action is a small slotted record holding the played cards as a bitmask
+# (see core/bitmask.py) instead of a dict with a copied card list. Records
+# still answer record['key'] and record.get('key') with the old dict keys, so
+# existing readers keep working.
+
+import time
+
+from core.bitmask import BOMB_KINDS, PLAY_TYPE_NAMES, mask_to_cards
+
+PASS_KIND = 0  # Type code of a pass (play kinds are 1-6, see core/bitmask.py)
+
+class PlayRecord:
+    """One play or pass; cards are decoded from the mask on first access"""
+    __slots__ = ('player_index', 'player', 'mask', 'kind', 'round_number', 'play_number',
+                 'timestamp', '_cards')
+
+    # Keys of the old dict records
+    KEYS = ('player', 'player_index', 'cards', 'play_type', 'is_bomb', 'timestamp',
+            'round', 'play_number', 'is_pass')
+
+    def __init__(self, player_index, player, mask, kind, round_number, play_number):
+        self.player_index = player_index
+        self.player = player              # Name at the time of the action
+        self.mask = mask
+        self.kind = kind
+        self.round_number = round_number
+        self.play_number = play_number
+        self.timestamp = time.monotonic()
+        self._cards = None
+
+    @property
+    def is_pass(self):
+        return self.kind == PASS_KIND
+
+    @property
+    def is_bomb(self):
+        return self.kind in BOMB_KINDS
+
+    @property
+    def play_type(self):
+        return PLAY_TYPE_NAMES.get(self.kind, 'pass')
+
+    @property
+    def cards(self):
+        if self._cards is None:
+            self._cards = mask_to_cards(self.mask)
+        return self._cards
+
+    @property
+    def round(self):
+        return self.round_number
+
+    def __getitem__(self, key):
+        if key not in PlayRecord.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        if key not in PlayRecord.KEYS:
+            return default
+        return getattr(self, key)
+
+    def keys(self):
+        return PlayRecord.KEYS
+
+    def to_dict(self):
+        return {key: getattr(self, key) for key in PlayRecord.KEYS}
+
+    def __repr__(self):
+        if self.is_pass:
+            return f"PlayRecord({self.player} passed, round {self.round_number})"
+        return f"PlayRecord({self.player} played {' '.join(str(c) for c in self.cards)}, round {self.round_number})"
+
+class PlayHistory:
+    """
+    Append-only list of PlayRecords with running per-player counters
+    Supports len(), iteration, indexing and slicing like the old list.
+
+    Rounds only grow, so each round is a contiguous slice of the records;
+    round_offsets holds where each round starts. Every record also keeps the
+    index of the play (non-pass) before it, so the last play of a round is
+    a pointer read instead of a scan.
+    """
+    def __init__(self, num_players=4):
+        self.records = []
+        self.plays = [0] * num_players     # Non-pass actions per seat
+        self.passes = [0] * num_players
+        self.bombs = [0] * num_players
+        self.cards_shed = [0] * num_players
+        self.rounds_won = [0] * num_players
+        self.round_wins = []               # (index of the closing record, winner seat)
+        self.played_mask = 0               # Every card played so far
+        self.round_offsets = []            # (round number, index of its first record)
+        self.round_positions = {}          # Round number -> position in round_offsets
+        self.last_play_index = -1          # Index of the latest non-pass record
+        self.previous_play_index = []      # Per record: last_play_index before it was added
+
+    def _append(self, record):
+        round_number = record.round_number
+        if not self.round_offsets or self.round_offsets[-1][0] != round_number:
+            self.round_positions[round_number] = len(self.round_offsets)
+            self.round_offsets.append((round_number, len(self.records)))
+        self.previous_play_index.append(self.last_play_index)
+        self.records.append(record)
+
+    def append_play(self, player_index, player_name, mask, kind, round_number):
+        record = PlayRecord(player_index, player_name, mask, kind, round_number, len(self.records) + 1)
+        self._append(record)
+        self.last_play_index = len(self.records) - 1
+        self.plays[player_index] += 1
+        self.cards_shed[player_index] += mask.bit_count()
+        if kind in BOMB_KINDS:
+            self.bombs[player_index] += 1
+        self.played_mask |= mask
+        return record
+
+    def append_pass(self, player_index, player_name, round_number):
+        record = PlayRecord(player_index, player_name, 0, PASS_KIND, round_number, len(self.records) + 1)
+        self._append(record)
+        self.passes[player_index] += 1
+        return record
+
+    def close_round(self, winner_index):
+        """Credit winner_index with the round the latest record closed"""
+        self.round_wins.append((len(self.records) - 1, winner_index))
+        self.rounds_won[winner_index] += 1
+
+    def truncate(self, length):
+        """Drop the records after the first length ones (used by Game.undo)"""
+        while self.round_wins and self.round_wins[-1][0] >= length:
+            _, winner_index = self.round_wins.pop()
+            self.rounds_won[winner_index] -= 1
+        while len(self.records) > length:
+            record = self.records.pop()
+            self.last_play_index = self.previous_play_index.pop()
+            if self.round_offsets[-1][1] == len(self.records):
+                round_number, _ = self.round_offsets.pop()
+                del self.round_positions[round_number]
+            if record.is_pass:
+                self.passes[record.player_index] -= 1
+            else:
+                self.plays[record.player_index] -= 1
+                self.cards_shed[record.player_index] -= record.mask.bit_count()
+                if record.is_bomb:
+                    self.bombs[record.player_index] -= 1
+                self.played_mask &= ~record.mask
+
+    def _round_bounds(self, round_number):
+        position = self.round_positions.get(round_number)
+        if position is None:
+            return len(self.records), len(self.records)
+        start = self.round_offsets[position][1]
+        if position + 1 < len(self.round_offsets):
+            return start, self.round_offsets[position + 1][1]
+        return start, len(self.records)
+
+    def round_plays(self, round_number):
+        """Records of one round (a slice)"""
+        start, end = self._round_bounds(round_number)
+        return self.records[start:end]
+
+    def recent(self, count, round_number=None):
+        """The last count records, only from round_number if given"""
+        start, end = self._round_bounds(round_number) if round_number is not None else (0, len(self.records))
+        return self.records[max(start, end - count):end]
+
+    def last_play_record(self, round_number=None):
+        """Latest non-pass record, or None (also None if it is not from round_number)"""
+        if self.last_play_index < 0:
+            return None
+        record = self.records[self.last_play_index]
+        if round_number is not None and record.round_number != round_number:
+            return None
+        return record
+
+    def iter_plays_reversed(self, round_number=None):
+        """Non-pass records from newest to oldest, following the play pointers"""
+        index = self.last_play_index
+        while index >= 0:
+            record = self.records[index]
+            if round_number is not None and record.round_number != round_number:
+                return
+            yield record
+            index = self.previous_play_index[index]
+
+    def player_stats(self, player_index):
+        """Counters of one seat as a dict"""
+        return {
+            'plays_made': self.plays[player_index],
+            'passes_made': self.passes[player_index],
+            'bombs_used': self.bombs[player_index],
+            'cards_shed': self.cards_shed[player_index],
+            'rounds_won': self.rounds_won[player_index]
+        }
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __reversed__(self):
+        return reversed(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
@@ -0,0 +1,158 @@
+# core/monte_carlo.py
+# Monte Carlo bot with determinized playouts on the bitmask engine
+# Hidden hands are re-dealt from the unseen cards for every playout, so the
+# bot never looks at its opponents' real cards
+
+import math
+import random
+import time
+
+from core.bitmask import FULL_DECK, lead_play, smallest_beating_play
+from core.endgame import EndgameSolver
+from core.state import GameState
+from core.strategy import BotStrategy
+
+class MonteCarloStrategy(BotStrategy):
+    """
+    Pick the move with the best simulated win rate within a time budget
+
+    Each playout deals the unseen cards to the opponents (keeping their
+    hand sizes), applies one candidate move and finishes the game with the
+    cheap greedy policy. Candidates are chosen with UCB1, so promising
+    moves get more playouts, and the best win rate so far is returned
+    when the budget runs out. One playout counts as one budget node; the
+    strategy's own time_budget/max_playouts apply on top of the caller's budget.
+    Small endgames are solved exactly instead (see core/endgame.py).
+    """
+    name = "montecarlo"
+
+    def __init__(self, time_budget=0.15, max_playouts=None, exploration=0.7, seed=None, endgame=True):
+        self.time_budget = time_budget      # Seconds per decision
+        self.max_playouts = max_playouts    # Optional hard cap on playouts
+        self.exploration = exploration      # UCB1 exploration constant
+        self.rng = random.Random(seed)
+        self.last_playouts = 0              # Playouts run for the last decision
+        self.endgame = EndgameSolver(seed=seed) if endgame else None
+
+    def choose_move(self, observation, moves, budget):
+        self.last_playouts = 0
+        if not moves:
+            return None
+        if len(moves) == 1:
+            return moves[0]
+
+        hand = observation.hand_mask
+        for move in moves:
+            if move is not None and move[0] == hand:
+                return move  # Goes out immediately
+
+        if self.endgame and self.endgame.applies(observation):
+            solved, move = self.endgame.solve(observation, moves, budget)
+            if solved:
+                return move
+
+        seat = observation.seat
+        sizes = observation.hand_sizes
+        num_players = len(sizes)
+        unseen = [i for i in range(52) if (FULL_DECK & ~hand & ~observation.played_mask) >> i & 1]
+        if len(unseen) != sum(sizes) - sizes[seat]:
+            # History and hands disagree (e.g. a client edited the game directly)
+            print("🤖 Monte Carlo: inconsistent history, using first legal move")
+            return moves[0]
+
+        root = GameState.from_observation(observation, [0] * num_players, track_hash=False)
+        counts = [0] * len(moves)
+        wins = [0] * len(moves)
+        rng = self.rng
+        exploration = self.exploration
+        start = time.perf_counter()
+        deadline = start + self.time_budget
+        total = 0
+
+        while True:
+            if total < len(moves):
+                index = total
+            else:
+                log_total = math.log(total)
+                index = max(range(len(moves)),
+                            key=lambda i: wins[i] / counts[i] + exploration * math.sqrt(log_total / counts[i]))
+
+            # Deal the unseen cards to the opponents
+            rng.shuffle(unseen)
+            hands = [0] * num_players
+            hands[seat] = hand
+            position = 0
+            for other in range(num_players):
+                if other == seat:
+                    continue
+                mask = 0
+                for i in unseen[position:position + sizes[other]]:
+                    mask |= 1 << i
+                hands[other] = mask
+                position += sizes[other]
+
+            state = root.copy()
+            state.hands = hands
+            if simulate_move(state, moves[index]) == seat:
+                wins[index] += 1
+            counts[index] += 1
+            total += 1
+
+            if not budget.spend():
+                break
+            if self.max_playouts is not None and total >= self.max_playouts:
+                break
+            if time.perf_counter() >= deadline:
+                break
+
+        self.last_playouts = total
+        best = max(range(len(moves)), key=lambda i: (wins[i] / counts[i] if counts[i] else -1.0, -i))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"🤖 Monte Carlo: {total} playouts in {elapsed_ms:.0f}ms, "
+              f"best win rate {wins[best]}/{counts[best]}")
+        return moves[best]
+
+def simulate_move(state, move):
+    """Apply move (None = pass) for the player to move, then play out; returns the winning seat"""
+    state.apply(move)
+    return playout(state)
+
+def playout(state):
+    """
+    Finish a game with the greedy policy and return the winning seat
+    Leads shed the weakest rank, responses play the smallest beating play.
+    Steps the hands in place and leaves the other fields behind, so pass a
+    throwaway state.
+    """
+    if state.winner is not None:
+        return state.winner
+    hands = state.hands
+    num_players = len(hands)
+    turn = state.turn
+    table = state.table
+    leader = state.leader
+    passes = state.passes
+    while True:
+        hand = hands[turn]
+        if table is None:
+            play = lead_play(hand)
+        else:
+            play = smallest_beating_play(hand, table)
+
+        if play is not None:
+            hand ^= play[0]
+            hands[turn] = hand
+            if not hand:
+                return turn
+            table = play
+            leader = turn
+            passes = 0
+        else:
+            passes += 1
+            if passes >= num_players - 1:
+                # Everyone else passed: the last player to play leads again
+                table = None
+                passes = 0
+                turn = leader
+                continue
+        turn = (turn + 1) % num_players
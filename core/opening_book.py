@@ -0,0 +1,169 @@
+# core/opening_book.py
+# Precomputed round leads keyed on the rank histogram of a hand
+# Built offline with:  python -m core.opening_book build [--max-cards N]
+#
+# File format (little endian):
+#   header  '<4sHHI'  magic b'TLOB', version, max cards covered, record count
+#   records '<QI'     packed rank histogram (see core/decompose.py), lead shape
+# Records are sorted by key and searched in place through mmap, so loading
+# costs nothing until the first lookup.
+
+import argparse
+import mmap
+import os
+import struct
+import threading
+import time
+
+from core.bitmask import NIBBLE_LOWEST, classify
+from core.decompose import RANK_BITS, pack_histogram, suggest_play
+
+BOOK_MAGIC = b'TLOB'
+BOOK_VERSION = 1
+BOOK_HEADER = struct.Struct('<4sHHI')
+BOOK_RECORD = struct.Struct('<QI')
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'opening_book.bin')
+DEFAULT_MAX_CARDS = 8
+
+# Lead shape packed into the record value: start rank, number of ranks, cards per rank
+def encode_shape(play):
+    """Packed shape of a play tuple that uses one to four cards per rank"""
+    mask = play[0]
+    low = ((mask & -mask).bit_length() - 1) >> 2
+    high = (mask.bit_length() - 1) >> 2
+    width = play[2] // (high - low + 1)
+    return low | (high - low + 1) << 4 | width << 8
+
+def play_from_shape(hand, shape):
+    """Realize a packed shape on a hand mask with the weakest suits of each rank"""
+    start = shape & 0xF
+    ranks = (shape >> 4) & 0xF
+    width = shape >> 8
+    mask = 0
+    for r in range(start, start + ranks):
+        shift = 4 * r
+        mask |= NIBBLE_LOWEST[(hand >> shift) & 0xF][width] << shift
+    return classify(mask)
+
+def canonical_hand(histogram):
+    """The hand with the given histogram holding the weakest suits of each rank"""
+    hand = 0
+    for r in range(13):
+        count = (histogram >> (RANK_BITS * r)) & 7
+        hand |= NIBBLE_LOWEST[0xF][count] << (4 * r)
+    return hand
+
+class OpeningBook:
+    """Read-only view of a book file, searched by binary search over the mmap"""
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.max_cards, self.count = BOOK_HEADER.unpack_from(self.data, 0)
+        if magic != BOOK_MAGIC or version != BOOK_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {BOOK_VERSION} opening book")
+        if len(self.data) != BOOK_HEADER.size + self.count * BOOK_RECORD.size:
+            self.close()
+            raise ValueError(f"{path} is truncated")
+
+    def lookup(self, histogram):
+        """Packed lead shape for a histogram, or None if it is not in the book"""
+        data = self.data
+        unpack = BOOK_RECORD.unpack_from
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            key, shape = unpack(data, BOOK_HEADER.size + mid * BOOK_RECORD.size)
+            if key == histogram:
+                return shape
+            if key < histogram:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+_book = None
+_book_loaded = False
+_book_lock = threading.Lock()
+
+def get_book():
+    """The opening book, loaded on first use (None if there is no usable file)"""
+    global _book, _book_loaded
+    if not _book_loaded:
+        with _book_lock:
+            if not _book_loaded:
+                path = os.environ.get('OPENING_BOOK_PATH', DEFAULT_BOOK_PATH)
+                if os.path.exists(path):
+                    try:
+                        _book = OpeningBook(path)
+                        print(f"📖 Opening book loaded: {_book.count} leads (up to {_book.max_cards} cards)")
+                    except (OSError, ValueError) as e:
+                        print(f"⚠️ Opening book not used: {e}")
+                _book_loaded = True
+    return _book
+
+def recommend_lead(hand, must_include=0):
+    """
+    Recommended round lead for a hand mask
+    Uses the book when it covers the hand and computes the lead with
+    decompose.suggest_play otherwise (or when the lead must include a card).
+    """
+    if not must_include:
+        book = get_book()
+        if book is not None and hand.bit_count() <= book.max_cards:
+            shape = book.lookup(pack_histogram(hand))
+            if shape is not None:
+                return play_from_shape(hand, shape)
+    return suggest_play(hand, None, must_include)
+
+# ===== BUILDING =====
+
+def iter_histograms(max_cards, rank=0, total=0, histogram=0):
+    """Every packed rank histogram with 1 to max_cards cards"""
+    if rank == 13:
+        if total:
+            yield histogram
+        return
+    for count in range(min(4, max_cards - total) + 1):
+        yield from iter_histograms(max_cards, rank + 1, total + count,
+                                   histogram | count << (RANK_BITS * rank))
+
+def build_book(path, max_cards=DEFAULT_MAX_CARDS):
+    """Compute the lead for every histogram up to max_cards and write the book file"""
+    records = []
+    for histogram in iter_histograms(max_cards):
+        play = suggest_play(canonical_hand(histogram))
+        records.append((histogram, encode_shape(play)))
+    records.sort()
+
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(BOOK_HEADER.pack(BOOK_MAGIC, BOOK_VERSION, max_cards, len(records)))
+        for key, shape in records:
+            f.write(BOOK_RECORD.pack(key, shape))
+    os.replace(temp_path, path)
+    return len(records)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m core.opening_book',
+                                     description='Build the opening book of round leads')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help='build the book file')
+    build.add_argument('--max-cards', type=int, default=DEFAULT_MAX_CARDS,
+                       help=f'largest hand covered (default {DEFAULT_MAX_CARDS})')
+    build.add_argument('--output', default=os.environ.get('OPENING_BOOK_PATH', DEFAULT_BOOK_PATH),
+                       help='book file to write')
+    args = parser.parse_args(argv)
+
+    if not 1 <= args.max_cards <= 13:
+        parser.error('--max-cards must be between 1 and 13')
+    start = time.perf_counter()
+    count = build_book(args.output, args.max_cards)
+    print(f"📖 Wrote {count} leads to {args.output} in {time.perf_counter() - start:.1f}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,258 @@
+# core/snapshot.py
+# Compact binary snapshots of a Game
+# A snapshot is a few hundred bytes (a few KB with a long undo stack), so idle
+# web sessions can be kept as bytes and turned back into a Game when the
+# player returns.
+#
+# Format (little endian, version 2):
+#   header   '<4sBB'   magic b'TLGS', version, number of players
+#   fields   '<BbbbHbBH'  pass count, current/first player, round winner,
+#                      round number, game winner index, flags, total plays,
+#            then the game winner's name
+#   players  name, flags, score, hand (cards, see _pack_cards), strategy name
+#   table    cards on the table
+#   history  '<I' record count, then per record one byte
+#            seat | kind << 2 | new round << 5 | other name << 6, a '<H' round
+#            number when the round changed, the name the player had at the
+#            time when it is not their current one, and the '<Q' mask of a play
+#   rounds   '<H' count, then '<HB' (record index, seat) per round won
+#   undo     '<H' entry count, then per entry (oldest first) UNDO_FIELDS, the
+#            game winner's name, the table and the (hand index, card) pairs
+#            taken from the mover's hand
+# Version 1 snapshots (no undo entries) still load, with nothing to undo.
+
+import struct
+
+from core.bitmask import mask_to_cards
+from core.game import Game
+from core.history import PASS_KIND, PlayHistory
+from core.player import Player
+from core.rules import card_strength
+from core.strategy import GreedyStrategy, create_strategy
+
+SNAPSHOT_MAGIC = b'TLGS'
+SNAPSHOT_VERSION = 2
+SNAPSHOT_HEADER = struct.Struct('<4sBB')
+SNAPSHOT_FIELDS = struct.Struct('<BbbbHbBH')
+PLAYER_FIELDS = struct.Struct('<BH')
+CARDS_FIELDS = struct.Struct('<QB')
+RECORD_ROUND = struct.Struct('<H')
+RECORD_MASK = struct.Struct('<Q')
+COUNT = struct.Struct('<I')
+ROUND_WIN = struct.Struct('<HB')
+# Mover, history length, pass count, current/first player, round winner, round number,
+# game winner index, flags, total plays, position hash, has_passed bits, removed cards
+UNDO_FIELDS = struct.Struct('<BIBbbbHbBHQBB')
+
+FLAG_BOMB_USED = 1
+FLAG_WINNER_NAME = 2
+RECORD_NEW_ROUND = 1 << 5
+RECORD_NAME = 1 << 6
+
+def _index(value):
+    return -1 if value is None else value
+
+def _optional(value):
+    return None if value < 0 else value
+
+def _seat(seat_of, player):
+    return seat_of.get(id(player), -1) if player is not None else -1
+
+def _pack_text(text):
+    data = (text or '').encode('utf-8')[:255]
+    return bytes([len(data)]) + data
+
+def _pack_cards(cards):
+    """Cards as a mask, plus their order when it is not weakest first"""
+    strengths = [card_strength(card) for card in cards]
+    mask = 0
+    for strength in strengths:
+        mask |= 1 << strength
+    if strengths == sorted(strengths):
+        return CARDS_FIELDS.pack(mask, 0)
+    return CARDS_FIELDS.pack(mask, 1) + bytes(strengths)
+
+def dump_game(game):
+    """Serialize a Game to bytes"""
+    players = game.players
+    seat_of = {id(player): seat for seat, player in enumerate(players)}
+    round_winner = _seat(seat_of, game.round_winner)
+    parts = [
+        SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(players)),
+        SNAPSHOT_FIELDS.pack(game.pass_count, _index(game.current_player_index),
+                             _index(game.first_player_index), round_winner, game.round_number,
+                             _index(game.game_winner_index),
+                             (FLAG_BOMB_USED if game.bomb_used else 0) |
+                             (FLAG_WINNER_NAME if game.game_winner_name is not None else 0),
+                             game.total_plays),
+        _pack_text(game.game_winner_name)
+    ]
+
+    for seat, player in enumerate(players):
+        strategy = game.strategies.get(seat)
+        parts.append(_pack_text(player.name))
+        parts.append(PLAYER_FIELDS.pack(player.is_human | player.has_passed << 1, player.score))
+        parts.append(_pack_cards(player.hand))
+        parts.append(_pack_text(strategy.name if strategy is not None else ''))
+    parts.append(_pack_cards(game.last_play))
+
+    history = game.play_history
+    parts.append(COUNT.pack(len(history)))
+    round_number = None
+    for record in history:
+        header = record.player_index | record.kind << 2
+        renamed = record.player != players[record.player_index].name
+        if renamed:
+            header |= RECORD_NAME
+        if record.round_number != round_number:
+            round_number = record.round_number
+            parts.append(bytes([header | RECORD_NEW_ROUND]))
+            parts.append(RECORD_ROUND.pack(round_number))
+        else:
+            parts.append(bytes([header]))
+        if renamed:
+            parts.append(_pack_text(record.player))
+        if record.kind != PASS_KIND:
+            parts.append(RECORD_MASK.pack(record.mask))
+    parts.append(RECORD_ROUND.pack(len(history.round_wins)))
+    for index, seat in history.round_wins:
+        parts.append(ROUND_WIN.pack(index, seat))
+
+    parts.append(RECORD_ROUND.pack(len(game.undo_stack)))
+    for player_index, history_length, removed, fields, passed in game.undo_stack:
+        (last_play, pass_count, current_player_index, first_player_index, round_number,
+         round_winner, bomb_used, total_plays, game_winner_index, game_winner_name,
+         position_hash) = fields
+        parts.append(UNDO_FIELDS.pack(
+            player_index, history_length, pass_count, _index(current_player_index),
+            _index(first_player_index), _seat(seat_of, round_winner), round_number,
+            _index(game_winner_index),
+            (FLAG_BOMB_USED if bomb_used else 0) |
+            (FLAG_WINNER_NAME if game_winner_name is not None else 0),
+            total_plays, position_hash,
+            sum(has_passed << seat for seat, has_passed in enumerate(passed)), len(removed)))
+        parts.append(_pack_text(game_winner_name))
+        parts.append(_pack_cards(last_play))
+        parts.append(bytes(value for index, card in removed
+                           for value in (index, card_strength(card))))
+    return b''.join(parts)
+
+class _Reader:
+    """Sequential reads over snapshot bytes"""
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+
+    def unpack(self, fmt):
+        values = fmt.unpack_from(self.data, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def take(self, size):
+        if self.offset + size > len(self.data):
+            raise ValueError("snapshot is truncated")
+        chunk = self.data[self.offset:self.offset + size]
+        self.offset += size
+        return chunk
+
+    def text(self):
+        return self.take(self.take(1)[0]).decode('utf-8')
+
+    def cards(self):
+        mask, ordered = self.unpack(CARDS_FIELDS)
+        cards = mask_to_cards(mask)
+        if ordered:
+            by_strength = {card_strength(card): card for card in cards}
+            cards = [by_strength[strength] for strength in self.take(len(cards))]
+        return cards
+
+def load_game(data, strategy_factory=create_strategy):
+    """
+    Rebuild a Game from dump_game() bytes
+    strategy_factory(name) creates the saved per-seat bot strategies.
+    Raises ValueError for data that is not a game snapshot.
+    """
+    reader = _Reader(data)
+    try:
+        magic, version, num_players = reader.unpack(SNAPSHOT_HEADER)
+        if magic != SNAPSHOT_MAGIC or version not in (1, SNAPSHOT_VERSION):
+            raise ValueError(f"not a version {SNAPSHOT_VERSION} game snapshot")
+        (pass_count, current_player_index, first_player_index, round_winner, round_number,
+         game_winner_index, flags, total_plays) = reader.unpack(SNAPSHOT_FIELDS)
+        game_winner_name = reader.text()
+
+        game = Game.__new__(Game)
+        game.players = []
+        game.strategies = {}
+        for seat in range(num_players):
+            player = Player(reader.text())
+            player_flags, player.score = reader.unpack(PLAYER_FIELDS)
+            player.is_human = bool(player_flags & 1)
+            player.has_passed = bool(player_flags & 2)
+            player.hand = reader.cards()
+            strategy_name = reader.text()
+            if strategy_name:
+                game.strategies[seat] = strategy_factory(strategy_name)
+            game.players.append(player)
+        game.last_play = reader.cards()
+
+        history = PlayHistory(num_players)
+        (count,) = reader.unpack(COUNT)
+        records = []
+        record_round = None
+        for _ in range(count):
+            header = reader.take(1)[0]
+            if header & RECORD_NEW_ROUND:
+                (record_round,) = reader.unpack(RECORD_ROUND)
+            seat = header & 3
+            kind = (header >> 2) & 7
+            name = reader.text() if header & RECORD_NAME else game.players[seat].name
+            mask = reader.unpack(RECORD_MASK)[0] if kind != PASS_KIND else 0
+            records.append((seat, name, kind, mask, record_round))
+        (wins,) = reader.unpack(RECORD_ROUND)
+        round_wins = dict(reader.unpack(ROUND_WIN) for _ in range(wins))
+
+        undo_stack = []
+        (entries,) = reader.unpack(RECORD_ROUND) if version >= 2 else (0,)
+        for _ in range(entries):
+            (player_index, history_length, entry_pass_count, entry_current, entry_first,
+             entry_round_winner, entry_round, entry_winner_index, entry_flags, entry_total_plays,
+             entry_hash, passed_bits, removed_count) = reader.unpack(UNDO_FIELDS)
+            entry_winner_name = reader.text()
+            entry_last_play = reader.cards()
+            removed = [(index, mask_to_cards(1 << strength)[0])
+                       for index, strength in zip(*[iter(reader.take(2 * removed_count))] * 2)]
+            fields = (entry_last_play, entry_pass_count, _optional(entry_current),
+                      _optional(entry_first), entry_round,
+                      game.players[entry_round_winner] if entry_round_winner >= 0 else None,
+                      bool(entry_flags & FLAG_BOMB_USED), entry_total_plays,
+                      _optional(entry_winner_index),
+                      entry_winner_name if entry_flags & FLAG_WINNER_NAME else None, entry_hash)
+            passed = tuple(bool(passed_bits >> seat & 1) for seat in range(num_players))
+            undo_stack.append((player_index, history_length, removed, fields, passed))
+    except struct.error:
+        raise ValueError("snapshot is truncated")
+
+    for index, (seat, name, kind, mask, record_round) in enumerate(records):
+        if kind == PASS_KIND:
+            history.append_pass(seat, name, record_round)
+        else:
+            history.append_play(seat, name, mask, kind, record_round)
+        if index in round_wins:
+            history.close_round(round_wins[index])
+
+    game.play_history = history
+    game.pass_count = pass_count
+    game.total_plays = total_plays
+    game.bomb_used = bool(flags & FLAG_BOMB_USED)
+    game.default_strategy = GreedyStrategy()
+    game.last_decision = None
+    game.undo_stack = undo_stack
+    game.round_winner = game.players[round_winner] if round_winner >= 0 else None
+    game.first_player_index = _optional(first_player_index)
+    game.current_player_index = _optional(current_player_index)
+    game.game_winner_index = _optional(game_winner_index)
+    game.game_winner_name = game_winner_name if flags & FLAG_WINNER_NAME else None
+    game.round_number = round_number
+    game.position_hash = game.compute_position_hash()
+    return game
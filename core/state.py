@@ -0,0 +1,157 @@
+# core/state.py
+# Compact, side-effect-free game state for search and simulation
+# Hands are bitmasks (see core/bitmask.py) and moves are play tuples or None
+# for a pass. apply() returns an undo record so a search can step forward and
+# back in O(1) without copying anything.
+
+from core.bitmask import cards_to_mask, classify_cards, generate_plays, mask_to_cards
+from core.zobrist import PASS_KEYS, TURN_KEYS, hand_key, position_hash, table_key
+
+class GameState:
+    """
+    Hands, table and turn of a game, nothing else
+
+    leader is the seat that made the table play (it leads again once
+    everyone else passes). hash is the Zobrist hash of the position
+    (core/zobrist.py), or None when the state was created with
+    track_hash=False for cheap throwaway playouts.
+    """
+    __slots__ = ('hands', 'table', 'passes', 'turn', 'leader', 'round_number', 'winner', 'hash')
+
+    def __init__(self, hands, table=None, passes=0, turn=0, leader=None,
+                 round_number=1, winner=None, track_hash=True):
+        self.hands = list(hands)
+        self.table = table
+        self.passes = passes
+        self.turn = turn
+        self.leader = turn if leader is None else leader
+        self.round_number = round_number
+        self.winner = winner
+        self.hash = self.compute_hash() if track_hash else None
+
+    # ===== CONVERSION =====
+
+    @classmethod
+    def from_game(cls, game):
+        """Snapshot a Game (every hand is included, so this is not a player's view)"""
+        turn = game.current_player_index or 0
+        leader = None
+        if game.last_play:
+            round_winner = game.get_round_winner()
+            if round_winner is not None:
+                leader = game.get_player_index(round_winner)
+        winner = game.get_winner()
+        return cls([cards_to_mask(p.hand) for p in game.players],
+                   classify_cards(game.last_play) if game.last_play else None,
+                   game.pass_count, turn, leader, game.round_number,
+                   game.get_player_index(winner) if winner else None)
+
+    @classmethod
+    def from_observation(cls, observation, hands, track_hash=True):
+        """State seen by an Observation, with hands filled in (e.g. a determinized deal)"""
+        table = observation.table_play
+        leader = observation.last_player_index if table is not None else None
+        return cls(hands, table, observation.pass_count, observation.seat, leader,
+                   observation.round_number, track_hash=track_hash)
+
+    def to_game(self, game):
+        """Write this state back into a Game (play history is left as it is)"""
+        for player, mask in zip(game.players, self.hands):
+            player.hand = mask_to_cards(mask)
+        game.last_play = mask_to_cards(self.table[0]) if self.table else []
+        game.pass_count = self.passes
+        game.current_player_index = self.turn
+        game.round_number = self.round_number
+        game.position_hash = game.compute_position_hash()
+        return game
+
+    def copy(self):
+        state = GameState.__new__(GameState)
+        state.hands = list(self.hands)
+        state.table = self.table
+        state.passes = self.passes
+        state.turn = self.turn
+        state.leader = self.leader
+        state.round_number = self.round_number
+        state.winner = self.winner
+        state.hash = self.hash
+        return state
+
+    def compute_hash(self):
+        """Zobrist hash from scratch (same as Game.compute_position_hash)"""
+        return position_hash(self.hands, self.table[0] if self.table else 0, self.passes, self.turn)
+
+    # ===== MOVES =====
+
+    @property
+    def num_players(self):
+        return len(self.hands)
+
+    def is_over(self):
+        return self.winner is not None
+
+    def legal_moves(self, must_include=0):
+        """Legal plays for the player to move; None (pass) is last when allowed"""
+        moves = generate_plays(self.hands[self.turn], self.table, must_include)
+        if self.table is not None:
+            moves.append(None)
+        return moves
+
+    def apply(self, move):
+        """
+        Play move (a play tuple, or None to pass) for the player to move
+        Returns the record undo() needs. Moves are not validated.
+        """
+        table = self.table
+        passes = self.passes
+        seat = self.turn
+        key = self.hash
+        record = (table, passes, seat, self.leader, self.round_number, self.winner, key)
+        num_players = len(self.hands)
+
+        if move is None:
+            if passes + 1 >= num_players - 1:
+                # Everyone else passed: the last player to play leads again
+                turn = self.leader
+                self.table = None
+                self.passes = 0
+                self.round_number += 1
+                if key is not None:
+                    key ^= PASS_KEYS[passes] ^ PASS_KEYS[0]
+                    if table is not None:
+                        key ^= table_key(table[0])
+            else:
+                turn = (seat + 1) % num_players
+                self.passes = passes + 1
+                if key is not None:
+                    key ^= PASS_KEYS[passes] ^ PASS_KEYS[passes + 1]
+        else:
+            mask = move[0]
+            remaining = self.hands[seat] ^ mask
+            self.hands[seat] = remaining
+            if not remaining:
+                self.winner = seat
+            turn = (seat + 1) % num_players
+            self.table = move
+            self.leader = seat
+            self.passes = 0
+            if key is not None:
+                key ^= hand_key(seat, mask) ^ table_key(mask) ^ PASS_KEYS[passes] ^ PASS_KEYS[0]
+                if table is not None:
+                    key ^= table_key(table[0])
+
+        self.turn = turn
+        if key is not None:
+            self.hash = key ^ TURN_KEYS[seat] ^ TURN_KEYS[turn]
+        return record
+
+    def undo(self, move, record):
+        """Revert apply(move) given the record it returned"""
+        (self.table, self.passes, self.turn, self.leader,
+         self.round_number, self.winner, self.hash) = record
+        if move is not None:
+            self.hands[self.turn] ^= move[0]
+
+    def __repr__(self):
+        return (f"GameState(turn={self.turn}, table={self.table[0] if self.table else None}, "
+                f"passes={self.passes}, cards={[mask.bit_count() for mask in self.hands]})")
@@ -0,0 +1,494 @@
+# core/strategy.py
+# Pluggable bot strategies
+# A strategy gets an immutable Observation of the game from one seat plus the
+# list of legal moves, and returns the move to make. Moves are bitmask play
+# tuples (see core/bitmask.py) and None means pass. The engine applies the move.
+
+import random
+import time
+from collections import defaultdict, namedtuple
+
+from core.bitmask import (THREE_OF_SPADES, cards_to_mask, classify_cards,
+                          generate_plays, select_cards)
+from core.endgame import EndgameSolver
+from core.opening_book import recommend_lead
+from core.rules import beats, get_play_type, card_strength
+
+# Everything a strategy may look at. Opponents' cards are not included.
+Observation = namedtuple('Observation', [
+    'seat',                    # Index of the deciding player
+    'player_name',             # Name of the deciding player
+    'hand',                    # Tuple of the player's Cards, weakest first
+    'hand_mask',               # Same hand as a bitmask
+    'table',                   # Tuple of Cards on the table (empty when leading)
+    'table_play',              # Table as a bitmask play tuple, or None
+    'last_player_index',       # Who played the table cards (None when leading)
+    'hand_sizes',              # Tuple of card counts per seat
+    'played_mask',             # Bitmask of every card played so far
+    'pass_count',              # Consecutive passes on the current table
+    'round_number',
+    'is_lead',                 # True when starting a round
+    'is_first_play_of_game',   # True when the lead must include 3♠
+])
+
+def build_observation(game, seat):
+    """Snapshot what the player at seat can see of the game"""
+    player = game.players[seat]
+    hand = tuple(sorted(player.hand, key=lambda c: c.value()))
+    table = tuple(game.last_play)
+
+    last_player_index = None
+    if table:
+        round_winner = game.get_round_winner()
+        if round_winner is not None:
+            last_player_index = game.get_player_index(round_winner)
+
+    return Observation(
+        seat=seat,
+        player_name=player.name,
+        hand=hand,
+        hand_mask=cards_to_mask(hand),
+        table=table,
+        table_play=classify_cards(table) if table else None,
+        last_player_index=last_player_index,
+        hand_sizes=tuple(len(p.hand) for p in game.players),
+        played_mask=game.play_history.played_mask,
+        pass_count=game.pass_count,
+        round_number=game.round_number,
+        is_lead=game.is_first_play_of_round(),
+        is_first_play_of_game=game.is_first_play_of_game()
+    )
+
+def legal_moves(observation):
+    """All legal moves for the observing player; None (pass) is last when allowed"""
+    table_play = observation.table_play
+    must_include = THREE_OF_SPADES if table_play is None and observation.is_first_play_of_game else 0
+    moves = generate_plays(observation.hand_mask, table_play, must_include)
+    if table_play is not None:
+        moves.append(None)
+    return moves
+
+class SearchBudget:
+    """
+    Wall-clock and/or node limit for one decision
+
+    Strategies call spend() for every node (playout, search node, ...) they
+    evaluate and stop as soon as it returns False, answering with the best
+    move found so far. Either limit may be None.
+    """
+    def __init__(self, time_limit=None, node_limit=None):
+        self.time_limit = time_limit    # Seconds
+        self.node_limit = node_limit
+        self.nodes = 0
+        self.exhausted = False          # Set once a limit was hit
+        self.started_at = time.perf_counter()
+        self.deadline = self.started_at + time_limit if time_limit is not None else None
+
+    def spend(self, nodes=1):
+        """Count evaluated nodes; returns True while the budget lasts"""
+        self.nodes += nodes
+        return not self.expired()
+
+    def expired(self):
+        if self.exhausted:
+            return True
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            self.exhausted = True
+        elif self.deadline is not None and time.perf_counter() >= self.deadline:
+            self.exhausted = True
+        return self.exhausted
+
+    def elapsed(self):
+        """Seconds since the decision started"""
+        return time.perf_counter() - self.started_at
+
+# Per-decision telemetry
+DecisionStats = namedtuple('DecisionStats', [
+    'seat',
+    'strategy',
+    'nodes',              # Nodes the strategy evaluated
+    'elapsed_ms',
+    'budget_exhausted',   # True if the answer is "best so far" rather than complete
+    'legal_moves',
+    'time_limit_ms',
+    'node_limit',
+])
+
+def run_strategy(strategy, observation, moves, budget=None):
+    """Ask a strategy for its move within budget; returns (move, DecisionStats)"""
+    if budget is None:
+        budget = SearchBudget()
+    move = strategy.choose_move(observation, moves, budget)
+    stats = DecisionStats(
+        seat=observation.seat,
+        strategy=strategy.name,
+        nodes=budget.nodes,
+        elapsed_ms=round(budget.elapsed() * 1000, 2),
+        budget_exhausted=budget.exhausted,
+        legal_moves=len(moves),
+        time_limit_ms=round(budget.time_limit * 1000) if budget.time_limit is not None else None,
+        node_limit=budget.node_limit
+    )
+    return move, stats
+
+class BotStrategy:
+    """
+    Base class for bot strategies
+
+    Subclasses implement choose_move(observation, moves, budget) and return
+    one of moves, another legal play tuple for the same hand, or None to
+    pass. Search strategies must respect the SearchBudget and return the
+    best move found so far once it runs out.
+    """
+    name = "base"
+
+    def choose_move(self, observation, moves, budget):
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"{type(self).__name__}(name='{self.name}')"
+
+class GreedyStrategy(BotStrategy):
+    """
+    The original rule-based bot
+    Leads with the biggest combination it can shed and otherwise plays the
+    smallest combination that beats the table; bombs are used on 2s with
+    some randomness. With endgame=True small endgames are solved exactly
+    (see core/endgame.py).
+    """
+    name = "greedy"
+
+    def __init__(self, endgame=False):
+        self.endgame = EndgameSolver() if endgame else None
+
+    def choose_move(self, observation, moves, budget):
+        budget.spend()
+        if not observation.hand:
+            return None
+
+        play = self._heuristic_move(observation)
+        if self.endgame and self.endgame.applies(observation):
+            solved, move = self.endgame.solve(observation, moves, budget, preferred=play)
+            if solved:
+                return move
+        return play
+
+    def _heuristic_move(self, observation):
+        """The rule-based choice as a play tuple, or None to pass"""
+        if observation.is_lead:
+            if observation.is_first_play_of_game:
+                # First play of fresh game - must include 3♠
+                cards = self._play_with_three_spades(observation)
+            else:
+                # First play of round (round 2+) - any valid combination
+                cards = self._play_best_first_combination(observation)
+        elif observation.table:
+            table_type = get_play_type(observation.table)
+            # Check if table contains 2 - bombs can only be used against 2
+            table_has_two = any(card.rank == 2 for card in observation.table)
+            cards = self._find_beating_play(observation, table_type, table_has_two)
+        else:
+            cards = None
+
+        return classify_cards(cards) if cards else None
+
+    def _play_with_three_spades(self, observation):
+        """Find a valid combination that includes 3♠ for bot's first play of FRESH GAME"""
+        hand = list(observation.hand)
+        
+        # Find 3♠
+        three_spades = None
+        for card in hand:
+            if card.rank == 3 and card.suit == "♠":
+                three_spades = card
+                break
+        
+        if not three_spades:
+            print(f"🤖 ERROR: {observation.player_name} should have 3♠ but doesn't!")
+            return None
+        
+        print(f"🤖 {observation.player_name} has 3♠ and must include it in first play of fresh game")
+        
+        # Best lead that includes 3♠ (single 3♠ at worst)
+        play = recommend_lead(observation.hand_mask, THREE_OF_SPADES)
+        return select_cards(hand, play[0]) if play else [three_spades]
+
+    def _play_best_first_combination(self, observation):
+        """Play the best combination when starting a new round (round 2+)"""
+        if not observation.hand:
+            return None
+        
+        # For rounds after round 1, any valid combination is OK:
+        # lead with the play that leaves the hand easiest to shed
+        # (fewest remaining plays), keeping 2s and bombs back.
+        # Small hands come straight from the opening book.
+        play = recommend_lead(observation.hand_mask)
+        return select_cards(list(observation.hand), play[0]) if play else None
+
+    def _find_beating_play(self, observation, table_type, table_has_two):
+        """
+        Find a play that beats the current table combination
+        BOMBS CAN ONLY BE USED AGAINST PLAYS CONTAINING 2
+        """
+        hand = list(observation.hand)
+        table = list(observation.table)
+        
+        # CRITICAL FIX: Bombs can only be used against plays containing 2
+        if table_has_two:
+            # Table contains 2 - check if bot has bombs and should use them
+            bombs = self._find_all_bombs(hand)
+            if bombs and self._should_use_bomb(observation):
+                # Use the smallest appropriate bomb
+                for bomb in sorted(bombs, key=lambda b: max(card_strength(card) for card in b)):
+                    if beats(bomb, table):
+                        print(f"🤖 {observation.player_name} using bomb on 2 play")
+                        return bomb
+        
+        # Normal play logic for all other cases (no 2 on table)
+        if table_type == "single":
+            # Find a single card that beats the table
+            table_card = table[0]
+            for card in hand:
+                if beats([card], [table_card]):
+                    return [card]
+        
+        elif table_type == "pair":
+            # Find a pair that beats the table pair
+            table_rank = table[0].rank
+            
+            # Group cards by rank
+            rank_groups = defaultdict(list)
+            for card in hand:
+                rank_groups[card.rank].append(card)
+            
+            # Look for pairs with higher rank
+            for rank, cards in sorted(rank_groups.items(), key=lambda x: card_strength(x[1][0])):
+                if len(cards) >= 2 and beats(cards[:2], table):
+                    return cards[:2]
+        
+        elif table_type == "triple":
+            # Find a triple that beats the table triple
+            table_rank = table[0].rank
+            
+            # Group cards by rank
+            rank_groups = defaultdict(list)
+            for card in hand:
+                rank_groups[card.rank].append(card)
+            
+            # Look for triples with higher rank
+            for rank, cards in sorted(rank_groups.items(), key=lambda x: card_strength(x[1][0])):
+                if len(cards) >= 3 and beats(cards[:3], table):
+                    return cards[:3]
+        
+        elif table_type == "straight":
+            # Find a straight that beats the table straight
+            straights = self._find_all_straights(hand)
+            table_straight = table
+            
+            for straight in straights:
+                if len(straight) == len(table_straight) and beats(straight, table_straight):
+                    return straight
+        
+        elif table_type == "quadruple":
+            # Find a quadruple that beats the table quadruple
+            # Only if table contains 2 (handled above) or we need a higher quadruple
+            if not table_has_two:
+                table_rank = table[0].rank
+                
+                # Group cards by rank
+                rank_groups = defaultdict(list)
+                for card in hand:
+                    rank_groups[card.rank].append(card)
+                
+                # Look for quadruples with higher rank
+                for rank, cards in sorted(rank_groups.items(), key=lambda x: card_strength(x[1][0])):
+                    if len(cards) >= 4 and beats(cards[:4], table):
+                        return cards[:4]
+        
+        elif table_type == "consecutive_pairs":
+            # Find consecutive pairs that beat the table
+            # Check if table has 2 (bomb case already handled)
+            if not table_has_two:
+                consecutive_pairs_plays = self._find_all_consecutive_pairs(hand)
+                table_pairs = table
+                
+                for pairs in consecutive_pairs_plays:
+                    if len(pairs) == len(table_pairs) and beats(pairs, table_pairs):
+                        return pairs
+        
+        return None
+
+    # ===== HELPER METHODS FOR FINDING COMBINATIONS =====
+    
+    def _find_all_straights(self, hand):
+        """Find all possible straights in hand"""
+        if len(hand) < 3:
+            return []
+        
+        # Sort by card strength
+        sorted_hand = sorted(hand, key=lambda c: card_strength(c))
+        
+        straights = []
+        
+        # Check for straights starting from each card
+        for i in range(len(sorted_hand)):
+            current_straight = [sorted_hand[i]]
+            
+            for j in range(i + 1, len(sorted_hand)):
+                next_card = sorted_hand[j]
+                
+                # Check if this card continues the straight
+                last_rank_val = card_strength(current_straight[-1]) // 4
+                next_rank_val = card_strength(next_card) // 4
+                
+                # 2 cannot be in straight (rank value 12)
+                if last_rank_val == 12 or next_rank_val == 12:
+                    continue
+                
+                if next_rank_val == last_rank_val + 1:
+                    current_straight.append(next_card)
+                elif next_rank_val > last_rank_val + 1:
+                    # Gap too big, can't continue this straight
+                    break
+            
+            if len(current_straight) >= 3:
+                straights.append(current_straight)
+        
+        return straights
+    
+    def _find_all_bombs(self, hand):
+        """Find all bombs (quadruples and consecutive pairs) in hand"""
+        bombs = []
+        
+        # Find quadruples
+        rank_groups = defaultdict(list)
+        for card in hand:
+            rank_groups[card.rank].append(card)
+        
+        for cards in rank_groups.values():
+            if len(cards) >= 4:
+                bombs.append(cards[:4])
+        
+        # Find consecutive pairs (minimum 3 pairs = 6 cards)
+        pairs_list = []
+        for rank, cards in rank_groups.items():
+            if len(cards) >= 2:
+                pairs_list.append((rank, cards[:2]))
+        
+        if len(pairs_list) >= 3:
+            # Sort by rank
+            pairs_list.sort(key=lambda x: card_strength(x[1][0]))
+            
+            # Find consecutive pairs
+            for i in range(len(pairs_list) - 2):
+                # Check if next 3 ranks are consecutive
+                rank1_val = card_strength(pairs_list[i][1][0]) // 4
+                rank2_val = card_strength(pairs_list[i+1][1][0]) // 4
+                rank3_val = card_strength(pairs_list[i+2][1][0]) // 4
+                
+                # 2 cannot be in consecutive pairs
+                if rank1_val == 12 or rank2_val == 12 or rank3_val == 12:
+                    continue
+                
+                if rank2_val == rank1_val + 1 and rank3_val == rank2_val + 1:
+                    bomb_cards = []
+                    bomb_cards.extend(pairs_list[i][1])
+                    bomb_cards.extend(pairs_list[i+1][1])
+                    bomb_cards.extend(pairs_list[i+2][1])
+                    bombs.append(bomb_cards)
+        
+        return bombs
+    
+    def _find_all_consecutive_pairs(self, hand):
+        """Find all consecutive pairs combinations"""
+        pairs_list = []
+        rank_groups = defaultdict(list)
+        
+        for card in hand:
+            rank_groups[card.rank].append(card)
+        
+        for cards in rank_groups.values():
+            if len(cards) >= 2:
+                pairs_list.append((cards[0].rank, cards[:2]))
+        
+        if len(pairs_list) < 3:
+            return []
+        
+        # Sort by rank
+        pairs_list.sort(key=lambda x: card_strength(x[1][0]))
+        
+        consecutive_pairs = []
+        
+        # Find all possible consecutive pairs combinations
+        for start in range(len(pairs_list) - 2):
+            for end in range(start + 3, len(pairs_list) + 1):
+                # Check if all ranks in this range are consecutive
+                is_consecutive = True
+                for i in range(start, end - 1):
+                    rank1_val = card_strength(pairs_list[i][1][0]) // 4
+                    rank2_val = card_strength(pairs_list[i+1][1][0]) // 4
+                    
+                    # 2 cannot be in consecutive pairs
+                    if rank1_val == 12 or rank2_val == 12:
+                        is_consecutive = False
+                        break
+                    
+                    if rank2_val != rank1_val + 1:
+                        is_consecutive = False
+                        break
+                
+                if is_consecutive:
+                    # Create the combination
+                    combination = []
+                    for i in range(start, end):
+                        combination.extend(pairs_list[i][1])
+                    consecutive_pairs.append(combination)
+        
+        return consecutive_pairs
+    
+    def _should_use_bomb(self, observation):
+        """
+        Determine if bot should use a bomb
+        Bots should be conservative with bombs - only use when necessary
+        """
+        # If bot has few cards left, be more aggressive with bombs
+        if len(observation.hand) <= 3:
+            return True
+        
+        # If bot has many cards, save bombs for later
+        if len(observation.hand) >= 10:
+            return random.random() < 0.4  # 40% chance to use bomb
+        
+        # Check if many players are still in the round
+        active_players = sum(1 for size in observation.hand_sizes if size > 0)
+        if active_players > 2:
+            # Save bomb for later when fewer players remain
+            return random.random() < 0.3  # 30% chance to use bomb
+        
+        # Default: use bomb
+        return True
+
+class EndgameStrategy(GreedyStrategy):
+    """The greedy bot that solves small endgames exactly"""
+    name = "endgame"
+
+    def __init__(self):
+        super().__init__(endgame=True)
+
+# -----------------------------
+# Strategy registry
+# -----------------------------
+
+STRATEGY_NAMES = ("greedy", "endgame", "montecarlo")
+
+def create_strategy(name, **options):
+    """Create a strategy by registry name; raises ValueError for unknown names"""
+    name = (name or "greedy").lower()
+    if name == "greedy":
+        return GreedyStrategy(**options)
+    if name == "endgame":
+        return EndgameStrategy(**options)
+    if name == "montecarlo":
+        from core.monte_carlo import MonteCarloStrategy
+        return MonteCarloStrategy(**options)
+    raise ValueError(f"Unknown bot strategy '{name}'. Available: {', '.join(STRATEGY_NAMES)}")
@@ -0,0 +1,101 @@
+# core/zobrist.py
+# Zobrist hashing of game positions
+# A position is the four hands (bitmasks), the cards on the table, the pass
+# count and whose turn it is. Its hash is the XOR of one random 64-bit key per
+# feature, so a move only XORs out what it removes and XORs in what it adds.
+# The keys are fixed and public, so a hash gives the hidden hands away: it
+# stays on the server (caches, snapshots) and is never sent to clients.
+
+import random
+from collections import OrderedDict
+from functools import lru_cache
+
+ZOBRIST_SEED = 0x7E1E1A   # Fixed so hashes are stable across processes
+MAX_SEATS = 4
+MAX_PASSES = 4
+
+_rng = random.Random(ZOBRIST_SEED)
+HAND_KEYS = [[_rng.getrandbits(64) for _ in range(52)] for _ in range(MAX_SEATS)]
+TABLE_KEYS = [_rng.getrandbits(64) for _ in range(52)]
+PASS_KEYS = [_rng.getrandbits(64) for _ in range(MAX_PASSES)]
+TURN_KEYS = [_rng.getrandbits(64) for _ in range(MAX_SEATS)]
+
+def _mask_key(keys, mask):
+    key = 0
+    while mask:
+        low = mask & -mask
+        key ^= keys[low.bit_length() - 1]
+        mask ^= low
+    return key
+
+@lru_cache(maxsize=65536)
+def hand_key(seat, mask):
+    """Key of the cards in mask held by seat"""
+    return _mask_key(HAND_KEYS[seat], mask)
+
+@lru_cache(maxsize=65536)
+def table_key(mask):
+    """Key of the cards on the table (0 for an empty table)"""
+    return _mask_key(TABLE_KEYS, mask)
+
+def pass_key(pass_count):
+    return PASS_KEYS[min(pass_count, MAX_PASSES - 1)]
+
+def turn_key(seat):
+    return TURN_KEYS[seat]
+
+def position_hash(hands, table_mask, pass_count, turn):
+    """Full hash of a position; hands is a sequence of masks indexed by seat"""
+    key = table_key(table_mask) ^ pass_key(pass_count) ^ turn_key(turn)
+    for seat, mask in enumerate(hands):
+        key ^= hand_key(seat, mask)
+    return key
+
+class TranspositionCache:
+    """
+    Bounded map from position hash to an evaluation, least recently used
+    entries are dropped first
+    """
+    def __init__(self, max_entries=100000):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        entries = self.entries
+        if key in entries:
+            entries.move_to_end(key)
+            self.hits += 1
+            return entries[key]
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        entries = self.entries
+        entries[key] = value
+        entries.move_to_end(key)
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """Size and hit counters as a dict"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+        }
@@ -2,8 +2,10 @@ import pygame
 import sys
 import math
 import random
+from array import array
 from enum import Enum
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from core.game import Game
 from gui.renderer import draw_card, draw_rounded_rect
 from core.rules import is_valid_play, beats, get_play_type
@@ -86,59 +88,140 @@ class CardAnimation:
         y = self.start_pos[1] + (self.end_pos[1] - self.start_pos[1]) * ease + y_offset
         return (int(x), int(y))
 
-class Particle:
-    def __init__(self, x, y, color=None, bomb_effect=False):
-        self.x = x
-        self.y = y
+# Particle colors are stored as indexes into this palette so the pool can
+# keep them in a compact byte array
+PARTICLE_COLORS = [
+    (255, 215, 0),   # Gold
+    (255, 255, 255), # White
+    (255, 100, 100), # Red
+    (100, 200, 255), # Blue
+    (255, 150, 50),  # Orange
+    (255, 200, 0)    # Yellow-orange
+]
+CELEBRATION_COLORS = (0, 1, 2, 3)
+BOMB_COLORS = (2, 4, 5)
+PARTICLE_GRAVITY = 0.3
+PARTICLE_ALPHA_STEPS = 16  # Alpha is quantized so sprites can be cached
+
+class ParticlePool:
+    """
+    Fixed-capacity particle system with struct-of-arrays storage.
+    
+    Live particles occupy slots [0, count); a dead particle is replaced by
+    the last live one, so updating never allocates and drawing is a single
+    blits() call over cached sprites.
+    """
+    def __init__(self, capacity=512):
+        self.capacity = capacity
+        self.count = 0
+        self.x = array('f', bytes(4 * capacity))
+        self.y = array('f', bytes(4 * capacity))
+        self.vx = array('f', bytes(4 * capacity))
+        self.vy = array('f', bytes(4 * capacity))
+        self.age = array('f', bytes(4 * capacity))
+        self.lifetime = array('f', bytes(4 * capacity))
+        self.size = array('B', bytes(capacity))
+        self.color = array('B', bytes(capacity))
+        self.bomb = array('B', bytes(capacity))
+        self._color_index = {color: i for i, color in enumerate(PARTICLE_COLORS)}
+        self._sprites = {}
+        self._blit_sequence = []
+    
+    def __len__(self):
+        return self.count
+    
+    def clear(self):
+        """Drop all live particles (storage is kept)"""
+        self.count = 0
+    
+    def spawn(self, x, y, color=None, bomb_effect=False):
+        """Add a particle, returns False when the pool is full"""
+        i = self.count
+        if i >= self.capacity:
+            return False
+        
+        self.x[i] = x
+        self.y[i] = y
         if bomb_effect:
-            self.vx = random.uniform(-8, 8)
-            self.vy = random.uniform(-10, -5)
-            self.size = random.randint(5, 12)
+            self.vx[i] = random.uniform(-8, 8)
+            self.vy[i] = random.uniform(-10, -5)
+            self.size[i] = random.randint(5, 12)
+            self.lifetime[i] = random.uniform(1.0, 2.0)
         else:
-            self.vx = random.uniform(-3, 3)
-            self.vy = random.uniform(-5, -2)
-            self.size = random.randint(3, 8)
-        self.color = color or random.choice([
-            (255, 215, 0),  # Gold
-            (255, 255, 255), # White
-            (255, 100, 100), # Red
-            (100, 200, 255)  # Blue
-        ])
-        self.lifetime = random.uniform(0.8, 1.5)
-        if bomb_effect:
-            self.lifetime = random.uniform(1.0, 2.0)
-        self.age = 0
-        self.gravity = 0.3
-        self.bomb_effect = bomb_effect
+            self.vx[i] = random.uniform(-3, 3)
+            self.vy[i] = random.uniform(-5, -2)
+            self.size[i] = random.randint(3, 8)
+            self.lifetime[i] = random.uniform(0.8, 1.5)
+        self.age[i] = 0
+        self.color[i] = self._get_color_index(color) if color else random.choice(CELEBRATION_COLORS)
+        self.bomb[i] = 1 if bomb_effect else 0
+        self.count = i + 1
+        return True
+    
+    def _get_color_index(self, color):
+        index = self._color_index.get(color)
+        if index is None:
+            PARTICLE_COLORS.append(color)
+            index = self._color_index[color] = len(PARTICLE_COLORS) - 1
+        return index
     
     def update(self, dt):
-        self.age += dt
-        self.x += self.vx
-        self.y += self.vy
-        self.vy += self.gravity
-        return self.age < self.lifetime
+        """Advance every live particle in one batch pass"""
+        x, y, vx, vy = self.x, self.y, self.vx, self.vy
+        age, lifetime = self.age, self.lifetime
+        i = 0
+        n = self.count
+        while i < n:
+            a = age[i] + dt
+            if a >= lifetime[i]:
+                # Swap the last live particle into this slot
+                n -= 1
+                self._move(n, i)
+                continue
+            age[i] = a
+            x[i] += vx[i]
+            y[i] += vy[i]
+            vy[i] += PARTICLE_GRAVITY
+            i += 1
+        self.count = n
+    
+    def _move(self, src, dst):
+        if src == dst:
+            return
+        for field in (self.x, self.y, self.vx, self.vy, self.age,
+                      self.lifetime, self.size, self.color, self.bomb):
+            field[dst] = field[src]
+    
+    def _get_sprite(self, color_index, size, bomb, alpha_step):
+        key = (color_index, size, bomb, alpha_step)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            color = PARTICLE_COLORS[color_index]
+            alpha = 255 * alpha_step // PARTICLE_ALPHA_STEPS
+            sprite = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (*color, alpha), (size, size), size)
+            if bomb:
+                # Outer glow for more dramatic bomb particles
+                pygame.draw.circle(sprite, (*color, alpha // 2), (size, size), size * 1.5)
+            self._sprites[key] = sprite
+        return sprite
     
     def draw(self, surface):
-        alpha = int(255 * (1 - self.age / self.lifetime))
-        if alpha <= 0:
-            return
-        
-        if self.bomb_effect:
-            # Bomb particles are more dramatic
-            temp_surface = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-            # Inner bright core
-            pygame.draw.circle(temp_surface, (*self.color, alpha), 
-                              (self.size, self.size), self.size)
-            # Outer glow
-            pygame.draw.circle(temp_surface, (*self.color, alpha // 2), 
-                              (self.size, self.size), self.size * 1.5)
-            surface.blit(temp_surface, (int(self.x - self.size), int(self.y - self.size)))
-        else:
-            # Regular particles
-            temp_surface = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(temp_surface, (*self.color, alpha), 
-                              (self.size, self.size), self.size)
-            surface.blit(temp_surface, (int(self.x - self.size), int(self.y - self.size)))
+        """Draw all live particles with a single blits() call"""
+        sequence = self._blit_sequence
+        sequence.clear()
+        get_sprite = self._get_sprite
+        x, y, age, lifetime = self.x, self.y, self.age, self.lifetime
+        size, color, bomb = self.size, self.color, self.bomb
+        for i in range(self.count):
+            alpha_step = int(PARTICLE_ALPHA_STEPS * (1 - age[i] / lifetime[i]))
+            if alpha_step <= 0:
+                continue
+            s = size[i]
+            sequence.append((get_sprite(color[i], s, bomb[i], alpha_step),
+                             (int(x[i] - s), int(y[i] - s))))
+        if sequence:
+            surface.blits(sequence, False)
 
 class PassNotification:
     def __init__(self, bot_name, x, y):
@@ -216,7 +299,7 @@ class PassNotification:
 game = Game()
 selected_indexes = []
 animations = []
-particles = []
+particles = ParticlePool()
 pass_notifications = []  # For bot pass notifications
 
 current_player = 0
@@ -598,6 +681,8 @@ def draw_game_status():
     # Turn indicator at bottom
     if not game_over:
         turn_text = f"Current Turn: {game.players[current_player].name}"
+        if pending_bot_move is not None:
+            turn_text += " (thinking...)"
         turn_color = (255, 255, 0) if current_player == 0 else (255, 200, 100)
         turn_surface = FONT.render(turn_text, True, turn_color)
         
@@ -667,12 +752,9 @@ def create_celebration_particles(x, y, count=20, is_bomb=False):
         color = None
         if is_bomb:
             # Bomb particles are red/orange
-            color = random.choice([
-                (255, 100, 100),  # Red
-                (255, 150, 50),   # Orange
-                (255, 200, 0)     # Yellow-orange
-            ])
-        particles.append(Particle(x, y, color, bomb_effect=is_bomb))
+            color = PARTICLE_COLORS[random.choice(BOMB_COLORS)]
+        if not particles.spawn(x, y, color, bomb_effect=is_bomb):
+            break
 
 def get_card_index_at_pos(pos, player):
     """Get card index at mouse position"""
@@ -702,15 +784,15 @@ def get_card_index_at_pos(pos, player):
 
 def restart_game():
     """Restart the game completely"""
-    global game, selected_indexes, animations, particles, pass_notifications
+    global game, selected_indexes, animations, pass_notifications
     global current_player, winner_of_current_round, is_new_round, last_play_time, game_over
-    global bot_thinking, last_bot_turn_time
+    global bot_thinking, last_bot_turn_time, pending_bot_move
     
     # Create new game
     game = Game()
     selected_indexes = []
     animations = []
-    particles = []
+    particles.clear()
     pass_notifications = []  # Clear notifications
     current_player = 0
     winner_of_current_round = None
@@ -718,6 +800,7 @@ def restart_game():
     game_over = False
     bot_thinking = False
     last_bot_turn_time = 0
+    pending_bot_move = None  # A decision still computing for the old game is discarded
     
     print("Game restarted!")
     add_log('system', "Game restarted!")
@@ -849,6 +932,11 @@ bot_turn_delay = 500  # Delay between bot turns in milliseconds
 last_bot_turn_time = 0
 bot_thinking = False
 
+# Bot decisions are computed on a worker thread so a slow move search never
+# blocks rendering or input. The result is applied to the game on this thread.
+bot_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bot")
+pending_bot_move = None  # (future, game, bot_index) while a bot is deciding
+
 while running:
     # Calculate delta time for smooth animations
     current_time = pygame.time.get_ticks()
@@ -866,9 +954,8 @@ while running:
         pygame.draw.line(screen, color, (0, y), (WIDTH, y))
     
     # Update and draw particles
-    particles = [p for p in particles if p.update(dt)]
-    for particle in particles:
-        particle.draw(screen)
+    particles.update(dt)
+    particles.draw(screen)
     
     # Update animations
     for anim in animations[:]:
@@ -921,6 +1008,14 @@ while running:
                             print(f"  {i+1}. {[str(c) for c in play]} ({play_type}{bomb_indicator})")
                 else:
                     print("Table is empty - you can play any valid combination!")
+                # Suggested play: select its cards so the Play button plays them
+                hint_cards = game.get_hint(game.players[0])
+                if hint_cards:
+                    print(f"💡 Suggested: {[str(c) for c in hint_cards]} ({get_play_type(hint_cards)})")
+                    selected_indexes[:] = [i for i, card in enumerate(game.players[0].hand)
+                                           if any(card is hint for hint in hint_cards)]
+                else:
+                    print("💡 Suggested: pass")
                 print("============\n")
             elif event.key == pygame.K_p:  # Print history
                 print_play_history()
@@ -994,7 +1089,7 @@ while running:
                             print(f"Selected card {idx}: {game.players[0].hand[idx]}")
     
     # -------------------- BOT TURN PROCESSING --------------------
-    if not game_over and current_player != 0 and not bot_thinking:
+    if not game_over and current_player != 0 and not bot_thinking and pending_bot_move is None:
         # Start bot thinking
         bot_thinking = True
         last_bot_turn_time = current_time
@@ -1023,8 +1118,22 @@ while running:
                 from core.rules import card_strength
                 print(f"  {card}: rank={card.rank}, strength={card_strength(card)}")
         
-        # Use game's bot_turn method
-        play = game.bot_turn(bot)
+        # Decide on the worker thread; the move is applied once it is ready
+        bot.sort_hand()
+        pending_bot_move = (bot_executor.submit(game.choose_bot_play, bot), game, current_player)
+    
+    bot_move_ready = pending_bot_move is not None and pending_bot_move[0].done()
+    if bot_move_ready:
+        future, decided_game, bot_index = pending_bot_move
+        pending_bot_move = None
+        
+        # Ignore decisions made for a game that has since been restarted
+        # (the frame still ends normally below)
+        bot_move_ready = decided_game is game and bot_index == current_player
+    
+    if bot_move_ready:
+        bot = game.players[current_player]
+        play = game.apply_bot_play(bot, future.result())
         
         if play:
             print(f"{bot.name} plays: {' '.join(map(str, play))}")
@@ -1093,5 +1202,6 @@ while running:
     pygame.display.flip()
     clock.tick(60)
 
+bot_executor.shutdown(wait=False, cancel_futures=True)
 pygame.quit()
 sys.exit()
\ No newline at end of file
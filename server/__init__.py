@@ -0,0 +1,8 @@
+# server/__init__.py
+# Serving infrastructure for the web app (game API, session storage, servers)
+
+from server.session_store import (MemorySessionStore, SQLiteSessionStore, SessionConflict,
+                                  SessionStore, create_session_store)
+
+__all__ = ['SessionStore', 'MemorySessionStore', 'SQLiteSessionStore', 'SessionConflict',
+           'create_session_store']
@@ -0,0 +1,1076 @@
+# server/api.py
+# The game API without a web framework
+# Every method takes the request's JSON body (data) or query parameters (args)
+# and returns (payload, HTTP status). web_app.py (Flask) and server/asgi.py
+# both serve these, so the two servers behave the same. RoomAPI (multiplayer
+# rooms, see server/rooms.py) and MatchAPI (server/matchmaking.py) are served
+# by server/asgi.py.
+
+import os
+import traceback
+
+from core.bitmask import cards_to_mask
+from core.decompose import min_plays
+from core.game import Game
+from core.rules import beats, get_play_type
+from core.strategy import STRATEGY_NAMES, SearchBudget
+from server.game_sessions import (BOT_AI, BOT_DECISION_DEADLINE, BOT_NODE_BUDGET,
+                                  WAIT_STATE_MAX_SECONDS, configure_bots, create_bot_strategy,
+                                  get_strategy_names, parse_bot_strategies)
+from server.serialization import card_str_to_card, serialize_game_state, validate_card_input
+from server.rooms import RoomError
+from server.session_store import SessionConflict
+
+class GameAPI:
+    """Handlers of the /api/ endpoints over a GameSession"""
+    def __init__(self, manager):
+        self.manager = manager
+
+    def start_game(self, data):
+        try:
+            data = data or {}
+            player_name = data.get('player_name', 'You')
+            
+            try:
+                bot_strategies = parse_bot_strategies(data.get('bot_strategies'))
+            except (TypeError, ValueError) as e:
+                return {
+                    'success': False,
+                    'error': str(e)
+                }, 400
+            
+            # Clean up old sessions
+            self.manager.cleanup_old_sessions()
+            
+            # Create a NEW FRESH GAME (page refresh or first time)
+            # is_fresh_game=True for Round 1 with 3♠ rule
+            session_id = self.manager.create_session(player_name, is_fresh_game=True,
+                                                     bot_strategies=bot_strategies)
+            game = self.manager.get_game(session_id)
+            
+            print(f"✅ FRESH GAME started for {player_name}")
+            print(f"   Session: {session_id[:8]}...")
+            print(f"   Round: {game.round_number}")
+            if game.round_number == 1:
+                print(f"   3♠ rule active: {game.players[game.first_player_index].name} has 3♠")
+            
+            return {
+                'success': True,
+                'session_id': session_id,
+                'game_id': session_id,
+                'state': serialize_game_state(game),
+                'message': f'Fresh game started! Round {game.round_number}. {game.players[game.first_player_index].name} starts first.' + 
+                          (' 3♠ rule applies.' if game.round_number == 1 else ' Round winner starts.')
+            }, 200
+            
+        except Exception as e:
+            print(f"❌ Error in start_game: {str(e)}")
+            traceback.print_exc()
+            return {
+                'success': False,
+                'error': str(e)
+            }, 500
+
+
+    def get_state(self, args, cookie_session_id=None):
+        try:
+            session_id = args.get('session_id')
+            if not session_id:
+                # Try to get from session
+                session_id = cookie_session_id
+            
+            if not session_id:
+                return {
+                    'success': False,
+                    'error': 'No session ID provided. Start a new game first.'
+                }, 200
+            
+            # Get game from session manager
+            game = self.manager.get_game(session_id)
+            if not game:
+                return {
+                    'success': False,
+                    'error': 'Game session not found or expired. Start a new game.'
+                }, 200
+            
+            # Return game state
+            return {
+                'success': True,
+                'state_version': self.manager.get_version(session_id),
+                'state': serialize_game_state(game)
+            }, 200
+            
+        except Exception as e:
+            print(f"❌ Error in get_state: {str(e)}")
+            traceback.print_exc()
+            return {
+                'success': False,
+                'error': str(e)
+            }, 500
+
+
+    def wait_state(self, args, timeout=None):
+        """
+        Long poll: answer once the session's state_version is above since
+        (or after timeout seconds, capped at WAIT_STATE_MAX_SECONDS). The
+        state is only included when it changed.
+        """
+        try:
+            session_id = args.get('session_id')
+            if not session_id:
+                return {
+                    'success': False,
+                    'error': 'No session ID provided. Start a new game first.'
+                }, 200
+            
+            try:
+                since = int(args.get('since', -1))
+                if timeout is None:
+                    timeout = float(args.get('timeout', WAIT_STATE_MAX_SECONDS))
+            except (TypeError, ValueError):
+                return {
+                    'success': False,
+                    'error': 'since must be an integer and timeout a number'
+                }, 400
+            timeout = max(0.0, min(timeout, WAIT_STATE_MAX_SECONDS))
+            
+            game_data = self.manager.wait_for_change(session_id, since, timeout)
+            if game_data is None:
+                return {
+                    'success': False,
+                    'error': 'Game session not found or expired. Start a new game.'
+                }, 200
+            
+            version = game_data['version']
+            payload = {
+                'success': True,
+                'changed': version > since,
+                'state_version': version
+            }
+            if payload['changed']:
+                payload['state'] = serialize_game_state(game_data['game'])
+            return payload, 200
+            
+        except Exception as e:
+            print(f"❌ Error in wait_state: {str(e)}")
+            traceback.print_exc()
+            return {
+                'success': False,
+                'error': str(e)
+            }, 500
+
+
+    def play_cards(self, data):
+        try:
+            data = data or {}
+            card_strs = data.get('cards', [])
+            session_id = data.get('session_id')
+            
+            if not session_id:
+                return {
+                    'success': False,
+                    'error': 'No session ID provided'
+                }, 200
+            
+            # Validate input
+            if not card_strs:
+                return {
+                    'success': False,
+                    'error': 'No cards selected'
+                }, 200
+            
+            if not validate_card_input(card_strs):
+                return {
+                    'success': False,
+                    'error': 'Invalid card format'
+                }, 200
+            
+            # Get game
+            game = self.manager.get_game(session_id)
+            if not game:
+                return {
+                    'success': False,
+                    'error': 'Game session not found'
+                }, 200
+            
+            print(f"🎮 Player wants to play cards: {card_strs}")
+            print(f"   Round: {game.round_number}")
+            print(f"   Current player: {game.players[game.current_player_index].name}")
+            print(f"   First player: {game.players[game.first_player_index].name}")
+            print(f"   Is first play of game: {game.is_first_play_of_game()}")
+            print(f"   Is first play of round: {game.is_first_play_of_round()}")
+            
+            # Check if game is over
+            if game.is_game_over():
+                return {
+                    'success': False,
+                    'error': 'Game is already over'
+                }, 200
+            
+            # Check if it's player's turn
+            if game.current_player_index != 0:
+                return {
+                    'success': False,
+                    'error': f"Not your turn. It's {game.players[game.current_player_index].name}'s turn"
+                }, 200
+            
+            # Convert card strings to Card objects
+            play_cards = []
+            for card_str in card_strs:
+                card = card_str_to_card(card_str)
+                if card:
+                    play_cards.append(card)
+            
+            if not play_cards:
+                return {
+                    'success': False,
+                    'error': 'No valid cards selected'
+                }, 200
+            
+            # Check if player has these cards
+            human_player = game.players[0]
+            for card in play_cards:
+                if card not in human_player.hand:
+                    return {
+                        'success': False,
+                        'error': f"Card {card} not in your hand"
+                    }, 200
+            
+            print(f"✅ Valid cards found: {[str(c) for c in play_cards]}")
+            
+            # Use the play_cards method from Game class
+            success, message = game.play_cards(0, play_cards)
+            
+            if success:
+                print(f"✅ Play successful: {message}")
+                
+                # Update game in session manager
+                self.manager.update_session(session_id, game)
+                
+                # Check if player won
+                if human_player.has_won():
+                    message = f"🎉 {human_player.name} wins the game! 🎉"
+                    print(message)
+                
+                return {
+                    'success': True,
+                    'message': message,
+                    'state': serialize_game_state(game)
+                }, 200
+            else:
+                print(f"❌ Play failed: {message}")
+                return {
+                    'success': False,
+                    'error': message,
+                    'state': serialize_game_state(game)
+                }, 200
+            
+        except SessionConflict as e:
+            print(f"⚠️ {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'conflict': True
+            }, 409
+            
+        except Exception as e:
+            print(f"❌ Error in play_cards: {str(e)}")
+            traceback.print_exc()
+            return {
+                'success': False,
+                'error': str(e)
+            }, 500
+
+
+    def pass_turn(self, data):
+        try:
+            data = data or {}
+            session_id = data.get('session_id')
+            
+            if not session_id:
+                return {
+                    'success': False,
+                    'error': 'No session ID provided'
+                }, 200
+            
+            # Get game
+            game = self.manager.get_game(session_id)
+            if not game:
+                return {
+                    'success': False,
+                    'error': 'Game session not found'
+                }, 200
+            
+            print(f"🎮 Player wants to pass")
+            print(f"   Round: {game.round_number}")
+            print(f"   Current player: {game.players[game.current_player_index].name}")
+            
+            # Check if game is over
+            if game.is_game_over():
+                return {
+                    'success': False,
+                    'error': 'Game is already over'
+                }, 200
+            
+            # Check if it's player's turn
+            if game.current_player_index != 0:
+                return {
+                    'success': False,
+                    'error': f"Not your turn. It's {game.players[game.current_player_index].name}'s turn"
+                }, 200
+            
+            # Use the pass_turn method from Game class
+            success, message = game.pass_turn(0)
+            
+            if success:
+                print(f"✅ Pass successful: {message}")
+                
+                # Update game in session manager
+                self.manager.update_session(session_id, game)
+                
+                # Check if round ended
+                if game.pass_count == 0 and game.round_winner:
+                    print(f"🔄 Round ended. Winner: {game.round_winner.name}")
+                
+                return {
+                    'success': True,
+                    'message': message,
+                    'state': serialize_game_state(game)
+                }, 200
+            else:
+                print(f"❌ Pass failed: {message}")
+                return {
+                    'success': False,
+                    'error': message,
+                    'state': serialize_game_state(game)
+                }, 200
+            
+        except SessionConflict as e:
+            print(f"⚠️ {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'conflict': True
+            }, 409
+            
+        except Exception as e:
+            print(f"❌ Error in pass_turn: {str(e)}")
+            traceback.print_exc()
+            return {
+                'success': False,
+                'error': str(e)
+            }, 500
+
+
+    def undo(self, data):
+        """Take back the human player's last move and the bot moves made after it"""
+        try:
+            data = data or {}
+            session_id = data.get('session_id')
+            
+            if not session_id:
+                return {
+                    'success': False,
+                    'error': 'No session ID provided'
+                }, 200
+            
+            game = self.manager.get_game(session_id)
+            if not game:
+                return {
+                    'success': False,
+                    'error': 'Game session not found'
+                }, 200
+            
+            success, message, undone = game.undo_to_player(0)
+            if not success:
+                return {
+                    'success': False,
+                    'error': message,
+                    'state': serialize_game_state(game)
+                }, 200
+            
+            print(f"↩️ {message} ({undone} move{'s' if undone != 1 else ''} undone)")
+            self.manager.update_session(session_id, game)
+            
+            return {
+                'success': True,
+                'message': message,
+                'undone_moves': undone,
+                'state': serialize_game_state(game)
+            }, 200
+            
+        except SessionConflict as e:
+            print(f"⚠️ {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'conflict': True
+            }, 409
+            
+        except Exception as e:
+            print(f"❌ Error in undo: {str(e)}")
+            traceback.print_exc()
+            return {
+                'success': False,
+                'error': str(e)
+            }, 500
+
+
+    def bot_move(self, data):
+        try:
+            data = data or {}
+            session_id = data.get('session_id')
+            
+            if not session_id:
+                return {
+                    'success': False,
+                    'error': 'No session ID provided'
+                }, 200
+            
+            # Get game
+            game = self.manager.get_game(session_id)
+            if not game:
+                return {
+                    'success': False,
+                    'error': 'Game session not found'
+                }, 200
+            
+            # Check if game is over
+            if game.is_game_over():
+                return {
+                    'success': False,
+                    'error': 'Game is already over',
+                    'state': serialize_game_state(game)
+                }, 200
+            
+            # Check if it's a bot's turn (indices 1, 2, 3 are bots)
+            if game.current_player_index == 0:
+                return {
+                    'success': False,
+                    'error': "Not bot's turn. It's player's turn.",
+                    'state': serialize_game_state(game)
+                }, 200
+            
+            bot = game.players[game.current_player_index]
+            
+            print(f"🤖 Processing bot move for {bot.name}")
+            print(f"   Round: {game.round_number}")
+            print(f"   Current player index: {game.current_player_index}")
+            print(f"   Is first play of game: {game.is_first_play_of_game()}")
+            print(f"   Is first play of round: {game.is_first_play_of_round()}")
+            
+            # Check if bot has already won
+            if bot.has_won():
+                print(f"🤖 {bot.name} has already won, skipping")
+                # Advance turn anyway
+                game._advance_turn()
+                self.manager.update_session(session_id, game)
+                return {
+                    'success': True,
+                    'message': f"{bot.name} has already won",
+                    'is_pass': False,
+                    'state': serialize_game_state(game)
+                }, 200
+            
+            # Let bot play using the updated bot_turn method, within the decision budget
+            budget = SearchBudget(time_limit=BOT_DECISION_DEADLINE, node_limit=BOT_NODE_BUDGET)
+            bot_play = game.bot_turn(bot, budget=budget)
+            
+            if bot_play:
+                message = f"{bot.name} played {' '.join(str(c) for c in bot_play)}"
+                is_pass = False
+                
+                # Special message for 3♠ play (only in round 1)
+                if game.round_number == 1 and game.is_first_play_of_game() and any(card.rank == 3 and card.suit == "♠" for card in bot_play):
+                    message = f"{bot.name} starts the game with {' '.join(str(c) for c in bot_play)} (includes 3♠)"
+            else:
+                message = f"{bot.name} passed"
+                is_pass = True
+            
+            print(f"🤖 Bot move result: {message}")
+            
+            # Update game in session manager
+            self.manager.update_session(session_id, game)
+            
+            # Check if game is over after bot move
+            if game.is_game_over():
+                winner = game.get_winner()
+                if winner:
+                    message = f"{message}. 🎉 {winner.name} wins the game! 🎉"
+            
+            decision = game.last_decision._asdict() if game.last_decision else None
+            
+            return {
+                'success': True,
+                'message': message,
+                'is_pass': is_pass,
+                'decision': decision,
+                'state': serialize_game_state(game)
+            }, 200
+            
+        except SessionConflict as e:
+            print(f"⚠️ {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'conflict': True
+            }, 409
+            
+        except Exception as e:
+            print(f"❌ Error in bot_move: {str(e)}")
+            traceback.print_exc()
+            return {
+                'success': False,
+                'error': str(e)
+            }, 500
+
+
+    def restart_game(self, data, cookie_session_id=None):
+        try:
+            data = data or {}
+            player_name = data.get('player_name', 'You')
+            
+            # Get session ID from request or session
+            session_id = data.get('session_id') or cookie_session_id or os.urandom(16).hex()
+            
+            previous_winner_index = None
+            previous_winner_name = None
+            previous_strategies = None
+            
+            if session_id and session_id in self.manager:
+                # Get previous game to find winner
+                previous_game = self.manager.get_game(session_id)
+                if previous_game:
+                    previous_strategies = get_strategy_names(previous_game)
+                    winner_info = previous_game.get_game_winner_info()
+                    if winner_info:
+                        previous_winner_index = winner_info.get('index')
+                        previous_winner_name = winner_info.get('name')
+            
+            # Create new game with winner tracking
+            game = Game(is_fresh_game=False, 
+                       previous_winner_index=previous_winner_index,
+                       previous_winner_name=previous_winner_name)
+            configure_bots(game, previous_strategies)
+            game.players[0].name = player_name
+            
+            # Update session
+            self.manager.replace_game(session_id, game, player_name)
+            
+            print(f"🔄 Game restarted for {player_name}")
+            if previous_winner_name:
+                print(f"   Previous winner: {previous_winner_name} starts")
+            
+            return {
+                'success': True,
+                'message': 'Game restarted successfully',
+                'session_id': session_id,
+                'state': serialize_game_state(game)
+            }, 200
+            
+        except SessionConflict as e:
+            print(f"⚠️ {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'conflict': True
+            }, 409
+            
+        except Exception as e:
+            print(f"❌ Error in restart_game: {str(e)}")
+            traceback.print_exc()
+            return {
+                'success': False,
+                'error': str(e)
+            }, 500
+
+
+    def get_valid_plays(self, args):
+        try:
+            session_id = args.get('session_id')
+            if not session_id:
+                return {
+                    'success': False,
+                    'error': 'No session ID provided'
+                }, 200
+            
+            game = self.manager.get_game(session_id)
+            if not game:
+                return {
+                    'success': False,
+                    'error': 'Game session not found'
+                }, 200
+            
+            human_player = game.players[0]
+            
+            # Check if it's player's turn
+            if game.current_player_index != 0:
+                return {
+                    'success': False,
+                    'error': 'Not your turn',
+                    'valid_plays': []
+                }, 200
+            
+            # Get valid plays using game logic
+            valid_plays = []
+            if hasattr(game, 'get_valid_plays'):
+                valid_plays = game.get_valid_plays(human_player)
+            else:
+                # Simple fallback
+                if game.last_play:
+                    for card in human_player.hand:
+                        if beats([card], game.last_play):
+                            valid_plays.append([card])
+                else:
+                    # Any single card is valid
+                    for card in human_player.hand:
+                        valid_plays.append([card])
+            
+            # Filter for first play requirements
+            if game.is_first_play_of_round():
+                # For first play of game (round 1), must include 3♠
+                if game.is_first_play_of_game():
+                    filtered_plays = []
+                    for play in valid_plays:
+                        if any(card.rank == 3 and card.suit == "♠" for card in play):
+                            filtered_plays.append(play)
+                    valid_plays = filtered_plays
+                # For first play of round (round 2+), any valid play is OK
+            
+            plays = []
+            for play_cards in valid_plays[:15]:  # Limit to 15 suggestions
+                play_type = get_play_type(play_cards) if play_cards else 'single'
+                
+                # Check if this play would be valid for current situation
+                is_valid = True
+                error_msg = ""
+                
+                if game.is_first_play_of_round():
+                    # Use the game's validation
+                    is_valid, error_msg = game.validate_first_play(play_cards, 0)
+                elif game.last_play:
+                    # Must beat last play
+                    is_valid = beats(play_cards, game.last_play)
+                    if not is_valid:
+                        error_msg = "Doesn't beat last play"
+                
+                plays.append({
+                    'cards': [str(c) for c in play_cards],
+                    'type': play_type,
+                    'count': len(play_cards),
+                    'is_valid': is_valid,
+                    'error': error_msg if not is_valid else ""
+                })
+            
+            # Find who has 3♠ for round 1
+            three_spades_player = None
+            if game.round_number == 1:
+                for player in game.players:
+                    for card in player.hand:
+                        if card.rank == 3 and card.suit == "♠":
+                            three_spades_player = player.name
+                            break
+                    if three_spades_player:
+                        break
+            
+            return {
+                'success': True,
+                'valid_plays': plays,
+                'is_first_play_of_game': game.is_first_play_of_game(),
+                'is_first_play_of_round': game.is_first_play_of_round(),
+                'requires_three_spades': (game.round_number == 1 and len(game.last_play) == 0),
+                'three_spades_player': three_spades_player
+            }, 200
+            
+        except Exception as e:
+            print(f"❌ Error in get_valid_plays: {str(e)}")
+            traceback.print_exc()
+            return {
+                'success': False,
+                'error': str(e)
+            }, 500
+
+
+    def get_hint(self, args):
+        """Suggest the best play for the human player (fewest-plays decomposition)"""
+        try:
+            session_id = args.get('session_id')
+            if not session_id:
+                return {
+                    'success': False,
+                    'error': 'No session ID provided'
+                }, 200
+            
+            game = self.manager.get_game(session_id)
+            if not game:
+                return {
+                    'success': False,
+                    'error': 'Game session not found'
+                }, 200
+            
+            if game.current_player_index != 0:
+                return {
+                    'success': False,
+                    'error': 'Not your turn'
+                }, 200
+            
+            human_player = game.players[0]
+            hint_cards = game.get_hint(human_player)
+            
+            return {
+                'success': True,
+                'is_pass': hint_cards is None,
+                'hint': {
+                    'cards': [str(c) for c in hint_cards],
+                    'type': get_play_type(hint_cards),
+                    'count': len(hint_cards)
+                } if hint_cards else None,
+                'min_plays': min_plays(cards_to_mask(human_player.hand))
+            }, 200
+            
+        except Exception as e:
+            print(f"❌ Error in get_hint: {str(e)}")
+            traceback.print_exc()
+            return {
+                'success': False,
+                'error': str(e)
+            }, 500
+
+
+    def get_game_info(self, args):
+        """Get detailed game information"""
+        try:
+            session_id = args.get('session_id')
+            if not session_id:
+                return {
+                    'success': False,
+                    'error': 'No session ID provided'
+                }, 200
+            
+            game = self.manager.get_game(session_id)
+            if not game:
+                return {
+                    'success': False,
+                    'error': 'Game session not found'
+                }, 200
+            
+            # Get detailed info
+            info = {
+                'round': game.round_number,
+                'current_player': game.players[game.current_player_index].name if game.current_player_index is not None else None,
+                'first_player': game.players[game.first_player_index].name if game.first_player_index is not None else None,
+                'is_first_play_of_game': game.is_first_play_of_game(),
+                'is_first_play_of_round': game.is_first_play_of_round(),
+                'requires_three_spades': (game.round_number == 1 and len(game.last_play) == 0),
+                'three_spades_player': None,
+                'players': []
+            }
+            
+            # Find who has 3♠ for round 1
+            if game.round_number == 1:
+                for i, player in enumerate(game.players):
+                    for card in player.hand:
+                        if card.rank == 3 and card.suit == "♠":
+                            info['three_spades_player'] = player.name
+                            break
+                    if info['three_spades_player']:
+                        break
+            
+            for i, player in enumerate(game.players):
+                player_info = {
+                    'name': player.name,
+                    'index': i,
+                    'cards_remaining': len(player.hand),
+                    'has_won': player.has_won(),
+                    'is_current': (i == game.current_player_index),
+                    'is_first': (i == game.first_player_index)
+                }
+                info['players'].append(player_info)
+            
+            return {
+                'success': True,
+                'info': info
+            }, 200
+            
+        except Exception as e:
+            print(f"❌ Error in get_game_info: {str(e)}")
+            traceback.print_exc()
+            return {
+                'success': False,
+                'error': str(e)
+            }, 500
+
+
+    def get_stats(self, args):
+        """Per-player counters (plays, passes, bombs, cards shed, rounds won)"""
+        try:
+            session_id = args.get('session_id')
+            if not session_id:
+                return {
+                    'success': False,
+                    'error': 'No session ID provided'
+                }, 200
+            
+            game = self.manager.get_game(session_id)
+            if not game:
+                return {
+                    'success': False,
+                    'error': 'Game session not found'
+                }, 200
+            
+            return {
+                'success': True,
+                'round': game.round_number,
+                'total_plays': game.total_plays,
+                'stats': game.get_player_stats()
+            }, 200
+            
+        except Exception as e:
+            print(f"❌ Error in get_stats: {str(e)}")
+            traceback.print_exc()
+            return {
+                'success': False,
+                'error': str(e)
+            }, 500
+
+
+    def get_strategies(self, args):
+        """List available bot strategies and the ones used by each bot seat"""
+        try:
+            session_id = args.get('session_id')
+            seats = None
+            if session_id:
+                game = self.manager.get_game(session_id)
+                if not game:
+                    return {
+                        'success': False,
+                        'error': 'Game session not found'
+                    }, 200
+                seats = get_strategy_names(game)
+            
+            return {
+                'success': True,
+                'available': list(STRATEGY_NAMES),
+                'default': BOT_AI,
+                'seats': seats
+            }, 200
+            
+        except Exception as e:
+            print(f"❌ Error in get_strategies: {str(e)}")
+            traceback.print_exc()
+            return {
+                'success': False,
+                'error': str(e)
+            }, 500
+
+
+    def set_strategy(self, data):
+        """Change the strategy of one bot seat in a running game"""
+        try:
+            data = data or {}
+            session_id = data.get('session_id')
+            
+            if not session_id:
+                return {
+                    'success': False,
+                    'error': 'No session ID provided'
+                }, 200
+            
+            game = self.manager.get_game(session_id)
+            if not game:
+                return {
+                    'success': False,
+                    'error': 'Game session not found'
+                }, 200
+            
+            try:
+                strategies = parse_bot_strategies({data.get('seat'): data.get('strategy')})
+            except (TypeError, ValueError) as e:
+                return {
+                    'success': False,
+                    'error': str(e)
+                }, 400
+            
+            for seat, name in strategies.items():
+                game.set_strategy(seat, create_bot_strategy(name))
+                print(f"🤖 {game.players[seat].name} now uses the {name} strategy")
+            self.manager.update_session(session_id, game)
+            
+            return {
+                'success': True,
+                'seats': get_strategy_names(game)
+            }, 200
+            
+        except SessionConflict as e:
+            print(f"⚠️ {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'conflict': True
+            }, 409
+            
+        except Exception as e:
+            print(f"❌ Error in set_strategy: {str(e)}")
+            traceback.print_exc()
+            return {
+                'success': False,
+                'error': str(e)
+            }, 500
+
+
+class RoomAPI:
+    """Handlers of the /api/rooms/ endpoints over a RoomManager"""
+    def __init__(self, rooms):
+        self.rooms = rooms
+
+    def _respond(self, name, action):
+        """Run action() and turn refusals and errors into payloads"""
+        try:
+            return action(), 200
+        except RoomError as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }, 200
+        except Exception as e:
+            print(f"❌ Error in {name}: {str(e)}")
+            traceback.print_exc()
+            return {
+                'success': False,
+                'error': str(e)
+            }, 500
+
+    def _room(self, data):
+        data = data or {}
+        return self.rooms.get(data.get('room_id')), data.get('token')
+
+    def create_room(self, data):
+        """Open a room with data['humans'] human seats; the caller takes the first"""
+        data = data or {}
+
+        def action():
+            room, seat, token = self.rooms.create_room(data.get('player_name', 'Player 1'),
+                                                       data.get('humans', 1),
+                                                       data.get('bot_strategies'))
+            return dict(room.view(token), success=True, token=token)
+        return self._respond('create_room', action)
+
+    def join_room(self, data):
+        data = data or {}
+
+        def action():
+            room, seat, token = self.rooms.join_room(data.get('room_id'), data.get('player_name'))
+            return dict(room.view(token), success=True, token=token)
+        return self._respond('join_room', action)
+
+    def start_room(self, data):
+        def action():
+            room, token = self._room(data)
+            room.start(token)
+            return dict(room.view(token), success=True)
+        return self._respond('start_room', action)
+
+    def room_state(self, args):
+        def action():
+            room, token = self._room(args)
+            return dict(room.view(token), success=True)
+        return self._respond('room_state', action)
+
+    def room_play(self, data):
+        def action():
+            room, token = self._room(data)
+            message = room.play_cards(token, (data or {}).get('cards'))
+            return dict(room.view(token), success=True, message=message)
+        return self._respond('room_play', action)
+
+    def room_pass(self, data):
+        def action():
+            room, token = self._room(data)
+            message = room.pass_turn(token)
+            return dict(room.view(token), success=True, message=message)
+        return self._respond('room_pass', action)
+
+
+class MatchAPI:
+    """Handlers of the /api/match/ endpoints over a Matchmaker"""
+    def __init__(self, matchmaker):
+        self.matchmaker = matchmaker
+
+    def join(self, data):
+        """Queue a player for a table"""
+        try:
+            data = data or {}
+            ticket = self.matchmaker.enqueue(data.get('player_name'))
+            return {
+                'success': True,
+                'ticket': ticket.info()
+            }, 200
+
+        except Exception as e:
+            print(f"❌ Error in match join: {str(e)}")
+            traceback.print_exc()
+            return {
+                'success': False,
+                'error': str(e)
+            }, 500
+
+    def status(self, args):
+        """Where a ticket stands; a matched ticket also gets the room view of its seat"""
+        try:
+            ticket = self.matchmaker.get((args or {}).get('ticket_id'))
+            if ticket is None:
+                return {
+                    'success': False,
+                    'error': 'Unknown or expired ticket'
+                }, 200
+            payload = {
+                'success': True,
+                'ticket': ticket.info()
+            }
+            if ticket.status == ticket.MATCHED:
+                try:
+                    payload.update(self.matchmaker.rooms.get(ticket.room_id).view(ticket.token))
+                except RoomError as e:
+                    payload['error'] = str(e)
+            return payload, 200
+
+        except Exception as e:
+            print(f"❌ Error in match status: {str(e)}")
+            traceback.print_exc()
+            return {
+                'success': False,
+                'error': str(e)
+            }, 500
+
+    def cancel(self, data):
+        try:
+            ticket_id = (data or {}).get('ticket_id')
+            if not self.matchmaker.cancel(ticket_id):
+                return {
+                    'success': False,
+                    'error': 'Ticket is not waiting (already matched, cancelled or unknown)'
+                }, 200
+            return {
+                'success': True,
+                'ticket': self.matchmaker.get(ticket_id).info()
+            }, 200
+
+        except Exception as e:
+            print(f"❌ Error in match cancel: {str(e)}")
+            traceback.print_exc()
+            return {
+                'success': False,
+                'error': str(e)
+            }, 500
+
+    def metrics(self, args):
+        try:
+            return dict(self.matchmaker.metrics(), success=True), 200
+
+        except Exception as e:
+            print(f"❌ Error in match metrics: {str(e)}")
+            traceback.print_exc()
+            return {
+                'success': False,
+                'error': str(e)
+            }, 500
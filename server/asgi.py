@@ -0,0 +1,785 @@
+# server/asgi.py
+# asyncio variant of the web app: a plain ASGI app over the same GameAPI
+# Run with:  python -m server.asgi   (or: uvicorn server.asgi:app)
+#
+# Serves the page, /static/ and every /api/ endpoint of web_app.py, plus
+#   GET /api/events?session_id=...   server-sent events: the game state after
+#                                    every change to the session
+#   /api/match/...                   matchmaking queue (MatchAPI, server/matchmaking.py);
+#                                    status?ticket_id=...&wait=N waits for the match
+#   GET /api/spectate?session_id=... or ?room_id=...
+#                                    read-only event stream for spectators: the
+#                                    public state (no hands), encoded once per
+#                                    change for all of them
+#   GET /api/wait_state              long poll (see GameAPI.wait_state), waiting
+#                                    on the session's events instead of a thread
+#   WebSocket /ws?session_id=...     game channel: the client sends actions,
+#                                    the server answers each one and pushes the
+#                                    changed parts of the state
+#   /api/rooms/...                   multiplayer rooms (RoomAPI, server/rooms.py)
+#   WebSocket /ws/room?room_id=...&token=...
+#                                    a seat's room channel: every move at the
+#                                    table and the seat's view after it
+# An idle stream or socket is one coroutine and a one-slot queue, so a single
+# process can keep tens of thousands of them open. Game calls run in worker
+# threads so a slow bot move never blocks the event loop; the calls of one
+# session run one at a time (REST and WebSocket alike). Event subscribers
+# live in this process, so run one process (WEB_CONCURRENCY is not used here).
+#
+#   HOST, PORT              where to listen (default 0.0.0.0:5000)
+#   WEB_BACKLOG             listen queue of the socket (default 2048)
+#   WEB_CHANNEL_TIMEOUT     seconds an idle keep-alive connection is kept open (default 60)
+#   SSE_PING_SECONDS        keepalive comment interval on event streams (default 15)
+
+import asyncio
+import functools
+import json
+import mimetypes
+import os
+import traceback
+from urllib.parse import parse_qsl
+
+from server.api import GameAPI, MatchAPI, RoomAPI
+from server.game_sessions import WAIT_STATE_MAX_SECONDS, GameSession
+from server.matchmaking import Matchmaker, Ticket
+from server.rooms import RoomManager
+from server.serialization import StateViews
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAX_BODY = 64 * 1024  # Larger request bodies are refused
+SSE_PING_SECONDS = float(os.environ.get('SSE_PING_SECONDS', '15'))
+
+# Endpoint path -> (method, GameAPI method name, takes the JSON body)
+ROUTES = {
+    '/api/start_game': ('POST', 'start_game', True),
+    '/api/get_state': ('GET', 'get_state', False),
+    '/api/play_cards': ('POST', 'play_cards', True),
+    '/api/pass_turn': ('POST', 'pass_turn', True),
+    '/api/undo': ('POST', 'undo', True),
+    '/api/bot_move': ('POST', 'bot_move', True),
+    '/api/restart_game': ('POST', 'restart_game', True),
+    '/api/get_valid_plays': ('GET', 'get_valid_plays', False),
+    '/api/get_hint': ('GET', 'get_hint', False),
+    '/api/get_game_info': ('GET', 'get_game_info', False),
+    '/api/get_stats': ('GET', 'get_stats', False),
+    '/api/get_strategies': ('GET', 'get_strategies', False),
+    '/api/set_strategy': ('POST', 'set_strategy', True),
+}
+
+# Room endpoint path -> (method, RoomAPI method name, takes the JSON body)
+ROOM_ROUTES = {
+    '/api/rooms/create': ('POST', 'create_room', True),
+    '/api/rooms/join': ('POST', 'join_room', True),
+    '/api/rooms/start': ('POST', 'start_room', True),
+    '/api/rooms/state': ('GET', 'room_state', False),
+    '/api/rooms/play': ('POST', 'room_play', True),
+    '/api/rooms/pass': ('POST', 'room_pass', True),
+}
+
+# Matchmaking endpoint path -> (method, MatchAPI method name, takes the JSON body)
+MATCH_ROUTES = {
+    '/api/match/join': ('POST', 'join', True),
+    '/api/match/cancel': ('POST', 'cancel', True),
+    '/api/match/metrics': ('GET', 'metrics', False),
+}
+
+# Room channel actions -> RoomAPI method (the socket's room and token are added to each)
+ROOM_ACTIONS = {'play_cards': 'room_play', 'pass_turn': 'room_pass', 'start': 'start_room',
+                'get_state': 'room_state'}
+ROOM_QUEUE_SIZE = 32  # Room events waiting for a slow connection before the oldest is dropped
+
+# Calls that can change a session's game (event subscribers are notified after them)
+MUTATING = {'play_cards', 'pass_turn', 'undo', 'bot_move', 'restart_game', 'set_strategy'}
+
+# Actions accepted on the WebSocket channel (the socket's session is added to each)
+CHANNEL_ACTIONS = {name for _, name, _ in ROUTES.values()} - {'start_game'}
+
+JSON_HEADERS = [(b'content-type', b'application/json'),
+                (b'access-control-allow-origin', b'*')]
+SSE_HEADERS = [(b'content-type', b'text/event-stream'),
+               (b'cache-control', b'no-cache'),
+               (b'x-accel-buffering', b'no'),   # Keep proxies from buffering the stream
+               (b'access-control-allow-origin', b'*')]
+CORS_PREFLIGHT_HEADERS = [(b'access-control-allow-origin', b'*'),
+                          (b'access-control-allow-methods', b'GET, POST, OPTIONS'),
+                          (b'access-control-allow-headers', b'content-type'),
+                          (b'content-length', b'0')]
+
+class StateEvent:
+    """
+    A session's new state, shared by every subscriber
+    state is the player's view; sse and public_sse (for spectators, no hand)
+    are encoded at most once, public_sse from the already encoded public part.
+    """
+    __slots__ = ('state', 'public_json', '_sse', '_public_sse')
+
+    def __init__(self, views):
+        self.state = views.state(0)
+        self.public_json = views.public_json
+        self._sse = None
+        self._public_sse = None
+
+    @property
+    def sse(self):
+        if self._sse is None:
+            self._sse = sse_event('state', self.state)
+        return self._sse
+
+    @property
+    def public_sse(self):
+        if self._public_sse is None:
+            self._public_sse = f"event: state\ndata: {self.public_json}\n\n".encode()
+        return self._public_sse
+
+class EventHub:
+    """
+    Event stream and game channel subscribers per session
+    Each subscriber has a one-slot queue holding only the newest event, so a
+    slow client skips states instead of piling them up. publish is called from
+    worker threads and hands the event to the loop.
+    """
+    def __init__(self):
+        self.subscribers = {}   # session_id -> set of asyncio.Queue
+        self.loop = None        # Set when the app starts
+
+    def __len__(self):
+        return sum(len(queues) for queues in self.subscribers.values())
+
+    def has_subscribers(self, session_id):
+        return session_id in self.subscribers
+
+    def subscribe(self, session_id):
+        queue = asyncio.Queue(maxsize=1)
+        self.subscribers.setdefault(session_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, session_id, queue):
+        queues = self.subscribers.get(session_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self.subscribers[session_id]
+
+    def _deliver(self, session_id, event):
+        for queue in self.subscribers.get(session_id, ()):
+            if queue.full():
+                queue.get_nowait()  # Drop the state the client has not read yet
+            queue.put_nowait(event)
+
+    def publish(self, session_id, event):
+        """Send a StateEvent to every subscriber of a session (thread-safe)"""
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._deliver, session_id, event)
+
+    def close(self):
+        """End every stream (on shutdown)"""
+        for session_id in list(self.subscribers):
+            self._deliver(session_id, None)
+
+SPECTATOR = None  # Seat of a room spectator's connection
+
+class RoomHub:
+    """
+    Room channel and spectator connections of this process, per room
+    The hub is the room's only listener: a room change is handed to the loop
+    once and its already encoded messages go to every connection at the table.
+    Spectators all get the same bytes, framed once per change.
+    """
+    def __init__(self):
+        self.connections = {}   # room_id -> {queue: seat, or SPECTATOR}
+        self.loop = None
+
+    def subscribe(self, room, seat):
+        queue = asyncio.Queue(maxsize=ROOM_QUEUE_SIZE)
+        connections = self.connections.get(room.room_id)
+        if connections is None:
+            connections = self.connections[room.room_id] = {}
+            room.subscribe(self.publish)
+        connections[queue] = seat
+        return queue
+
+    def unsubscribe(self, room, queue):
+        connections = self.connections.get(room.room_id)
+        if connections is not None:
+            connections.pop(queue, None)
+            if not connections:
+                del self.connections[room.room_id]
+                room.unsubscribe(self.publish)
+
+    def _deliver(self, room_id, event):
+        connections = self.connections.get(room_id, {})
+        spectator_sse = None
+        if event is not None and SPECTATOR in connections.values():
+            spectator_sse = f"event: room\ndata: {event.spectator_message}\n\n".encode()
+        for queue, seat in connections.items():
+            if event is None:
+                message = None
+            elif seat is SPECTATOR:
+                message = spectator_sse
+            else:
+                message = event.messages.get(seat)
+                if message is None:
+                    continue
+            if queue.full():
+                queue.get_nowait()  # Drop the oldest move the client has not read
+            queue.put_nowait(message)
+
+    def publish(self, event):
+        """Room listener (called from worker threads)"""
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._deliver, event.room_id, event)
+
+    def close(self):
+        for room_id in list(self.connections):
+            self._deliver(room_id, None)
+
+def encode_json(payload):
+    return json.dumps(payload, separators=(',', ':'))
+
+def sse_event(name, payload):
+    return f"event: {name}\ndata: {encode_json(payload)}\n\n".encode()
+
+def state_changes(previous, state):
+    """Top-level state fields that differ from the previous state sent"""
+    return {key: value for key, value in state.items() if previous.get(key) != value}
+
+def load_static_files():
+    """The page and the static files, read once"""
+    files = {}
+    with open(os.path.join(ROOT, 'templates', 'index.html'), 'rb') as f:
+        files['/'] = (f.read(), b'text/html; charset=utf-8')
+    static_dir = os.path.join(ROOT, 'static')
+    for name in os.listdir(static_dir):
+        path = os.path.join(static_dir, name)
+        if os.path.isfile(path):
+            content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+            if content_type.startswith('text/') or content_type.endswith('javascript'):
+                content_type += '; charset=utf-8'
+            with open(path, 'rb') as f:
+                files['/static/' + name] = (f.read(), content_type.encode())
+    return files
+
+class GameASGIApp:
+    """ASGI application serving the game API, the page, event streams and game channels"""
+    def __init__(self, manager=None):
+        self.manager = manager or GameSession()
+        self.api = GameAPI(self.manager)
+        self.events = EventHub()
+        self.session_locks = {}  # session_id -> [asyncio.Lock, calls holding or waiting for it]
+        self.rooms = RoomManager()
+        self.room_api = RoomAPI(self.rooms)
+        self.room_hub = RoomHub()
+        self.matchmaker = Matchmaker(self.rooms, on_match=self.ticket_done)
+        self.match_api = MatchAPI(self.matchmaker)
+        self.match_waiters = {}  # ticket_id -> set of futures of waiting status requests
+        self.files = load_static_files()
+
+    def bind_loop(self):
+        if self.events.loop is None:
+            self.events.loop = self.room_hub.loop = asyncio.get_running_loop()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http':
+            await self.handle_http(scope, receive, send)
+        elif scope['type'] == 'websocket':
+            await self.handle_websocket(scope, receive, send)
+        elif scope['type'] == 'lifespan':
+            await self.handle_lifespan(receive, send)
+
+    async def handle_lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self.bind_loop()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.events.close()
+                self.room_hub.close()
+                self.matchmaker.stop()
+                await asyncio.to_thread(self.manager.store.close)  # Write pending sessions
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def handle_http(self, scope, receive, send):
+        self.bind_loop()  # Servers without lifespan events
+        path = scope['path']
+        method = scope['method']
+        try:
+            if method == 'OPTIONS':
+                await send({'type': 'http.response.start', 'status': 204,
+                            'headers': CORS_PREFLIGHT_HEADERS})
+                await send({'type': 'http.response.body', 'body': b''})
+            elif path == '/api/events' and method == 'GET':
+                await self.stream_events(scope, receive, send)
+            elif path == '/api/match/status' and method == 'GET':
+                await self.match_status(scope, send)
+            elif path in MATCH_ROUTES:
+                method, name, takes_body = MATCH_ROUTES[path]
+                await self.call_api(scope, receive, send, method, takes_body,
+                                    getattr(self.match_api, name))
+            elif path == '/api/spectate' and method == 'GET':
+                await self.spectate(scope, receive, send)
+            elif path == '/api/wait_state' and method == 'GET':
+                await self.wait_state(scope, send)
+            elif path in ROUTES:
+                method, name, takes_body = ROUTES[path]
+                await self.call_api(scope, receive, send, method, takes_body,
+                                    functools.partial(self.call_game_api, name))
+            elif path in ROOM_ROUTES:
+                method, name, takes_body = ROOM_ROUTES[path]
+                await self.call_api(scope, receive, send, method, takes_body,
+                                    getattr(self.room_api, name))
+            elif path in self.files and method in ('GET', 'HEAD'):
+                body, content_type = self.files[path]
+                await send_response(send, 200, body, [(b'content-type', content_type)])
+            else:
+                await send_json(send, {'success': False, 'error': 'Not found'}, 404)
+        except Exception as e:
+            print(f"💥 UNHANDLED EXCEPTION: {type(e).__name__}: {e}")
+            traceback.print_exc()
+            await send_json(send, {'success': False, 'error': f'Server error: {str(e)}'}, 500)
+
+    async def call_api(self, scope, receive, send, method, takes_body, call):
+        """Parse the request and answer with call(args) (run in a worker thread unless async)"""
+        if scope['method'] != method:
+            await send_json(send, {'success': False, 'error': 'Method not allowed'}, 405)
+            return
+        args = dict(parse_qsl(scope['query_string'].decode('latin-1')))
+        if takes_body:
+            body = await read_body(receive)
+            if body is None:
+                await send_json(send, {'success': False, 'error': 'Request body too large'}, 413)
+                return
+            try:
+                args = json.loads(body) if body else None
+            except ValueError:
+                await send_json(send, {'success': False, 'error': 'Invalid JSON body'}, 400)
+                return
+        if asyncio.iscoroutinefunction(call):
+            payload, status = await call(args)
+        else:
+            payload, status = await asyncio.to_thread(call, args)
+        await send_json(send, payload, status)
+
+    async def in_session(self, session_id, call, *args):
+        """Run call(*args) in a worker thread, after the session's other calls"""
+        if not session_id:
+            return await asyncio.to_thread(call, *args)
+        entry = self.session_locks.get(session_id)
+        if entry is None:
+            entry = self.session_locks[session_id] = [asyncio.Lock(), 0]
+        entry[1] += 1
+
+        async def locked():
+            try:
+                async with entry[0]:
+                    return await asyncio.to_thread(call, *args)
+            finally:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self.session_locks[session_id]
+
+        # Shielded: a dropped connection must not release the lock while the thread still runs
+        return await asyncio.shield(locked())
+
+    async def call_game_api(self, name, args):
+        session_id = args.get('session_id') if isinstance(args, dict) else None
+        return await self.in_session(session_id, self.run_api, name, args)
+
+    def run_api(self, name, args):
+        """Call a GameAPI method and notify the session's subscribers (in a worker thread, see in_session)"""
+        payload, status = getattr(self.api, name)(args)
+        if name in MUTATING and payload.get('success'):
+            session_id = payload.get('session_id') or (args or {}).get('session_id')
+            if session_id and self.events.has_subscribers(session_id):
+                game = self.manager.get_game(session_id)
+                if game is not None:
+                    self.events.publish(session_id, StateEvent(StateViews(game)))
+        return payload, status
+
+    async def wait_state(self, scope, send):
+        args = dict(parse_qsl(scope['query_string'].decode('latin-1')))
+        session_id = args.get('session_id')
+        # Subscribe before looking, so a change made in between is not missed
+        queue = self.events.subscribe(session_id) if session_id else None
+        try:
+            payload, status = await self.in_session(session_id, self.api.wait_state, args, 0)
+            if queue is not None and payload.get('success') and not payload['changed']:
+                try:
+                    timeout = min(max(float(args.get('timeout', WAIT_STATE_MAX_SECONDS)), 0),
+                                  WAIT_STATE_MAX_SECONDS)
+                except ValueError:
+                    timeout = WAIT_STATE_MAX_SECONDS
+                try:
+                    await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                payload, status = await self.in_session(session_id, self.api.wait_state, args, 0)
+        finally:
+            if queue is not None:
+                self.events.unsubscribe(session_id, queue)
+        await send_json(send, payload, status)
+
+    async def stream_events(self, scope, receive, send):
+        args = dict(parse_qsl(scope['query_string'].decode('latin-1')))
+        session_id = args.get('session_id')
+        game = await asyncio.to_thread(self.manager.get_game, session_id) if session_id else None
+        if game is None:
+            await send_json(send, {'success': False,
+                                   'error': 'Game session not found or expired. Start a new game.'}, 404)
+            return
+
+        queue = self.events.subscribe(session_id)
+        try:
+            views = await self.in_session(session_id, StateViews, game)
+            first = f"event: state\ndata: {views.encoded(0)}\n\n".encode()
+            await stream_sse(receive, send, queue, first, lambda event: event.sse)
+        finally:
+            self.events.unsubscribe(session_id, queue)
+
+    def ticket_done(self, ticket):
+        """Matchmaker callback (matcher threads): wake the ticket's waiting requests"""
+        if self.events.loop is not None:
+            self.events.loop.call_soon_threadsafe(self._wake_ticket, ticket.ticket_id)
+
+    def _wake_ticket(self, ticket_id):
+        for future in self.match_waiters.pop(ticket_id, ()):
+            if not future.done():
+                future.set_result(None)
+
+    async def match_status(self, scope, send):
+        args = dict(parse_qsl(scope['query_string'].decode('latin-1')))
+        ticket_id = args.get('ticket_id')
+        ticket = self.matchmaker.get(ticket_id)
+        try:
+            wait = min(max(float(args.get('wait', 0)), 0), WAIT_STATE_MAX_SECONDS)
+        except ValueError:
+            wait = 0
+        if ticket is not None and wait > 0:
+            future = asyncio.get_running_loop().create_future()
+            waiters = self.match_waiters.setdefault(ticket_id, set())
+            waiters.add(future)
+            try:
+                # Checked after registering, so a match made in between is not missed
+                if ticket.status in (Ticket.WAITING, Ticket.MATCHING):
+                    await asyncio.wait_for(future, wait)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                waiters.discard(future)
+                if not waiters and self.match_waiters.get(ticket_id) is waiters:
+                    del self.match_waiters[ticket_id]
+        payload, status = await asyncio.to_thread(self.match_api.status, args)
+        await send_json(send, payload, status)
+
+    async def spectate(self, scope, receive, send):
+        """Public state of a session or room for a read-only viewer"""
+        args = dict(parse_qsl(scope['query_string'].decode('latin-1')))
+        if args.get('room_id'):
+            room = self.rooms.rooms.get(args['room_id'])
+            if room is None:
+                await send_json(send, {'success': False, 'error': 'Room not found or closed'}, 404)
+                return
+            queue = self.room_hub.subscribe(room, SPECTATOR)
+            try:
+                first = await asyncio.to_thread(room.spectator_message)
+                await stream_sse(receive, send, queue, f"event: room\ndata: {first}\n\n".encode(),
+                                 lambda message: message)
+            finally:
+                self.room_hub.unsubscribe(room, queue)
+            return
+
+        session_id = args.get('session_id')
+        game = await asyncio.to_thread(self.manager.get_game, session_id) if session_id else None
+        if game is None:
+            await send_json(send, {'success': False, 'error': 'Game session not found or expired.'}, 404)
+            return
+        queue = self.events.subscribe(session_id)
+        try:
+            views = await self.in_session(session_id, StateViews, game)
+            first = f"event: state\ndata: {views.public_json}\n\n".encode()
+            await stream_sse(receive, send, queue, first, lambda event: event.public_sse)
+        finally:
+            self.events.unsubscribe(session_id, queue)
+
+    async def handle_websocket(self, scope, receive, send):
+        self.bind_loop()
+        if scope['path'] not in ('/ws', '/ws/room') or (await receive())['type'] != 'websocket.connect':
+            await send({'type': 'websocket.close', 'code': 1008})
+            return
+        if scope['path'] == '/ws/room':
+            await self.handle_room_socket(scope, receive, send)
+            return
+        args = dict(parse_qsl(scope['query_string'].decode('latin-1')))
+        session_id = args.get('session_id')
+        game = await asyncio.to_thread(self.manager.get_game, session_id) if session_id else None
+        if game is None:
+            await send({'type': 'websocket.close', 'code': 4404})
+            return
+        await send({'type': 'websocket.accept'})
+        channel = GameChannel(self, session_id, send)
+        views = await self.in_session(session_id, StateViews, game)
+        await channel.send_state(views.state(0))
+        try:
+            await channel.run(receive)
+        finally:
+            channel.close()
+
+    async def handle_room_socket(self, scope, receive, send):
+        args = dict(parse_qsl(scope['query_string'].decode('latin-1')))
+        payload, _ = await asyncio.to_thread(self.room_api.room_state, args)
+        if not payload['success']:
+            await send({'type': 'websocket.close', 'code': 4404})
+            return
+        room = self.rooms.get(args['room_id'])
+        await send({'type': 'websocket.accept'})
+        channel = RoomChannel(self, room, args['token'], payload['seat'], send)
+        await channel.send_json(dict(payload, type='room', moves=[]))
+        try:
+            await channel.run(receive)
+        finally:
+            channel.close()
+
+class GameChannel:
+    """
+    One WebSocket bound to a session
+    Messages from the client are {"action": ..., "id": ...} plus the action's
+    fields; each is answered with {"type": "result", "id": ..., ...} carrying
+    the same payload as the REST endpoint. State goes out as one "state"
+    message and then "delta" messages holding only the fields that changed;
+    a delta for a session's change is sent before the answer to the action.
+    """
+    def __init__(self, app, session_id, send):
+        self.app = app
+        self.send = send
+        self.session_id = session_id
+        self.sent_state = None   # Last state sent, for deltas
+        self.queue = app.events.subscribe(session_id)
+
+    async def send_json(self, payload):
+        await self.send({'type': 'websocket.send', 'text': encode_json(payload)})
+
+    async def send_state(self, state):
+        if self.sent_state is None:
+            await self.send_json({'type': 'state', 'state': state})
+        else:
+            changes = state_changes(self.sent_state, state)
+            if not changes:
+                return
+            await self.send_json({'type': 'delta', 'changes': changes})
+        self.sent_state = state
+
+    async def flush_events(self):
+        """Send the state waiting in the queue, if any"""
+        if not self.queue.empty():
+            event = self.queue.get_nowait()
+            if event is not None:
+                await self.send_state(event.state)
+
+    def rebind(self, session_id):
+        """Follow the session a restart moved the game to"""
+        self.app.events.unsubscribe(self.session_id, self.queue)
+        self.session_id = session_id
+        self.sent_state = None
+        self.queue = self.app.events.subscribe(session_id)
+
+    async def handle_message(self, text):
+        try:
+            message = json.loads(text)
+            action = message.pop('action')
+        except (ValueError, TypeError, KeyError, AttributeError):
+            await self.send_json({'type': 'error', 'error': 'Expected a JSON object with an action'})
+            return
+        request_id = message.pop('id', None)
+        if action not in CHANNEL_ACTIONS:
+            await self.send_json({'type': 'result', 'id': request_id, 'success': False,
+                                  'error': f'Unknown action: {action}'})
+            return
+        message['session_id'] = self.session_id
+        payload, status = await self.app.in_session(self.session_id, self.app.run_api, action, message)
+        if action == 'restart_game' and payload.get('session_id', self.session_id) != self.session_id:
+            self.rebind(payload['session_id'])
+            await self.send_state(payload['state'])
+        await self.flush_events()
+        await self.send_json(dict(payload, type='result', id=request_id, status=status))
+
+    async def run(self, receive):
+        incoming = asyncio.ensure_future(receive())
+        try:
+            while True:
+                next_event = asyncio.ensure_future(self.queue.get())
+                done, _ = await asyncio.wait((incoming, next_event), return_when=asyncio.FIRST_COMPLETED)
+                if next_event in done:
+                    event = next_event.result()
+                    if event is None:
+                        await self.send({'type': 'websocket.close', 'code': 1001})
+                        return
+                    await self.send_state(event.state)
+                else:
+                    next_event.cancel()
+                if incoming in done:
+                    message = incoming.result()
+                    if message['type'] == 'websocket.disconnect':
+                        return
+                    if message.get('text') is not None:
+                        await self.handle_message(message['text'])
+                    incoming = asyncio.ensure_future(receive())
+        finally:
+            incoming.cancel()
+
+    def close(self):
+        self.app.events.unsubscribe(self.session_id, self.queue)
+
+class RoomChannel:
+    """
+    One WebSocket for a seat of a room
+    Pushes the table's events as {"type": "room", ...} messages (the moves
+    since the last one and the seat's view) and takes {"action": ..., "id": ...}
+    messages for ROOM_ACTIONS, answered like GameChannel.
+    """
+    def __init__(self, app, room, token, seat, send):
+        self.app = app
+        self.room = room
+        self.token = token
+        self.send = send
+        self.queue = app.room_hub.subscribe(room, seat)
+
+    async def send_json(self, payload):
+        await self.send({'type': 'websocket.send', 'text': encode_json(payload)})
+
+    async def flush_events(self):
+        while not self.queue.empty():
+            message = self.queue.get_nowait()
+            if message is not None:
+                await self.send({'type': 'websocket.send', 'text': message})
+
+    async def handle_message(self, text):
+        try:
+            message = json.loads(text)
+            action = message.pop('action')
+        except (ValueError, TypeError, KeyError, AttributeError):
+            await self.send_json({'type': 'error', 'error': 'Expected a JSON object with an action'})
+            return
+        request_id = message.pop('id', None)
+        if action not in ROOM_ACTIONS:
+            await self.send_json({'type': 'result', 'id': request_id, 'success': False,
+                                  'error': f'Unknown action: {action}'})
+            return
+        message.update(room_id=self.room.room_id, token=self.token)
+        payload, status = await asyncio.to_thread(getattr(self.app.room_api, ROOM_ACTIONS[action]), message)
+        await self.flush_events()
+        if action != 'get_state':
+            payload.pop('state', None)  # The room message sent above already carries it
+        await self.send_json(dict(payload, type='result', id=request_id, status=status))
+
+    async def run(self, receive):
+        incoming = asyncio.ensure_future(receive())
+        try:
+            while True:
+                next_message = asyncio.ensure_future(self.queue.get())
+                done, _ = await asyncio.wait((incoming, next_message), return_when=asyncio.FIRST_COMPLETED)
+                if next_message in done:
+                    message = next_message.result()
+                    if message is None:
+                        await self.send({'type': 'websocket.close', 'code': 1001})
+                        return
+                    await self.send({'type': 'websocket.send', 'text': message})
+                else:
+                    next_message.cancel()
+                if incoming in done:
+                    message = incoming.result()
+                    if message['type'] == 'websocket.disconnect':
+                        return
+                    if message.get('text') is not None:
+                        await self.handle_message(message['text'])
+                    incoming = asyncio.ensure_future(receive())
+        finally:
+            incoming.cancel()
+
+    def close(self):
+        self.app.room_hub.unsubscribe(self.room, self.queue)
+
+async def stream_sse(receive, send, queue, first, encode):
+    """
+    Server-sent event response: first, then encode(item) for each item of
+    queue (None ends the stream), with keepalive comments in between
+    """
+    disconnected = asyncio.ensure_future(wait_for_disconnect(receive))
+    try:
+        await send({'type': 'http.response.start', 'status': 200, 'headers': SSE_HEADERS})
+        await send({'type': 'http.response.body', 'body': first, 'more_body': True})
+        while True:
+            next_item = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait((next_item, disconnected), timeout=SSE_PING_SECONDS,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if disconnected in done:
+                next_item.cancel()
+                return
+            if next_item in done:
+                item = next_item.result()
+                if item is None:
+                    break
+                body = encode(item)
+            else:
+                next_item.cancel()
+                body = b': ping\n\n'
+            await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        disconnected.cancel()
+
+async def read_body(receive):
+    """The whole request body, or None when it is larger than MAX_BODY"""
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            break
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if size > MAX_BODY:
+            return None
+        chunks.append(chunk)
+        if not message.get('more_body'):
+            break
+    return b''.join(chunks)
+
+async def wait_for_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+async def send_response(send, status, body, headers):
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': headers + [(b'content-length', str(len(body)).encode())]})
+    await send({'type': 'http.response.body', 'body': body})
+
+async def send_json(send, payload, status=200):
+    await send_response(send, status, json.dumps(payload).encode(), JSON_HEADERS)
+
+def raise_open_file_limit():
+    """Let the process keep as many sockets open as the hard limit allows"""
+    try:
+        import resource
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft < hard:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+        return hard
+    except (ImportError, ValueError, OSError):
+        return None
+
+app = GameASGIApp()
+
+def main():
+    import uvicorn
+
+    host = os.environ.get('HOST', '0.0.0.0')
+    port = int(os.environ.get('PORT', 5000))
+    open_files = raise_open_file_limit()
+    print(f"🚀 Serving the asyncio app on {host}:{port} (open file limit {open_files})")
+    uvicorn.run(app, host=host, port=port, lifespan='on',
+                backlog=int(os.environ.get('WEB_BACKLOG', 2048)),
+                timeout_keep_alive=int(os.environ.get('WEB_CHANNEL_TIMEOUT', 60)))
+
+if __name__ == '__main__':
+    main()
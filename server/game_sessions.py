@@ -0,0 +1,215 @@
+# server/game_sessions.py
+# Web game sessions: bot configuration and the session manager
+# Games live in a SessionStore (see server/session_store.py); the settings
+# below come from the environment.
+
+import os
+import threading
+import time
+
+from core.game import Game
+from core.strategy import STRATEGY_NAMES, create_strategy
+from server.session_store import create_session_store
+
+# Default bot strategy for every bot seat: "greedy" (built-in rules), "endgame" (greedy
+# with exact endgame search) or "montecarlo"
+BOT_AI = os.environ.get('BOT_AI', 'greedy').lower()
+BOT_TIME_BUDGET = float(os.environ.get('BOT_TIME_BUDGET_MS', '150')) / 1000
+# Hard limits for every bot decision, whatever the strategy (keeps /api/bot_move latency bounded)
+BOT_DECISION_DEADLINE = float(os.environ.get('BOT_DECISION_DEADLINE_MS', '180')) / 1000
+BOT_NODE_BUDGET = int(os.environ['BOT_NODE_BUDGET']) if os.environ.get('BOT_NODE_BUDGET') else None
+# Sessions idle this long are kept as a compact snapshot (core/snapshot.py) instead of a Game
+SESSION_IDLE_SECONDS = float(os.environ.get('SESSION_IDLE_SECONDS', '600'))
+SESSION_TIMEOUT = 3600  # Sessions idle this long are deleted
+# /api/wait_state: longest wait, and how many requests may wait at once (each holds a
+# server thread under waitress, which server/launcher.py adds on top of WEB_THREADS;
+# more return right away and the client polls)
+WAIT_STATE_MAX_SECONDS = float(os.environ.get('WAIT_STATE_MAX_SECONDS', '25'))
+WAIT_STATE_MAX_WAITERS = int(os.environ.get('WAIT_STATE_MAX_WAITERS', '64'))
+WAIT_STATE_RECHECK_SECONDS = 1.0  # Shared stores are re-read this often (other processes don't notify)
+
+def create_bot_strategy(name):
+    """Create a bot strategy by name with the server's settings"""
+    if name == 'montecarlo':
+        return create_strategy(name, time_budget=BOT_TIME_BUDGET)
+    return create_strategy(name)
+
+def parse_bot_strategies(value):
+    """
+    Parse per-seat strategy names from a request
+    Accepts {"1": "montecarlo"} or a list of names for seats 1, 2, 3.
+    Raises ValueError for unknown seats or names.
+    """
+    if not value:
+        return {}
+    if isinstance(value, list):
+        value = {seat: name for seat, name in enumerate(value, start=1)}
+    if not isinstance(value, dict):
+        raise ValueError('bot_strategies must be an object or a list')
+    
+    strategies = {}
+    for seat, name in value.items():
+        seat = int(seat)
+        if seat not in (1, 2, 3):
+            raise ValueError(f'Invalid bot seat {seat}')
+        if str(name).lower() not in STRATEGY_NAMES:
+            raise ValueError(f"Unknown bot strategy '{name}'. Available: {', '.join(STRATEGY_NAMES)}")
+        strategies[seat] = str(name).lower()
+    return strategies
+
+def get_strategy_names(game):
+    """Per-seat strategy names of the bot seats"""
+    return {seat: game.get_strategy(seat).name for seat in range(1, len(game.players))}
+
+def configure_bots(game, strategies=None):
+    """Set the strategy of every bot seat (seat -> name, default BOT_AI)"""
+    strategies = strategies or {}
+    for seat in range(1, len(game.players)):
+        game.set_strategy(seat, create_bot_strategy(strategies.get(seat, BOT_AI)))
+    return game
+
+class GameSession:
+    """Manage game sessions in a SessionStore (see server/session_store.py)"""
+    
+    def __init__(self, store=None):
+        self.store = store or create_session_store(create_bot_strategy)
+        self.last_cleanup = time.time()
+        self.changed = threading.Condition()  # Notified whenever a session is saved
+        self.change_count = 0                 # Saves so far (under changed)
+        self.waiters = 0
+    
+    def __contains__(self, session_id):
+        return session_id in self.store
+    
+    def create_session(self, player_name="You", is_fresh_game=True, bot_strategies=None):
+        """Create a new game session"""
+        session_id = os.urandom(16).hex()
+        
+        # Create new game with correct parameters
+        # is_fresh_game=True for page refresh/first time
+        # is_fresh_game=False for restart button
+        game = Game(is_fresh_game=is_fresh_game)
+        configure_bots(game, bot_strategies)
+        
+        # Update human player name
+        game.players[0].name = player_name
+        
+        # Store game data
+        self.store.put(session_id, {
+            'game': game,
+            'created_at': time.time(),
+            'last_activity': time.time(),
+            'player_name': player_name,
+            'is_fresh_game': is_fresh_game  # Track if this was a fresh game
+        })
+        self.notify_changed()
+        
+        if is_fresh_game:
+            print(f"🎮 Created FRESH game session {session_id[:8]}... for {player_name}")
+            print(f"   Round: {game.round_number}, First player: {game.players[game.first_player_index].name}")
+            if game.round_number == 1:
+                print(f"   3♠ rule applies: {game.players[game.first_player_index].name} has 3♠")
+        else:
+            print(f"🔄 Created RESTARTED game session {session_id[:8]}... for {player_name}")
+            print(f"   Round: {game.round_number}, First player: {game.players[game.first_player_index].name} (simulated round winner)")
+            print(f"   No 3♠ rule for round {game.round_number}")
+        
+        return session_id
+    
+    def get_game(self, session_id):
+        """Get game for session"""
+        game_data = self.store.get(session_id)
+        if game_data is None:
+            return None
+        return game_data['game']
+    
+    def update_session(self, session_id, game):
+        """Save the game of a session after it changed"""
+        game_data = self.store.get(session_id)
+        if game_data is not None:
+            game_data['game'] = game
+            self.store.put(session_id, game_data)
+            self.notify_changed()
+    
+    def replace_game(self, session_id, game, player_name):
+        """Put a new (restarted) game in a session, creating the session if needed"""
+        game_data = self.store.get(session_id) or {'created_at': time.time()}
+        game_data.update(game=game, player_name=player_name, is_fresh_game=False)
+        self.store.put(session_id, game_data)
+        self.notify_changed()
+    
+    def notify_changed(self):
+        with self.changed:
+            self.change_count += 1
+            self.changed.notify_all()
+    
+    def get_version(self, session_id):
+        """State version of a session (raised by every change), None if unknown"""
+        game_data = self.store.get(session_id)
+        if game_data is None:
+            return None
+        return game_data['version']
+    
+    def wait_for_change(self, session_id, known_version, timeout):
+        """
+        Wait until the session's version is above known_version or timeout passes
+        Returns the session's game data (None if unknown). Returns right away
+        when WAIT_STATE_MAX_WAITERS requests are already waiting.
+        """
+        deadline = time.monotonic() + timeout
+        shared = getattr(self.store, 'shared', False)
+        with self.changed:
+            full = self.waiters >= WAIT_STATE_MAX_WAITERS
+            if not full:
+                self.waiters += 1
+        if full:
+            return self.store.get(session_id)
+        try:
+            while True:
+                # The store is read outside the lock; a save made since is caught by change_count
+                with self.changed:
+                    seen = self.change_count
+                game_data = self.store.get(session_id)
+                remaining = deadline - time.monotonic()
+                if game_data is None or game_data['version'] > known_version or remaining <= 0:
+                    return game_data
+                with self.changed:
+                    if self.change_count == seen:
+                        self.changed.wait(min(remaining, WAIT_STATE_RECHECK_SECONDS) if shared else remaining)
+        finally:
+            with self.changed:
+                self.waiters -= 1
+    
+    def cleanup_old_sessions(self):
+        """Remove inactive sessions"""
+        current_time = time.time()
+        
+        # Only cleanup every 5 minutes
+        if current_time - self.last_cleanup < 300:
+            return
+        
+        for session_id, player_name in self.store.expire(SESSION_TIMEOUT):
+            print(f"🧹 Cleaning up inactive session {session_id[:8]}... for {player_name}")
+        
+        self.store.evict_idle(SESSION_IDLE_SECONDS)
+        self.last_cleanup = current_time
+    
+    def restart_session(self, session_id, player_name):
+        """Restart game in existing session with is_fresh_game=False"""
+        if session_id not in self.store:
+            return self.create_session(player_name, is_fresh_game=False)
+        
+        # Create new RESTARTED game (is_fresh_game=False), keeping the bot strategies
+        previous_strategies = get_strategy_names(self.get_game(session_id))
+        game = Game(is_fresh_game=False)
+        configure_bots(game, previous_strategies)
+        game.players[0].name = player_name
+        
+        # Update session
+        self.replace_game(session_id, game, player_name)
+        
+        print(f"🔄 Restarted session {session_id[:8]}... for {player_name}")
+        print(f"   Round: {game.round_number}, First player: {game.players[game.first_player_index].name}")
+        print(f"   No 3♠ rule for round {game.round_number}")
+        
+        return session_id
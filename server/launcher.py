@@ -0,0 +1,88 @@
+# server/launcher.py
+# Production entry point: the web app under waitress, tuned from the environment
+# Run with:  python -m server.launcher
+#
+#   HOST, PORT              where to listen (default 0.0.0.0:5000)
+#   WEB_APP                 app to serve (default web_app:app)
+#   WEB_CONCURRENCY         worker processes (default 1, more need the SQLite
+#                           session store, see server/prefork.py)
+#   WEB_THREADS             request threads per worker (default 8), plus one per
+#                           /api/wait_state waiter (WAIT_STATE_MAX_WAITERS)
+#   WEB_CONNECTION_LIMIT    open connections per worker before new ones wait (default 200)
+#   WEB_CHANNEL_TIMEOUT     seconds an idle keep-alive connection is kept open (default 60)
+#   WEB_BACKLOG             listen queue of the socket (default 2048)
+#   WEB_WARMUP              0 to skip the warmup before serving
+#   SECRET_KEY              cookie signing key (default: random, shared by the workers)
+
+import contextlib
+import io
+import os
+import time
+
+from server.game_sessions import WAIT_STATE_MAX_WAITERS
+from server.prefork import DEFAULT_APP, exit_on_sigterm, serve_prefork
+
+def _env_int(name, default):
+    return int(os.environ.get(name, default))
+
+def waitress_options():
+    """waitress.serve keyword arguments from the WEB_* variables"""
+    return {
+        # Long polls hold a thread each, so they get their own on top of WEB_THREADS
+        'threads': _env_int('WEB_THREADS', 8) + WAIT_STATE_MAX_WAITERS,
+        'connection_limit': _env_int('WEB_CONNECTION_LIMIT', 200),
+        'channel_timeout': _env_int('WEB_CHANNEL_TIMEOUT', 60),
+        'backlog': _env_int('WEB_BACKLOG', 2048),
+        'asyncore_use_poll': True,  # select() stops working past 1024 open sockets
+        'ident': 'tien-len'
+    }
+
+def warmup(app):
+    """
+    Do the first-request work before the first request
+    Compiles the page template, opens the opening book and plays one silent
+    bot game so the bitmask, decomposition and hash caches are filled.
+    """
+    if os.environ.get('WEB_WARMUP', '1') == '0':
+        return
+    start = time.perf_counter()
+    from core.game import Game
+    from core.opening_book import get_book
+
+    get_book()
+    with contextlib.redirect_stdout(io.StringIO()):
+        app.jinja_env.get_template('index.html')
+        with app.test_client() as client:
+            client.get('/')
+        game = Game()
+        for _ in range(200):
+            if game.is_game_over() or game.check_automatic_wins()[0]:
+                break
+            game.bot_turn(game.players[game.current_player_index])
+    print(f"🔥 Warmup done in {(time.perf_counter() - start) * 1000:.0f}ms (pid {os.getpid()})")
+
+def serve_app(app, host=None, port=None):
+    """Serve an already imported app in this process"""
+    from waitress import serve
+
+    host = host or os.environ.get('HOST', '0.0.0.0')
+    port = port or _env_int('PORT', 5000)
+    options = waitress_options()
+    exit_on_sigterm()
+    warmup(app)
+    print(f"🚀 Serving on {host}:{port} ({options['threads']} threads, "
+          f"{options['connection_limit']} connections)")
+    serve(app, host=host, port=port, **options)
+
+def main():
+    workers = _env_int('WEB_CONCURRENCY', 1)
+    options = waitress_options()
+    print(f"⚙️ waitress: {workers} workers x {options['threads']} threads, "
+          f"connection limit {options['connection_limit']}, channel timeout "
+          f"{options['channel_timeout']}s, backlog {options['backlog']}")
+    serve_prefork(os.environ.get('WEB_APP', DEFAULT_APP), workers,
+                  os.environ.get('HOST', '0.0.0.0'), _env_int('PORT', 5000),
+                  warmup=warmup, **options)
+
+if __name__ == '__main__':
+    main()
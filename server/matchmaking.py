@@ -0,0 +1,258 @@
+# server/matchmaking.py
+# Matchmaking: players wait in a queue and are seated together in rooms
+#
+# enqueue() only appends a ticket to the queue backend, so a burst of
+# arrivals never touches the room registry or waits on the matcher. One
+# matcher thread drains the queue in batches every MATCH_INTERVAL: every
+# four waiting players become a room (server/rooms.py), and once the oldest
+# has waited MATCH_BOT_FILL_SECONDS everyone waiting gets a room with bots
+# in the empty seats. Rooms are opened on a small thread pool, because the
+# bots may start playing as soon as a table is full.
+#
+#   MATCH_QUEUE=memory          queue backend (an in-process queue)
+#   MATCH_BOT_FILL_SECONDS      longest wait before bots fill a table (default 10)
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from server.rooms import ROOM_SEATS
+
+MATCH_BOT_FILL_SECONDS = float(os.environ.get('MATCH_BOT_FILL_SECONDS', '10'))
+MATCH_INTERVAL = 0.2     # Seconds between matcher passes
+MATCH_TABLE_WORKERS = 4  # Threads opening rooms
+TICKET_TTL = 300         # Seconds a matched or cancelled ticket can still be looked up
+WAIT_SAMPLES = 1000      # Recent waits kept for the latency metrics
+
+class Ticket:
+    """A player waiting for a table"""
+    WAITING = 'waiting'
+    MATCHING = 'matching'    # Taken by the matcher, the room is being opened
+    MATCHED = 'matched'
+    CANCELLED = 'cancelled'
+    FAILED = 'failed'
+
+    __slots__ = ('ticket_id', 'player_name', 'enqueued_at', 'finished_at', 'status',
+                 'room_id', 'seat', 'token', 'error')
+
+    def __init__(self, player_name):
+        self.ticket_id = os.urandom(16).hex()
+        self.player_name = player_name
+        self.enqueued_at = time.time()
+        self.finished_at = None
+        self.status = Ticket.WAITING
+        self.room_id = None
+        self.seat = None
+        self.token = None   # Seat token of the room, for the ticket's owner only
+        self.error = None
+
+    def info(self):
+        info = {
+            'ticket_id': self.ticket_id,
+            'status': self.status,
+            'player_name': self.player_name,
+            'waited_seconds': round((self.finished_at or time.time()) - self.enqueued_at, 3)
+        }
+        if self.status == Ticket.MATCHED:
+            info.update(room_id=self.room_id, seat=self.seat, token=self.token)
+        elif self.status == Ticket.FAILED:
+            info['error'] = self.error
+        return info
+
+class MatchQueue:
+    """
+    Interface of a matchmaking queue backend
+
+    push() adds a waiting ticket, pop(count) takes up to count tickets,
+    oldest first. push() is called from request threads, pop() only by the
+    matcher.
+    """
+    def push(self, ticket):
+        raise NotImplementedError
+
+    def pop(self, count):
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+class MemoryMatchQueue(MatchQueue):
+    """Tickets in a deque of this process (append and popleft need no lock)"""
+    def __init__(self):
+        self.tickets = deque()
+
+    def push(self, ticket):
+        self.tickets.append(ticket)
+
+    def pop(self, count):
+        popped = []
+        while len(popped) < count:
+            try:
+                popped.append(self.tickets.popleft())
+            except IndexError:
+                break
+        return popped
+
+    def __len__(self):
+        return len(self.tickets)
+
+def create_match_queue():
+    """Queue backend picked by MATCH_QUEUE"""
+    kind = os.environ.get('MATCH_QUEUE', 'memory').lower()
+    if kind == 'memory':
+        return MemoryMatchQueue()
+    raise ValueError(f"Unknown MATCH_QUEUE '{kind}'. Available: memory")
+
+class Matchmaker:
+    """Groups queued players into rooms of a RoomManager"""
+    def __init__(self, rooms, queue=None, bot_fill_seconds=MATCH_BOT_FILL_SECONDS,
+                 table_size=ROOM_SEATS, on_match=None):
+        self.rooms = rooms
+        self.queue = queue or create_match_queue()
+        self.bot_fill_seconds = bot_fill_seconds
+        self.table_size = table_size
+        self.on_match = on_match    # Called with each ticket that got a room or failed (any thread)
+        self.tickets = {}           # ticket_id -> Ticket
+        self.waiting = deque()      # Tickets drained from the queue (under lock)
+        self.lock = threading.Lock()  # Guards waiting, waits, stats and ticket cancels
+        self.waits = deque(maxlen=WAIT_SAMPLES)  # Recent waits in seconds (under lock)
+        self.stats = {'matched_players': 0, 'tables': 0, 'bot_seats': 0, 'cancelled': 0, 'failed': 0}
+        self.pool = ThreadPoolExecutor(MATCH_TABLE_WORKERS, thread_name_prefix='match-table')
+        self.matcher = None
+        self.stopped = threading.Event()
+        self.last_expiry = time.time()
+
+    # ===== PLAYERS =====
+
+    def enqueue(self, player_name):
+        """Put a player in the queue; returns their Ticket"""
+        self._start()
+        ticket = Ticket(player_name or 'Player')
+        self.tickets[ticket.ticket_id] = ticket
+        self.queue.push(ticket)
+        return ticket
+
+    def get(self, ticket_id):
+        return self.tickets.get(ticket_id)
+
+    def cancel(self, ticket_id):
+        """Leave the queue; False once the ticket is already being seated"""
+        with self.lock:
+            ticket = self.tickets.get(ticket_id)
+            if ticket is None or ticket.status != Ticket.WAITING:
+                return False
+            ticket.status = Ticket.CANCELLED
+            ticket.finished_at = time.time()
+            return True
+
+    # ===== MATCHER =====
+
+    def _start(self):
+        if self.matcher is None:
+            with self.lock:
+                if self.matcher is None:
+                    self.matcher = threading.Thread(target=self._run, name='matchmaker', daemon=True)
+                    self.matcher.start()
+
+    def _run(self):
+        while not self.stopped.wait(MATCH_INTERVAL):
+            try:
+                self.match_once()
+            except Exception as e:
+                print(f"💥 Matchmaker pass failed: {type(e).__name__}: {e}")
+
+    def match_once(self, now=None):
+        """One matcher pass: drain the queue and open the rooms that can be filled"""
+        now = now or time.time()
+        arrived = self.queue.pop(len(self.queue))
+        groups = []
+        with self.lock:
+            self.waiting.extend(arrived)
+            waiting = deque()
+            for ticket in self.waiting:
+                if ticket.status == Ticket.WAITING:
+                    waiting.append(ticket)
+                else:
+                    self.stats['cancelled'] += 1
+            while len(waiting) >= self.table_size:
+                groups.append([waiting.popleft() for _ in range(self.table_size)])
+            if waiting and now - waiting[0].enqueued_at >= self.bot_fill_seconds:
+                groups.append(list(waiting))
+                waiting.clear()
+            for group in groups:
+                for ticket in group:
+                    ticket.status = Ticket.MATCHING
+            self.waiting = waiting
+        for group in groups:
+            self.pool.submit(self._open_table, group)
+        if now - self.last_expiry > TICKET_TTL / 10:
+            self._expire(now)
+        return len(groups)
+
+    def _open_table(self, group):
+        try:
+            room, seats = self.rooms.open_table([ticket.player_name for ticket in group])
+        except Exception as e:
+            print(f"❌ Could not open a table for {len(group)} players: {e}")
+            with self.lock:
+                self.stats['failed'] += len(group)
+            for ticket in group:
+                ticket.status = Ticket.FAILED
+                ticket.error = str(e)
+                ticket.finished_at = time.time()
+                self._notify(ticket)
+            return
+        now = time.time()
+        for ticket, (seat, token) in zip(group, seats):
+            ticket.room_id = room.room_id
+            ticket.seat = seat
+            ticket.token = token
+            ticket.finished_at = now
+            ticket.status = Ticket.MATCHED
+        with self.lock:
+            self.waits.extend(now - ticket.enqueued_at for ticket in group)
+            self.stats['matched_players'] += len(group)
+            self.stats['tables'] += 1
+            self.stats['bot_seats'] += self.table_size - len(group)
+        print(f"🎲 Matched {len(group)} players in room {room.room_id}"
+              f"{f' with {self.table_size - len(group)} bots' if len(group) < self.table_size else ''}")
+        for ticket in group:
+            self._notify(ticket)
+
+    def _notify(self, ticket):
+        if self.on_match is not None:
+            self.on_match(ticket)
+
+    def _expire(self, now):
+        """Forget tickets finished more than TICKET_TTL ago"""
+        self.last_expiry = now
+        for ticket_id, ticket in list(self.tickets.items()):
+            if ticket.finished_at is not None and now - ticket.finished_at > TICKET_TTL:
+                del self.tickets[ticket_id]
+
+    def stop(self):
+        self.stopped.set()
+        self.pool.shutdown(wait=False)
+
+    # ===== METRICS =====
+
+    def metrics(self):
+        """Queue depth, wait latency of recent matches and totals"""
+        now = time.time()
+        with self.lock:
+            stats = dict(self.stats)
+            # Tickets cancelled since the last pass are still listed until the next one
+            waiting = [ticket for ticket in self.waiting if ticket.status == Ticket.WAITING]
+            waits = sorted(self.waits)
+        oldest = waiting[0].enqueued_at if waiting else None
+
+        def percentile(fraction):
+            return round(waits[min(len(waits) - 1, int(len(waits) * fraction))] * 1000) if waits else None
+
+        return dict(stats,
+                    queue_depth=len(self.queue) + len(waiting),
+                    oldest_wait_seconds=round(now - oldest, 3) if oldest else 0,
+                    wait_ms={'p50': percentile(0.5), 'p95': percentile(0.95), 'max': percentile(1.0),
+                             'samples': len(waits)})
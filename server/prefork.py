@@ -0,0 +1,146 @@
+# server/prefork.py
+# Several waitress worker processes sharing one listening socket
+# Started by server/launcher.py when WEB_CONCURRENCY is above 1
+#
+# The parent binds the socket and forks the workers; each worker imports the
+# app itself (nothing with threads or open files is created before the fork)
+# and accepts connections from the shared socket. Sessions must live in a
+# store every worker can see, so the workers use the SQLite session store in
+# shared mode (see server/session_store.py), and sign cookies with one
+# SECRET_KEY (picked in the parent when it is not set). Dead workers are replaced.
+
+import atexit
+import importlib
+import os
+import signal
+import socket
+import sys
+import time
+
+DEFAULT_APP = 'web_app:app'
+RESPAWN_DELAY = 1.0  # Seconds to wait before replacing a worker that died right away
+
+def load_app(app_path):
+    """Import 'module:attribute' and return the attribute"""
+    module_name, _, attribute = app_path.partition(':')
+    return getattr(importlib.import_module(module_name), attribute or 'app')
+
+def bind_socket(host, port, backlog):
+    sock = socket.socket(socket.AF_INET6 if ':' in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+def configure_shared_sessions(workers):
+    """Point every worker at one shared SQLite session store"""
+    if workers <= 1:
+        return
+    store = os.environ.setdefault('SESSION_STORE', 'sqlite').lower()
+    if store != 'sqlite':
+        raise SystemExit(f"❌ SESSION_STORE={store} keeps sessions inside one process; "
+                         f"use SESSION_STORE=sqlite with {workers} workers")
+    os.environ['SESSION_SHARED'] = '1'
+
+def configure_secret_key():
+    """Pick the cookie signing key once, before forking, so every worker shares it"""
+    if not os.environ.get('SECRET_KEY'):
+        os.environ['SECRET_KEY'] = os.urandom(24).hex()
+
+def _raise_exit(signum, frame):
+    raise SystemExit(0)
+
+def exit_on_sigterm():
+    """Turn SIGTERM into SystemExit so exit handlers (e.g. session flushes) run"""
+    signal.signal(signal.SIGTERM, _raise_exit)
+
+def run_worker(app_path, sock, options, warmup=None):
+    """Body of a worker process (never returns)"""
+    exit_on_sigterm()
+    signal.signal(signal.SIGINT, _raise_exit)
+    status = 0
+    try:
+        from waitress import serve
+        app = load_app(app_path)
+        if warmup is not None:
+            warmup(app)
+        serve(app, sockets=[sock], **options)
+    except SystemExit:
+        pass
+    except Exception as e:
+        print(f"💥 Worker {os.getpid()} crashed: {type(e).__name__}: {e}")
+        status = 1
+    finally:
+        # os._exit skips atexit, and returning would run the parent's code in the child
+        atexit._run_exitfuncs()
+        sys.stdout.flush()
+        os._exit(status)
+
+class PreforkServer:
+    """Parent process: binds the socket, keeps workers running, stops them on SIGTERM"""
+    def __init__(self, app_path=DEFAULT_APP, workers=2, host='0.0.0.0', port=5000,
+                 backlog=1024, warmup=None, **options):
+        self.app_path = app_path
+        self.warmup = warmup     # Called with the app in every worker before serving
+        self.workers = workers
+        self.host = host
+        self.port = port
+        self.backlog = backlog
+        self.options = options   # Passed to waitress.serve in every worker
+        self.children = {}       # pid -> start time
+        self.stopping = False
+
+    def spawn(self, sock):
+        pid = os.fork()
+        if pid == 0:
+            run_worker(self.app_path, sock, dict(self.options, backlog=self.backlog), self.warmup)
+        self.children[pid] = time.monotonic()
+        return pid
+
+    def stop(self, signum=None, frame=None):
+        self.stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self):
+        configure_shared_sessions(self.workers)
+        configure_secret_key()
+        sock = bind_socket(self.host, self.port, self.backlog)
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        print(f"🚀 Serving {self.app_path} on {self.host}:{self.port} with {self.workers} workers")
+        for _ in range(self.workers):
+            self.spawn(sock)
+
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            started = self.children.pop(pid, None)
+            if started is None or self.stopping:
+                continue
+            print(f"⚠️ Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}, starting a new one")
+            if time.monotonic() - started < RESPAWN_DELAY:
+                time.sleep(RESPAWN_DELAY)
+            self.spawn(sock)
+        sock.close()
+        print("👋 All workers stopped")
+
+def serve_prefork(app_path=DEFAULT_APP, workers=2, host='0.0.0.0', port=5000, warmup=None, **options):
+    """Serve app_path with workers processes; one process is served in place without forking"""
+    if workers <= 1 or not hasattr(os, 'fork'):
+        from waitress import serve
+        exit_on_sigterm()
+        app = load_app(app_path)
+        if warmup is not None:
+            warmup(app)
+        serve(app, host=host, port=port, **options)
+        return
+    PreforkServer(app_path, workers, host, port, warmup=warmup, **options).run()
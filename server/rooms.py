@@ -0,0 +1,331 @@
+# server/rooms.py
+# Multiplayer rooms: up to four people at one table, bots in the other seats
+#
+# A room holds one Game. Seats reserved for people are taken with join(),
+# which hands out a secret seat token that every later action must carry;
+# the remaining seats are bots that the room plays itself right after the
+# move that gives them the turn. The game starts once every reserved seat
+# is taken (or the host starts it early, handing open seats to bots).
+#
+# Each change makes one RoomEvent for the room's listeners: the list of
+# moves and the public state are encoded once and shared (StateViews, cached
+# per room version), and every seated player's message only adds their own
+# hand, encoded once however many connections they have.
+# Events are published before the room lock is released, so every listener
+# gets them in version order however many threads act on the room.
+# Rooms live in this process; each has its own lock, and the registry lock
+# is only taken to add or remove rooms, so tables never wait on each other.
+
+import json
+import os
+import threading
+import time
+
+from core.game import Game
+from core.strategy import SearchBudget
+from server.game_sessions import (BOT_DECISION_DEADLINE, BOT_NODE_BUDGET, configure_bots,
+                                  parse_bot_strategies)
+from server.serialization import StateViews, card_str_to_card, validate_card_input
+
+ROOM_SEATS = 4
+ROOM_IDLE_SECONDS = float(os.environ.get('ROOM_IDLE_SECONDS', '1800'))  # Idle rooms are closed
+ROOM_CLEANUP_INTERVAL = 300
+
+class RoomError(Exception):
+    """An action a room refuses; the message is shown to the player"""
+
+def encode_json(payload):
+    return json.dumps(payload, separators=(',', ':'))
+
+class Seat:
+    """A person at a table"""
+    __slots__ = ('name', 'token')
+
+    def __init__(self, name):
+        self.name = name
+        self.token = os.urandom(16).hex()
+
+def room_message_head(room, moves):
+    """Start of a room message: everything but the seat and the state"""
+    return (f'{{"type":"room","room_id":{encode_json(room.room_id)},'
+            f'"version":{room.version},"moves":{encode_json(moves)},'
+            f'"room":{encode_json(room.info())}')
+
+class RoomEvent:
+    """
+    One change of a room, ready to send
+    messages maps each seated player to their encoded message and
+    spectator_message is the same without any hand; the moves are encoded
+    once and spliced into all of them.
+    """
+    __slots__ = ('room_id', 'version', 'moves', 'messages', 'spectator_message')
+
+    def __init__(self, room, moves):
+        self.room_id = room.room_id
+        self.version = room.version
+        self.moves = moves
+        views = room.state_views()
+        shared = room_message_head(room, moves)
+        self.messages = {
+            seat: f'{shared},"seat":{seat},"state":{views.encoded(seat)}}}'
+            for seat in room.human_seats()
+        }
+        self.spectator_message = f'{shared},"state":{views.public_json}}}'
+
+class Room:
+    """One table: a Game, its seats and the listeners of its events"""
+    def __init__(self, room_id, humans=1, bot_strategies=None):
+        if not 1 <= humans <= ROOM_SEATS:
+            raise RoomError(f'A room has 1 to {ROOM_SEATS} human seats')
+        self.room_id = room_id
+        self.lock = threading.RLock()
+        self.game = configure_bots(Game(is_fresh_game=True), bot_strategies)
+        self.seats = [None] * ROOM_SEATS        # Seat (a person) or None (a bot or a free seat)
+        self.open_seats = list(range(humans))   # Seats still waiting for a person, in join order
+        self.started = False
+        self.version = 0
+        self.views = None                       # StateViews of the current version
+        self.listeners = set()                  # Called with every RoomEvent (from any thread)
+        self.created_at = time.time()
+        self.last_activity = self.created_at
+
+    # ===== SEATS =====
+
+    def human_seats(self):
+        return [seat for seat, person in enumerate(self.seats) if person is not None]
+
+    def seat_of(self, token):
+        for seat, person in enumerate(self.seats):
+            if person is not None and person.token == token:
+                return seat
+        raise RoomError('Unknown seat token for this room')
+
+    def info(self):
+        """Public description of the room (no tokens)"""
+        return {
+            'room_id': self.room_id,
+            'started': self.started,
+            'open_seats': len(self.open_seats),
+            'seats': [{'name': player.name, 'human': self.seats[seat] is not None,
+                       'waiting': seat in self.open_seats}
+                      for seat, player in enumerate(self.game.players)]
+        }
+
+    def _unique_name(self, name):
+        taken = {player.name for player in self.game.players}
+        unique = name
+        count = 2
+        while unique in taken:
+            unique = f'{name} ({count})'
+            count += 1
+        return unique
+
+    def join(self, player_name):
+        """Take the next open seat; returns (seat, token)"""
+        with self.lock:
+            if not self.open_seats:
+                raise RoomError('This room is full')
+            seat = self.open_seats.pop(0)
+            person = Seat(self._unique_name(player_name or f'Player {seat + 1}'))
+            self.seats[seat] = person
+            self.game.players[seat].name = person.name
+            self.game.players[seat].is_human = True
+            moves = [{'seat': seat, 'player': person.name, 'action': 'join'}]
+            if not self.open_seats:
+                self.started = True
+                moves += self._play_bots()
+            event = self._changed(moves)
+            self._publish(event)
+        return seat, person.token
+
+    def start(self, token):
+        """Start without waiting: the open seats are played by bots (host only)"""
+        with self.lock:
+            if self.seat_of(token) != self.human_seats()[0]:
+                raise RoomError('Only the host can start the game')
+            if self.started:
+                raise RoomError('The game has already started')
+            self.open_seats = []
+            self.started = True
+            event = self._changed([{'action': 'start'}] + self._play_bots())
+            self._publish(event)
+
+    # ===== MOVES =====
+
+    def _check_turn(self, seat):
+        if not self.started:
+            raise RoomError(f'Waiting for {len(self.open_seats)} more player(s)')
+        if self.game.is_game_over():
+            raise RoomError('Game is already over')
+        if self.game.current_player_index != seat:
+            raise RoomError(f"Not your turn. It's {self.game.players[self.game.current_player_index].name}'s turn")
+
+    def play_cards(self, token, card_strs):
+        """Play cards for the token's seat, then let the bots move; returns the message"""
+        if not card_strs or not validate_card_input(card_strs):
+            raise RoomError('Invalid card format')
+        with self.lock:
+            seat = self.seat_of(token)
+            self._check_turn(seat)
+            player = self.game.players[seat]
+            cards = [card_str_to_card(card_str) for card_str in card_strs]
+            for card in cards:
+                if card not in player.hand:
+                    raise RoomError(f"Card {card} not in your hand")
+            success, message = self.game.play_cards(seat, cards)
+            if not success:
+                raise RoomError(message)
+            moves = [{'seat': seat, 'player': player.name, 'action': 'play',
+                      'cards': [str(card) for card in cards], 'message': message}]
+            event = self._changed(moves + self._play_bots())
+            self._publish(event)
+        return message
+
+    def pass_turn(self, token):
+        with self.lock:
+            seat = self.seat_of(token)
+            self._check_turn(seat)
+            player = self.game.players[seat]
+            success, message = self.game.pass_turn(seat)
+            if not success:
+                raise RoomError(message)
+            moves = [{'seat': seat, 'player': player.name, 'action': 'pass', 'message': message}]
+            event = self._changed(moves + self._play_bots())
+            self._publish(event)
+        return message
+
+    def _play_bots(self):
+        """Play bot seats until a person is to move or the game ends (lock held)"""
+        moves = []
+        game = self.game
+        while self.started and not game.is_game_over():
+            auto_winner, reason = game.check_automatic_wins()
+            if auto_winner:
+                # An automatic win ends the game at once, whoever's turn it is
+                message = game._declare_automatic_winner(auto_winner, reason)
+                moves.append({'seat': game.get_player_index(auto_winner), 'player': auto_winner.name,
+                              'action': 'auto_win', 'message': message})
+                break
+            seat = game.current_player_index
+            if self.seats[seat] is not None:
+                break
+            bot = game.players[seat]
+            if bot.has_won():
+                game._advance_turn()
+                continue
+            budget = SearchBudget(time_limit=BOT_DECISION_DEADLINE, node_limit=BOT_NODE_BUDGET)
+            played = game.bot_turn(bot, budget=budget)
+            if played:
+                moves.append({'seat': seat, 'player': bot.name, 'action': 'play',
+                              'cards': [str(card) for card in played]})
+            else:
+                moves.append({'seat': seat, 'player': bot.name, 'action': 'pass'})
+        return moves
+
+    # ===== EVENTS =====
+
+    def state_views(self):
+        """StateViews of the current version (lock held)"""
+        if self.views is None:
+            self.views = StateViews(self.game)
+        return self.views
+
+    def view(self, token):
+        """The room as seen from the token's seat"""
+        with self.lock:
+            seat = self.seat_of(token)
+            self.last_activity = time.time()
+            return {
+                'room_id': self.room_id,
+                'room': self.info(),
+                'seat': seat,
+                'version': self.version,
+                'state': self.state_views().state(seat)
+            }
+
+    def spectator_message(self):
+        """Encoded public view of the current version (for a new spectator)"""
+        with self.lock:
+            return f'{room_message_head(self, [])},"state":{self.state_views().public_json}}}'
+
+    def _changed(self, moves):
+        """Record a change and build its event (lock held)"""
+        self.version += 1
+        self.views = None
+        self.last_activity = time.time()
+        return RoomEvent(self, moves)
+
+    def _publish(self, event):
+        """Hand an event to the listeners (lock held, so they get the versions in order)"""
+        for listener in list(self.listeners):
+            listener(event)
+
+    def subscribe(self, listener):
+        self.listeners.add(listener)
+
+    def unsubscribe(self, listener):
+        self.listeners.discard(listener)
+
+class RoomManager:
+    """Registry of the rooms of this process"""
+    def __init__(self):
+        self.rooms = {}  # room_id -> Room
+        self.lock = threading.Lock()
+        self.last_cleanup = time.time()
+
+    def __len__(self):
+        return len(self.rooms)
+
+    def get(self, room_id):
+        room = self.rooms.get(room_id)
+        if room is None:
+            raise RoomError('Room not found or closed')
+        return room
+
+    def create_room(self, player_name='Player 1', humans=1, bot_strategies=None):
+        """Open a room and seat its host; returns (room, seat, token)"""
+        try:
+            bot_strategies = parse_bot_strategies(bot_strategies)
+            humans = int(humans)
+        except (TypeError, ValueError) as e:
+            raise RoomError(str(e))
+        self.cleanup_idle_rooms()
+        room = Room(os.urandom(8).hex(), humans, bot_strategies)
+        with self.lock:
+            self.rooms[room.room_id] = room
+        seat, token = room.join(player_name)
+        print(f"🪑 Room {room.room_id} opened by {room.game.players[seat].name} ({humans} human seats)")
+        return room, seat, token
+
+    def open_table(self, player_names, bot_strategies=None):
+        """
+        Seat a group at a new room in one go (bots take the other seats)
+        The room is only registered once everyone sits, so nobody else can
+        join it. Returns (room, [(seat, token) for each name]).
+        """
+        self.cleanup_idle_rooms()
+        room = Room(os.urandom(8).hex(), len(player_names), bot_strategies)
+        seats = [room.join(name) for name in player_names]
+        with self.lock:
+            self.rooms[room.room_id] = room
+        return room, seats
+
+    def join_room(self, room_id, player_name):
+        room = self.get(room_id)
+        seat, token = room.join(player_name)
+        print(f"🪑 {room.game.players[seat].name} joined room {room_id} at seat {seat}")
+        return room, seat, token
+
+    def cleanup_idle_rooms(self):
+        """Close rooms nobody used for ROOM_IDLE_SECONDS (checked every few minutes)"""
+        now = time.time()
+        if now - self.last_cleanup < ROOM_CLEANUP_INTERVAL:
+            return
+        self.last_cleanup = now
+        with self.lock:
+            idle = [room_id for room_id, room in self.rooms.items()
+                    if now - room.last_activity > ROOM_IDLE_SECONDS and not room.listeners]
+            for room_id in idle:
+                del self.rooms[room_id]
+        if idle:
+            print(f"🧹 Closed {len(idle)} idle rooms")
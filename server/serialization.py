@@ -0,0 +1,233 @@
+# server/serialization.py
+# JSON shapes of the game for the web clients, and parsing of card strings
+# Shared by web_app.py (Flask) and server/asgi.py. The state is a public part
+# plus the viewing seat's own fields (StateViews encodes the public part once).
+
+import json
+
+from core.card import Card
+from core.rules import get_play_type
+
+def serialize_card(card):
+    """Convert Card object to dict"""
+    return {
+        'rank': card.rank,
+        'suit': card.suit,
+        'display': str(card)  # e.g., "3♠", "J♥", "2♦"
+    }
+
+def serialize_player(player):
+    """Convert Player object to dict"""
+    return {
+        'name': player.name,
+        'cards_remaining': len(player.hand),
+        'has_won': player.has_won(),
+        'is_human': player.is_human if hasattr(player, 'is_human') else False
+    }
+
+def serialize_game_state(game, seat=0):
+    """Return dictionary matching JS expected state, as seen from seat (whose hand is player_hand)"""
+    if not game:
+        return None
+    return merge_seat_state(serialize_public_state(game), serialize_seat_state(game, seat))
+
+def serialize_public_state(game):
+    """The state every viewer sees: serialize_game_state without the seat's own fields"""
+    # Get current player
+    current_player = None
+    if game.current_player_index is not None and game.current_player_index < len(game.players):
+        current_player = game.players[game.current_player_index]
+    
+    # Get recent plays for current round
+    recent_plays = game.get_recent_plays(count=3, current_round_only=True) if hasattr(game, 'get_recent_plays') else []
+    round_plays = []
+    
+    for play in recent_plays:
+        if hasattr(play, 'get'):
+            round_plays.append(game.get_play_string(play))
+        else:
+            # Handle as dict
+            if play.get('is_pass'):
+                round_plays.append(f"{play.get('player', 'Unknown')} passed")
+            else:
+                cards = play.get('cards', [])
+                cards_str = ' '.join(str(c) for c in cards) if cards else ''
+                round_plays.append(f"{play.get('player', 'Unknown')} played {cards_str}")
+    
+    # Get round winner
+    round_winner = None
+    if game.round_winner:
+        round_winner = game.round_winner.name
+    elif hasattr(game, 'get_round_winner'):
+        winner_obj = game.get_round_winner()
+        if winner_obj:
+            round_winner = winner_obj.name
+    
+    # Check if 3♠ rule applies (only for round 1)
+    three_spades_player = None
+    if game.round_number == 1:
+        # Find who has 3♠ for round 1
+        for i, player in enumerate(game.players):
+            for card in player.hand:
+                if card.rank == 3 and card.suit == "♠":
+                    three_spades_player = player.name
+                    break
+            if three_spades_player:
+                break
+    auto_winner_info = None
+    if hasattr(game, 'check_automatic_wins'):
+        auto_winner, reason = game.check_automatic_wins()
+        if auto_winner:
+            auto_winner_info = {
+                'player': auto_winner.name,
+                'reason': reason,
+                'player_index': game.get_player_index(auto_winner)
+            }
+    
+    # summary comes first: StateViews splices the seat's card count in after it
+    return {
+        'summary': {
+            'round': game.round_number,
+            'total_plays': game.total_plays if hasattr(game, 'total_plays') else 0,
+            'players_remaining': len([p for p in game.players if not p.has_won()]),
+            'last_play_type': get_play_type(game.last_play) if game.last_play else 'None',
+            'consecutive_passes': game.pass_count,
+            'is_new_round': len(game.last_play) == 0,
+            'bomb_used_this_round': game.bomb_used if hasattr(game, 'bomb_used') else False,
+            'is_first_play_of_game': game.is_first_play_of_game() if hasattr(game, 'is_first_play_of_game') else False,
+            'is_first_play_of_round': game.is_first_play_of_round() if hasattr(game, 'is_first_play_of_round') else False,
+            'three_spades_player': three_spades_player,
+            'auto_winner': auto_winner_info,
+        },
+        'current_player': current_player.name if current_player else None,
+        'current_player_index': game.current_player_index,
+        'first_player_index': game.first_player_index,
+        'game_over': game.is_game_over(),
+        'players': [serialize_player(p) for p in game.players],
+        'last_play': serialize_last_play(game.last_play, game) if game.last_play else None,
+        'round_plays': round_plays,
+        'winner': game.get_winner().name if game.get_winner() else None,
+        'round_winner': round_winner,
+        'rules_info': {
+            'requires_three_spades': (game.round_number == 1 and len(game.last_play) == 0),
+            'three_spades_player': three_spades_player,
+            'can_start_round': (game.current_player_index == game.first_player_index)
+        }
+    }
+
+def serialize_seat_state(game, seat):
+    """The fields of the state that belong to the player at seat"""
+    player = game.players[seat] if game.players else None
+    return {
+        'is_player_turn': game.current_player_index == seat,
+        'player_hand': [serialize_card(c) for c in player.hand] if player else [],
+        'current_player_cards': len(player.hand) if player else 0
+    }
+
+def merge_seat_state(public, seat_state):
+    """Full state from the public part and one seat's part (public is not changed)"""
+    state = dict(public)
+    state['summary'] = dict(public['summary'], current_player_cards=seat_state['current_player_cards'])
+    state['is_player_turn'] = seat_state['is_player_turn']
+    state['player_hand'] = seat_state['player_hand']
+    return state
+
+class StateViews:
+    """
+    The state of one game version for any number of viewers
+    The public part is serialized and encoded once; each seat then only adds
+    its own small part. Use it while the game stays at that version.
+    """
+    SUMMARY_PREFIX = '{"summary":{'
+
+    def __init__(self, game):
+        self.game = game
+        self.public = serialize_public_state(game)
+        self.public_json = json.dumps(self.public, separators=(',', ':'))
+        self.seat_json = {}  # seat -> encoded full state
+
+    def state(self, seat):
+        return merge_seat_state(self.public, serialize_seat_state(self.game, seat))
+
+    def encoded(self, seat):
+        """JSON text of serialize_game_state(game, seat)"""
+        text = self.seat_json.get(seat)
+        if text is None and not self.public_json.startswith(self.SUMMARY_PREFIX):
+            # The splice below needs summary first; encode in full if that ever changes
+            text = self.seat_json[seat] = json.dumps(self.state(seat), separators=(',', ':'))
+        if text is None:
+            own = serialize_seat_state(self.game, seat)
+            prefix = len(self.SUMMARY_PREFIX)
+            text = (f'{self.SUMMARY_PREFIX}"current_player_cards":{own["current_player_cards"]},'
+                    f'{self.public_json[prefix:-1]},"is_player_turn":{json.dumps(own["is_player_turn"])},'
+                    f'"player_hand":{json.dumps(own["player_hand"], separators=(",", ":"))}}}')
+            self.seat_json[seat] = text
+        return text
+
+def serialize_last_play(play_cards, game):
+    """Convert last play to serializable format"""
+    if not play_cards:
+        return None
+    
+    play_type = get_play_type(play_cards) if play_cards else None
+    
+    # Find who played last
+    player_name = "Unknown"
+    last_record = game.play_history.last_play_record()
+    if last_record is not None:
+        player_name = last_record.player
+    
+    return {
+        'player': player_name,
+        'cards': [str(card) for card in play_cards],
+        'play_type': play_type,
+        'is_bomb': play_type in ["quadruple", "consecutive_pairs"] and len(play_cards) >= 4,
+        'is_pass': False
+    }
+
+def card_str_to_card(card_str):
+    """Convert card string (e.g., "3♠", "J♥") to Card object"""
+    # Map rank symbols to numbers
+    rank_map = {
+        '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9, '10': 10,
+        'J': 11, 'Q': 12, 'K': 13, 'A': 14, '2': 2
+    }
+    
+    # Parse the card string
+    # Find the suit (last character)
+    suit = card_str[-1]
+    
+    # Get rank part (everything except last character)
+    rank_str = card_str[:-1]
+    
+    # Convert rank string to int
+    rank = rank_map.get(rank_str)
+    if rank is None:
+        # Try to parse numeric rank
+        try:
+            rank = int(rank_str)
+        except ValueError:
+            return None
+    
+    # Create and return Card object
+    return Card(rank, suit)
+
+def validate_card_input(card_strs):
+    """Validate card strings from web client"""
+    if not isinstance(card_strs, list):
+        return False
+    
+    valid_suits = {'♠', '♣', '♦', '♥'}
+    valid_ranks = {'3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A', '2'}
+    
+    for card_str in card_strs:
+        if not isinstance(card_str, str) or len(card_str) < 2:
+            return False
+        
+        suit = card_str[-1]
+        rank = card_str[:-1]
+        
+        if suit not in valid_suits or rank not in valid_ranks:
+            return False
+    
+    return True
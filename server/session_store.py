@@ -0,0 +1,352 @@
+# server/session_store.py
+# Pluggable storage for web game sessions
+# A session is a dict: game, created_at, last_activity, player_name,
+# is_fresh_game and version (raised by every put). Stores hand out the same dict until the session is evicted,
+# so handlers mutate the Game in place and call put() when they are done.
+#
+#   SESSION_STORE=memory  everything in this process (idle games kept as snapshots)
+#   SESSION_STORE=sqlite  LRU of live games in front of a SQLite file (SESSION_DB)
+#                         in WAL mode; put() is written behind in batches
+#   SESSION_SHARED=1      several processes use the same SQLite file: reads check
+#                         the row version and put() writes through, failing with
+#                         SessionConflict if another process saved the session first
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from core.snapshot import dump_game, load_game
+from core.strategy import create_strategy
+
+DEFAULT_SESSION_DB = 'sessions.db'
+DEFAULT_HOT_SESSIONS = 256
+DEFAULT_FLUSH_INTERVAL = 0.5  # Seconds between write-behind batches
+DB_TIMEOUT = 10.0             # Seconds to wait for another process's write lock
+
+class SessionConflict(Exception):
+    """A session was saved by another process since this one loaded it"""
+
+class SessionStore:
+    """
+    Interface of a session store
+
+    get() returns the session dict (None if unknown) and records the access,
+    put() stores a new or changed session, expire() drops sessions idle for
+    longer than max_idle seconds and returns their (session_id, player_name).
+    """
+    def get(self, session_id):
+        raise NotImplementedError
+
+    def put(self, session_id, game_data):
+        raise NotImplementedError
+
+    def delete(self, session_id):
+        raise NotImplementedError
+
+    def __contains__(self, session_id):
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def expire(self, max_idle):
+        raise NotImplementedError
+
+    def evict_idle(self, max_idle):
+        """Free the memory of sessions idle for max_idle seconds, returns how many"""
+        return 0
+
+    def flush(self):
+        """Write pending changes (no-op for stores that write through)"""
+
+    def close(self):
+        self.flush()
+
+class MemorySessionStore(SessionStore):
+    """Sessions in a dict of this process; idle games are kept as snapshots"""
+    def __init__(self, strategy_factory=create_strategy):
+        self.strategy_factory = strategy_factory
+        self.sessions = {}  # session_id -> game_data
+        self.lock = threading.Lock()
+
+    def get(self, session_id):
+        game_data = self.sessions.get(session_id)
+        if game_data is None:
+            return None
+        game_data['last_activity'] = time.time()
+        if game_data['game'] is None:
+            with self.lock:
+                if game_data['game'] is None:
+                    game_data['game'] = load_game(game_data.pop('snapshot'), self.strategy_factory)
+                    print(f"♻️ Restored session {session_id[:8]}... from snapshot")
+        return game_data
+
+    def put(self, session_id, game_data):
+        game_data['last_activity'] = time.time()
+        game_data['version'] = game_data.get('version', 0) + 1
+        self.sessions[session_id] = game_data
+
+    def delete(self, session_id):
+        self.sessions.pop(session_id, None)
+
+    def __contains__(self, session_id):
+        return session_id in self.sessions
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def expire(self, max_idle):
+        cutoff = time.time() - max_idle
+        expired = [(session_id, game_data['player_name'])
+                   for session_id, game_data in list(self.sessions.items())
+                   if game_data['last_activity'] < cutoff]
+        for session_id, _ in expired:
+            self.delete(session_id)
+        return expired
+
+    def evict_idle(self, max_idle):
+        """Replace the Game of idle sessions with a snapshot (restored by get)"""
+        cutoff = time.time() - max_idle
+        evicted = 0
+        saved = 0
+        with self.lock:
+            for game_data in list(self.sessions.values()):
+                if game_data['game'] is None or game_data['last_activity'] >= cutoff:
+                    continue
+                game_data['snapshot'] = dump_game(game_data['game'])
+                game_data['game'] = None
+                evicted += 1
+                saved += len(game_data['snapshot'])
+        if evicted:
+            print(f"💤 Evicted {evicted} idle sessions ({saved} bytes of snapshots)")
+        return evicted
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Live sessions in an LRU of at most hot_size entries, every session in SQLite
+
+    put() snapshots the game right away (in the request thread, while the
+    game is consistent) and queues the row; a writer thread saves queued rows
+    every flush_interval seconds in one transaction. A miss in the LRU loads
+    the row, so a restarted process picks up where the last one stopped.
+
+    With shared=True the file is shared by several processes. Every session
+    carries the version of the row it was loaded from; get() reloads when
+    the row has moved on and put() is an immediate compare-and-set on it.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            session_id TEXT PRIMARY KEY,
+            player_name TEXT NOT NULL,
+            is_fresh_game INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            last_activity REAL NOT NULL,
+            snapshot BLOB NOT NULL,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    """
+    COLUMNS = 'player_name, is_fresh_game, created_at, last_activity, snapshot, version'
+
+    def __init__(self, path=DEFAULT_SESSION_DB, hot_size=DEFAULT_HOT_SESSIONS,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL, strategy_factory=create_strategy,
+                 shared=False):
+        self.path = path
+        self.shared = shared
+        self.hot_size = hot_size
+        self.flush_interval = flush_interval
+        self.strategy_factory = strategy_factory
+        self.hot = OrderedDict()   # session_id -> game_data, most recent last
+        self.pending = {}          # session_id -> row waiting for the writer
+        self.touched = {}          # session_id -> last_activity of reads since the last flush
+        self.lock = threading.RLock()
+        self.db_lock = threading.Lock()
+        self.db = sqlite3.connect(path, timeout=DB_TIMEOUT, check_same_thread=False,
+                                  isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute(self.SCHEMA)
+        columns = [row[1] for row in self.db.execute('PRAGMA table_info(sessions)')]
+        if 'version' not in columns:
+            self.db.execute('ALTER TABLE sessions ADD COLUMN version INTEGER NOT NULL DEFAULT 0')
+        self.closed = threading.Event()
+        self.writer = threading.Thread(target=self._write_behind, name='session-writer', daemon=True)
+        self.writer.start()
+
+    # ===== HOT TIER =====
+
+    def _remember(self, session_id, game_data):
+        self.hot[session_id] = game_data
+        self.hot.move_to_end(session_id)
+        while len(self.hot) > self.hot_size:
+            # Queued rows stay in pending, so nothing is lost by dropping the dict
+            self.hot.popitem(last=False)
+
+    def _row_to_session(self, row):
+        player_name, is_fresh_game, created_at, last_activity, snapshot, version = row
+        return {
+            'game': load_game(snapshot, self.strategy_factory),
+            'created_at': created_at,
+            'last_activity': last_activity,
+            'player_name': player_name,
+            'is_fresh_game': bool(is_fresh_game),
+            'version': version
+        }
+
+    def _read_row(self, session_id):
+        with self.db_lock:
+            return self.db.execute(f'SELECT {self.COLUMNS} FROM sessions WHERE session_id = ?',
+                                   (session_id,)).fetchone()
+
+    def _read_version(self, session_id):
+        with self.db_lock:
+            row = self.db.execute('SELECT version FROM sessions WHERE session_id = ?',
+                                  (session_id,)).fetchone()
+        return row[0] if row is not None else None
+
+    def get(self, session_id):
+        now = time.time()
+        with self.lock:
+            game_data = self.hot.get(session_id)
+            if self.shared:
+                version = self._read_version(session_id)
+                if version is None:
+                    self.hot.pop(session_id, None)
+                    return None
+                if game_data is not None and game_data['version'] != version:
+                    game_data = None  # Saved by another process since we loaded it
+            if game_data is None:
+                row = self.pending.get(session_id)
+                row = row[1:] if row is not None else self._read_row(session_id)
+                if row is None:
+                    return None
+                game_data = self._row_to_session(row)
+            self._remember(session_id, game_data)
+            game_data['last_activity'] = now
+            if session_id not in self.pending:
+                self.touched[session_id] = now
+        return game_data
+
+    def put(self, session_id, game_data):
+        game_data['last_activity'] = time.time()
+        version = game_data.get('version')  # None for a session that was never saved
+        row = (session_id, game_data['player_name'], int(game_data['is_fresh_game']),
+               game_data['created_at'], game_data['last_activity'], dump_game(game_data['game']),
+               (version or 0) + 1)
+        if self.shared:
+            self._write_through(row, version)
+        with self.lock:
+            game_data['version'] = row[-1]
+            self._remember(session_id, game_data)
+            if not self.shared:
+                self.pending[session_id] = row
+            self.touched.pop(session_id, None)
+
+    def _write_through(self, row, version):
+        """Save row now if the stored session is still at version (None: a new session)"""
+        session_id = row[0]
+        with self.db_lock:
+            if version is None:
+                try:
+                    self.db.execute(f'INSERT INTO sessions (session_id, {self.COLUMNS}) '
+                                    'VALUES (?, ?, ?, ?, ?, ?, ?)', row)
+                    return
+                except sqlite3.IntegrityError:
+                    saved = False
+            else:
+                saved = self.db.execute(
+                    'UPDATE sessions SET player_name = ?, is_fresh_game = ?, created_at = ?, '
+                    'last_activity = ?, snapshot = ?, version = ? '
+                    'WHERE session_id = ? AND version = ?', row[1:] + (session_id, version)).rowcount == 1
+        if not saved:
+            with self.lock:
+                self.hot.pop(session_id, None)
+            raise SessionConflict(f"Session {session_id[:8]}... was changed by another request, reload the game")
+
+    def delete(self, session_id):
+        with self.lock:
+            self.hot.pop(session_id, None)
+            self.pending.pop(session_id, None)
+            self.touched.pop(session_id, None)
+        with self.db_lock:
+            self.db.execute('DELETE FROM sessions WHERE session_id = ?', (session_id,))
+
+    def __contains__(self, session_id):
+        with self.lock:
+            if session_id in self.hot or session_id in self.pending:
+                return True
+        with self.db_lock:
+            return self.db.execute('SELECT 1 FROM sessions WHERE session_id = ?',
+                                   (session_id,)).fetchone() is not None
+
+    def __len__(self):
+        self.flush()
+        with self.db_lock:
+            return self.db.execute('SELECT COUNT(*) FROM sessions').fetchone()[0]
+
+    def expire(self, max_idle):
+        self.flush()
+        cutoff = time.time() - max_idle
+        with self.db_lock:
+            expired = self.db.execute('SELECT session_id, player_name FROM sessions '
+                                      'WHERE last_activity < ?', (cutoff,)).fetchall()
+        for session_id, _ in expired:
+            self.delete(session_id)
+        return expired
+
+    # ===== WRITE-BEHIND =====
+
+    def flush(self):
+        """Save queued rows and access times in one transaction, returns the row count"""
+        with self.lock:
+            rows = list(self.pending.values())
+            touches = [(last_activity, session_id) for session_id, last_activity in self.touched.items()]
+            self.pending = {}
+            self.touched = {}
+        if not rows and not touches:
+            return 0
+        with self.db_lock:
+            self.db.execute('BEGIN')
+            try:
+                self.db.executemany(f'INSERT OR REPLACE INTO sessions (session_id, {self.COLUMNS}) '
+                                    'VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+                self.db.executemany('UPDATE sessions SET last_activity = ? WHERE session_id = ?', touches)
+                self.db.execute('COMMIT')
+            except sqlite3.Error:
+                self.db.execute('ROLLBACK')
+                with self.lock:
+                    # Keep the rows for the next attempt unless a newer put() replaced them
+                    for row in rows:
+                        self.pending.setdefault(row[0], row)
+                raise
+        return len(rows)
+
+    def _write_behind(self):
+        while not self.closed.wait(self.flush_interval):
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                print(f"⚠️ Session write-behind failed: {e}")
+
+    def close(self):
+        if self.closed.is_set():
+            return
+        self.closed.set()
+        self.writer.join()
+        self.flush()
+        with self.db_lock:
+            self.db.close()
+
+def create_session_store(strategy_factory=create_strategy):
+    """Session store picked by SESSION_STORE (memory or sqlite) and SESSION_DB"""
+    kind = os.environ.get('SESSION_STORE', 'memory').lower()
+    if kind == 'memory':
+        return MemorySessionStore(strategy_factory)
+    if kind == 'sqlite':
+        path = os.environ.get('SESSION_DB', DEFAULT_SESSION_DB)
+        hot_size = int(os.environ.get('SESSION_HOT_SIZE', DEFAULT_HOT_SESSIONS))
+        shared = os.environ.get('SESSION_SHARED', '0').lower() in ('1', 'true', 'yes')
+        print(f"🗄️ Sessions stored in SQLite: {path} (hot LRU of {hot_size}{', shared' if shared else ''})")
+        return SQLiteSessionStore(path, hot_size, strategy_factory=strategy_factory, shared=shared)
+    raise ValueError(f"Unknown SESSION_STORE '{kind}'. Available: memory, sqlite")
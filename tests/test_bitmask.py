@@ -0,0 +1,70 @@
+# tests/test_bitmask.py
+# The bitmask engine (core/bitmask.py) must agree with the card rules (core/rules.py)
+
+import random
+from itertools import combinations
+
+from core.bitmask import (PLAY_TYPE_NAMES, beats_play, card_bit, cards_to_mask, classify,
+                          generate_plays, mask_to_cards)
+from core.deck import Deck
+from core.rules import beats, get_play_type
+
+def random_hand(rng, size=13):
+    return cards_to_mask(rng.sample(Deck().cards, size))
+
+def all_plays(hand):
+    """Every valid combination in a hand mask, by brute force over its subsets"""
+    cards = mask_to_cards(hand)
+    plays = []
+    for size in range(1, len(cards) + 1):
+        for combo in combinations(cards, size):
+            play = classify(cards_to_mask(combo))
+            if play is not None:
+                plays.append(play)
+    return plays
+
+def test_masks_round_trip():
+    rng = random.Random(0)
+    for _ in range(50):
+        cards = rng.sample(Deck().cards, rng.randint(0, 13))
+        decoded = mask_to_cards(cards_to_mask(cards))
+        assert [card_bit(card) for card in decoded] == sorted(card_bit(card) for card in cards)
+        assert sorted(map(str, decoded)) == sorted(map(str, cards))
+
+def test_classify_matches_get_play_type():
+    rng = random.Random(1)
+    for hand in (random_hand(rng, 9) for _ in range(30)):
+        cards = mask_to_cards(hand)
+        for size in range(1, 7):
+            for combo in combinations(cards, size):
+                play = classify(cards_to_mask(combo))
+                kind = PLAY_TYPE_NAMES[play[1]] if play else None
+                assert kind == get_play_type(list(combo)), combo
+
+def test_beats_play_matches_beats():
+    rng = random.Random(2)
+    for _ in range(6):
+        plays = all_plays(random_hand(rng, 10)) + all_plays(random_hand(rng, 10))
+        rng.shuffle(plays)
+        for play in plays[:150]:
+            for table in plays[:150]:
+                assert beats_play(play, table) == beats(mask_to_cards(play[0]), mask_to_cards(table[0])), \
+                    (mask_to_cards(play[0]), mask_to_cards(table[0]))
+
+def shape(play):
+    return play[1], play[2], play[3]
+
+def test_generate_plays_matches_beats():
+    rng = random.Random(3)
+    for _ in range(12):
+        hand = random_hand(rng)
+        candidates = all_plays(hand)
+        for table in [None] + rng.sample(all_plays(random_hand(rng)), 20):
+            generated = generate_plays(hand, table)
+            for play in generated:
+                assert play[0] & hand == play[0]
+                assert classify(play[0]) == play
+            table_cards = mask_to_cards(table[0]) if table else []
+            # Runs use the weakest suits below their top card, so compare shapes
+            expected = {shape(play) for play in candidates if beats(mask_to_cards(play[0]), table_cards)}
+            assert {shape(play) for play in generated} == expected
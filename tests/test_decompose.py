@@ -0,0 +1,56 @@
+# tests/test_decompose.py
+# Fewest-plays decomposition and suggested plays (core/decompose.py)
+
+import random
+from functools import lru_cache
+from itertools import combinations
+
+from core.bitmask import cards_to_mask, classify, generate_plays, mask_to_cards
+from core.deck import Deck
+from core.decompose import decompose, min_plays, suggest_play
+
+@lru_cache(maxsize=None)
+def brute_min_plays(hand):
+    """Fewest plays for a hand mask, trying every combination that takes its lowest card"""
+    if not hand:
+        return 0
+    low = hand & -hand
+    cards = mask_to_cards(hand ^ low)
+    best = None
+    for size in range(len(cards) + 1):
+        for combo in combinations(cards, size):
+            mask = low | cards_to_mask(combo)
+            if classify(mask) is not None:
+                count = 1 + brute_min_plays(hand ^ mask)
+                best = count if best is None else min(best, count)
+    return best
+
+def random_hands(seed, count, low=1, high=8):
+    rng = random.Random(seed)
+    return [cards_to_mask(rng.sample(Deck().cards, rng.randint(low, high))) for _ in range(count)]
+
+def test_min_plays_is_the_fewest():
+    for hand in random_hands(1, 150):
+        assert min_plays(hand) == brute_min_plays(hand)
+
+def test_decompose_splits_the_hand():
+    for hand in random_hands(2, 150, high=13):
+        plays = decompose(hand)
+        assert len(plays) == min_plays(hand)
+        covered = 0
+        for play in plays:
+            assert play is not None and classify(play[0]) == play
+            assert not covered & play[0]
+            covered |= play[0]
+        assert covered == hand
+
+def test_suggest_play_is_legal():
+    rng = random.Random(3)
+    for hand in random_hands(3, 60, low=5, high=13):
+        table = rng.choice(generate_plays(cards_to_mask(rng.sample(Deck().cards, 13))))
+        for against in (None, table):
+            play = suggest_play(hand, against)
+            if play is None:
+                assert against is not None
+            else:
+                assert play in generate_plays(hand, against)
@@ -0,0 +1,96 @@
+# tests/test_endgame.py
+# Exact endgame search (core/endgame.py) against a plain paranoid search
+
+import random
+from itertools import combinations
+
+from core.bitmask import FULL_DECK
+from core.endgame import ROOT_KEYS, EndgameSolver
+from core.state import GameState
+from core.strategy import Observation, SearchBudget, legal_moves
+from core.zobrist import TranspositionCache
+
+def brute_wins(state, root, seen=None):
+    """Does root go out first whatever the others do? (no pruning, no hashing)"""
+    if state.winner is not None:
+        return state.winner == root
+    seen = {} if seen is None else seen
+    key = (tuple(state.hands), state.table, state.passes, state.turn, state.leader)
+    if key not in seen:
+        results = []
+        for move in state.legal_moves():
+            record = state.apply(move)
+            results.append(brute_wins(state, root, seen))
+            state.undo(move, record)
+        seen[key] = any(results) if state.turn == root else all(results)
+    return seen[key]
+
+def own_solver(**options):
+    solver = EndgameSolver(seed=0, **options)
+    solver.table = TranspositionCache(10000)  # Keep the shared table out of the comparison
+    return solver
+
+def random_hands(rng, sizes):
+    cards = rng.sample(range(52), sum(sizes))
+    hands = []
+    for size in sizes:
+        mask = 0
+        for index in cards[:size]:
+            mask |= 1 << index
+        cards = cards[size:]
+        hands.append(mask)
+    return hands
+
+def test_wins_matches_brute_force():
+    rng = random.Random(1)
+    solver = own_solver()
+    for _ in range(60):
+        hands = random_hands(rng, [rng.randint(1, 3) for _ in range(4)])
+        turn = rng.randrange(4)
+        state = GameState(hands, turn=turn)
+        for root in range(4):
+            solver.nodes = 0
+            expected = brute_wins(state.copy(), root)
+            assert solver._wins(state, root, ROOT_KEYS[root], SearchBudget()) == expected
+            assert state.hash == state.compute_hash()  # The search leaves the state as it was
+
+def observation_for(hands, seat):
+    hand = hands[seat]
+    return Observation(
+        seat=seat, player_name='Bot', hand=(), hand_mask=hand, table=(), table_play=None,
+        last_player_index=None, hand_sizes=tuple(mask.bit_count() for mask in hands),
+        played_mask=FULL_DECK & ~sum(hands), pass_count=0, round_number=2,
+        is_lead=True, is_first_play_of_game=False)
+
+def test_solve_picks_a_move_winning_the_most_deals():
+    rng = random.Random(2)
+    for _ in range(40):
+        hands = random_hands(rng, [3, 2, 1, 1])
+        observation = observation_for(hands, 0)
+        moves = legal_moves(observation)
+        unseen = [index for index in range(52) if (hands[1] | hands[2] | hands[3]) >> index & 1]
+
+        # Wins of every move over every deal of the unseen cards (2, 1 and 1 cards: 12 deals)
+        wins = [0] * len(moves)
+        for first in combinations(unseen, 2):
+            rest = [index for index in unseen if index not in first]
+            for second in rest:
+                deal = [hands[0], (1 << first[0]) | (1 << first[1]), 1 << second,
+                        sum(1 << index for index in rest if index != second)]
+                state = GameState(deal, turn=0)
+                for position, move in enumerate(moves):
+                    record = state.apply(move)
+                    wins[position] += brute_wins(state, 0)
+                    state.undo(move, record)
+
+        solved, move = own_solver().solve(observation, moves, SearchBudget())
+        if max(wins) == 0:
+            assert not solved
+        else:
+            assert solved and wins[moves.index(move)] == max(wins)
+
+def test_does_not_apply_to_big_hands():
+    hands = random_hands(random.Random(3), [8, 5, 5, 5])
+    solved, move = own_solver().solve(observation_for(hands, 0), legal_moves(observation_for(hands, 0)),
+                                      SearchBudget())
+    assert (solved, move) == (False, None)
@@ -0,0 +1,56 @@
+# tests/test_history.py
+# PlayHistory (core/history.py): running counters, round index and play pointers
+
+import random
+
+from core.game import Game
+
+def played_game(seed, moves=150):
+    random.seed(seed)
+    game = Game()
+    for _ in range(moves):
+        if game.is_game_over() or game.check_automatic_wins()[0]:
+            break
+        game.bot_turn(game.players[game.current_player_index])
+    return game
+
+def check_against_records(history):
+    records = list(history)
+    for seat in range(4):
+        mine = [record for record in records if record.player_index == seat]
+        assert history.player_stats(seat) == {
+            'plays_made': sum(not record.is_pass for record in mine),
+            'passes_made': sum(record.is_pass for record in mine),
+            'bombs_used': sum(record.is_bomb for record in mine),
+            'cards_shed': sum(record.mask.bit_count() for record in mine),
+            'rounds_won': sum(winner == seat for _, winner in history.round_wins)
+        }
+    played = 0
+    for record in records:
+        played |= record.mask
+    assert history.played_mask == played
+    for round_number in {record.round_number for record in records}:
+        assert history.round_plays(round_number) == \
+            [record for record in records if record.round_number == round_number]
+        plays = [record for record in records if record.round_number == round_number and not record.is_pass]
+        if records[-1].round_number == round_number:
+            assert list(history.iter_plays_reversed(round_number)) == plays[::-1]
+    plays = [record for record in records if not record.is_pass]
+    assert history.last_play_record() is (plays[-1] if plays else None)
+
+def test_counters_match_the_records():
+    for seed in range(5):
+        check_against_records(played_game(seed).play_history)
+
+def test_truncate_rolls_the_counters_back():
+    history = played_game(11).play_history
+    while len(history):
+        history.truncate(max(0, len(history) - 7))
+        check_against_records(history)
+
+def test_records_read_like_the_old_dicts():
+    record = played_game(12, moves=3).play_history[0]
+    assert record['player'] == record.get('player') == record.player
+    assert record['cards'] == record.cards and record['round'] == record.round_number
+    assert record.get('missing', 'default') == 'default'
+    assert set(record.to_dict()) == set(record.keys())
@@ -0,0 +1,98 @@
+# tests/test_matchmaking.py
+# Matchmaking queue (server/matchmaking.py)
+
+import time
+
+import pytest
+
+from server.api import MatchAPI
+from server.matchmaking import Matchmaker, Ticket
+from server.rooms import RoomManager
+
+@pytest.fixture
+def matchmaker():
+    done = []
+    matchmaker = Matchmaker(RoomManager(), bot_fill_seconds=10, on_match=done.append)
+    matchmaker.stopped.set()  # No matcher thread: the tests run match_once themselves
+    matchmaker.done = done
+    yield matchmaker
+    matchmaker.pool.shutdown(wait=True)
+
+def finish(matchmaker):
+    """Wait for the rooms being opened"""
+    matchmaker.pool.shutdown(wait=True)
+
+def test_groups_players_by_four(matchmaker):
+    tickets = [matchmaker.enqueue(f'P{i}') for i in range(10)]
+    assert matchmaker.match_once() == 2
+    finish(matchmaker)
+
+    matched = tickets[:8]
+    assert all(ticket.status == Ticket.MATCHED for ticket in matched)
+    assert all(ticket.status == Ticket.WAITING for ticket in tickets[8:])
+    rooms = {}
+    for ticket in matched:
+        rooms.setdefault(ticket.room_id, []).append(ticket)
+    assert len(rooms) == 2
+    for room_id, group in rooms.items():
+        room = matchmaker.rooms.get(room_id)
+        assert room.started and sorted(ticket.seat for ticket in group) == [0, 1, 2, 3]
+        for ticket in group:
+            assert room.view(ticket.token)['seat'] == ticket.seat
+    assert sorted(ticket.ticket_id for ticket in matchmaker.done) == sorted(t.ticket_id for t in matched)
+    assert matchmaker.metrics()['queue_depth'] == 2
+
+def test_bots_fill_the_table_after_the_wait(matchmaker):
+    tickets = [matchmaker.enqueue(f'P{i}') for i in range(3)]
+    assert matchmaker.match_once() == 0
+    assert matchmaker.match_once(now=time.time() + 11) == 1
+    finish(matchmaker)
+
+    assert {ticket.room_id for ticket in tickets} == {tickets[0].room_id}
+    room = matchmaker.rooms.get(tickets[0].room_id)
+    assert room.human_seats() == [0, 1, 2]
+    metrics = matchmaker.metrics()
+    assert (metrics['matched_players'], metrics['tables'], metrics['bot_seats']) == (3, 1, 1)
+    assert metrics['queue_depth'] == 0 and metrics['wait_ms']['samples'] == 3
+
+def test_cancelled_tickets_are_skipped(matchmaker):
+    tickets = [matchmaker.enqueue(f'P{i}') for i in range(5)]
+    assert matchmaker.cancel(tickets[1].ticket_id)
+    assert not matchmaker.cancel('unknown')
+    assert matchmaker.match_once() == 1
+    finish(matchmaker)
+
+    assert tickets[1].status == Ticket.CANCELLED and tickets[1].room_id is None
+    assert all(ticket.status == Ticket.MATCHED for ticket in tickets[:1] + tickets[2:])
+    assert not matchmaker.cancel(tickets[0].ticket_id)  # Already seated
+    assert matchmaker.metrics()['cancelled'] == 1
+
+def test_failed_tables_are_reported(matchmaker, monkeypatch):
+    def broken(player_names, bot_strategies=None):
+        raise RuntimeError('no tables today')
+    monkeypatch.setattr(matchmaker.rooms, 'open_table', broken)
+    tickets = [matchmaker.enqueue(f'P{i}') for i in range(4)]
+    matchmaker.match_once()
+    finish(matchmaker)
+
+    assert all(ticket.status == Ticket.FAILED for ticket in tickets)
+    assert tickets[0].info()['error'] == 'no tables today'
+    assert matchmaker.metrics()['failed'] == 4
+
+def test_match_api_answers_errors_as_payloads(matchmaker):
+    api = MatchAPI(matchmaker)
+    payload, status = api.join({'player_name': 'Ann'})
+    assert status == 200 and payload['ticket']['status'] == Ticket.WAITING
+    assert api.status({'ticket_id': 'unknown'}) == ({'success': False, 'error': 'Unknown or expired ticket'}, 200)
+    assert api.join(['not', 'an', 'object'])[1] == 500
+    assert api.metrics({})[0]['queue_depth'] == 1
+
+def test_metrics_skip_cancelled_waiting_tickets(matchmaker):
+    first = matchmaker.enqueue('First')
+    first.enqueued_at -= 5
+    matchmaker.enqueue('Second')
+    matchmaker.match_once()
+    assert matchmaker.metrics()['oldest_wait_seconds'] >= 5
+    matchmaker.cancel(first.ticket_id)
+    metrics = matchmaker.metrics()
+    assert metrics['queue_depth'] == 1 and metrics['oldest_wait_seconds'] < 5
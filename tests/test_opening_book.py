@@ -0,0 +1,44 @@
+# tests/test_opening_book.py
+# The opening book of round leads (core/opening_book.py)
+
+import random
+
+from core.bitmask import cards_to_mask, generate_plays
+from core.deck import Deck
+from core.decompose import pack_histogram, suggest_play
+from core.opening_book import OpeningBook, build_book, encode_shape, play_from_shape, recommend_lead
+
+def random_hands(seed, count, high):
+    rng = random.Random(seed)
+    return [cards_to_mask(rng.sample(Deck().cards, rng.randint(1, high))) for _ in range(count)]
+
+def test_book_matches_suggest_play(tmp_path):
+    path = str(tmp_path / 'book.bin')
+    build_book(path, max_cards=4)
+    book = OpeningBook(path)
+    try:
+        for hand in random_hands(4, 200, high=4):
+            shape = book.lookup(pack_histogram(hand))
+            assert shape == encode_shape(suggest_play(hand))
+            play = play_from_shape(hand, shape)
+            assert play in generate_plays(hand)
+    finally:
+        book.close()
+
+def test_recommend_lead_without_a_book_uses_suggest_play(monkeypatch):
+    monkeypatch.setattr('core.opening_book.get_book', lambda: None)
+    for hand in random_hands(5, 30, high=13):
+        assert recommend_lead(hand) == suggest_play(hand)
+
+def test_recommend_lead_reads_the_book(tmp_path, monkeypatch):
+    path = str(tmp_path / 'book.bin')
+    build_book(path, max_cards=4)
+    book = OpeningBook(path)
+    monkeypatch.setattr('core.opening_book.get_book', lambda: book)
+    try:
+        for hand in random_hands(6, 100, high=4):
+            assert encode_shape(recommend_lead(hand)) == encode_shape(suggest_play(hand))
+            lowest = hand & -hand
+            assert recommend_lead(hand, must_include=lowest) == suggest_play(hand, None, lowest)
+    finally:
+        book.close()
@@ -0,0 +1,89 @@
+# tests/test_rooms.py
+# Multiplayer rooms (server/rooms.py)
+
+import random
+import threading
+import time
+
+import pytest
+
+from core.card import RANKS, SUITS, Card
+from server.rooms import Room, RoomError
+
+def deal_four_twos(room, seat):
+    """Give seat all four 2s; no hand holds any other automatic win"""
+    game = room.game
+    # One card of each rank per seat: no pairs, no four 3s
+    hands = [[Card(rank, suit) for rank in RANKS] for suit in SUITS]
+    for other in range(4):
+        if other != seat:
+            # Swap the other seat's 2 for a different rank of seat's hand
+            give = next(card for card in hands[seat] if card.rank == 4 + other)
+            hands[seat][hands[seat].index(give)] = hands[other][0]
+            hands[other][0] = give
+    for player, hand in zip(game.players, hands):
+        player.hand = hand
+        player.sort_hand()
+    game.position_hash = game.compute_position_hash()
+
+@pytest.mark.parametrize('winner_seat', [1, 0])
+def test_automatic_win_ends_the_room_game(winner_seat):
+    room = Room('test', humans=1)
+    deal_four_twos(room, winner_seat)
+    room.game.current_player_index = 1  # A bot is to move
+    seat, token = room.join('Alice')
+
+    game = room.game
+    assert game.is_game_over()
+    assert game.get_winner() is game.players[winner_seat]
+    assert room.view(token)['state']['game_over']
+    with pytest.raises(RoomError, match='already over'):
+        room.pass_turn(token)
+
+def test_humans_take_seats_and_bots_play_the_rest():
+    room = Room('test', humans=2)
+    host_seat, host = room.join('Alice')
+    assert not room.started
+    with pytest.raises(RoomError):
+        room.pass_turn(host)
+    guest_seat, guest = room.join('Alice')
+    assert (host_seat, guest_seat) == (0, 1)
+    assert room.started
+    assert room.game.players[1].name == 'Alice (2)'
+    # The bots have moved: a person is to move, or the game is over
+    game = room.game
+    assert game.is_game_over() or room.seats[game.current_player_index] is not None
+    with pytest.raises(RoomError):
+        room.join('Carol')
+
+def test_listeners_get_versions_in_order():
+    for trial in range(3):
+        room = Room(f'race{trial}', humans=4)
+        received = []
+        rng = random.Random(trial)
+
+        def listener(event):
+            time.sleep(rng.random() / 500)  # Widen the window between threads
+            received.append(event.version)
+        room.subscribe(listener)
+
+        def player(index):
+            seat, token = room.join(f'P{index}')
+            for _ in range(300):
+                if room.game.is_game_over():
+                    return
+                try:
+                    room.pass_turn(token)
+                except RoomError:
+                    try:
+                        room.play_cards(token, [str(room.game.players[seat].hand[0])])
+                    except (RoomError, IndexError):
+                        time.sleep(0.0005)
+
+        threads = [threading.Thread(target=player, args=(index,)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(received) > 4
+        assert received == list(range(1, room.version + 1))
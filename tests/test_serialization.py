@@ -0,0 +1,43 @@
+# tests/test_serialization.py
+# Per-seat states spliced from one encoded public state (server/serialization.py)
+
+import json
+import random
+
+from core.game import Game
+from server.serialization import StateViews, serialize_game_state, serialize_public_state
+
+def positions(seed, count=60):
+    """The game after each of count bot moves"""
+    random.seed(seed)
+    game = Game()
+    yield game
+    for _ in range(count):
+        if game.is_game_over() or game.check_automatic_wins()[0]:
+            return
+        game.bot_turn(game.players[game.current_player_index])
+        yield game
+
+def test_encoded_seats_match_serialize_game_state():
+    checked = 0
+    for seed in range(6):
+        for game in positions(seed):
+            views = StateViews(game)
+            for seat in range(len(game.players)):
+                expected = serialize_game_state(game, seat)
+                assert json.loads(views.encoded(seat)) == expected
+                assert views.state(seat) == expected
+                checked += 1
+    assert checked > 400
+
+def test_public_state_has_no_hands():
+    game = Game()
+    public = json.loads(StateViews(game).public_json)
+    assert public == serialize_public_state(game)
+    assert 'player_hand' not in public and 'current_player_cards' not in public['summary']
+
+def test_encoded_falls_back_without_summary_first():
+    game = Game()
+    views = StateViews(game)
+    views.public_json = json.dumps(dict(reversed(list(views.public.items()))), separators=(',', ':'))
+    assert json.loads(views.encoded(1)) == serialize_game_state(game, 1)
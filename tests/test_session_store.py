@@ -0,0 +1,96 @@
+# tests/test_session_store.py
+# SQLite session store (server/session_store.py): write-behind, hot tier and shared mode
+
+import time
+
+import pytest
+
+from core.game import Game
+from core.snapshot import dump_game
+from server.session_store import SessionConflict, SQLiteSessionStore
+
+def new_session(name='Ann'):
+    now = time.time()
+    return {'game': Game(), 'created_at': now, 'last_activity': now,
+            'player_name': name, 'is_fresh_game': True}
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'sessions.db')
+
+def open_store(path, **options):
+    # No writer passes during a test: rows are only written by flush() and close()
+    return SQLiteSessionStore(path, flush_interval=3600, **options)
+
+def test_save_flush_reload(db_path):
+    store = open_store(db_path)
+    session = new_session()
+    store.put('s1', session)
+    assert store.pending and store.flush() == 1 and not store.pending
+    store.close()
+
+    reopened = open_store(db_path)
+    try:
+        loaded = reopened.get('s1')
+        assert loaded is not session
+        assert dump_game(loaded['game']) == dump_game(session['game'])
+        assert (loaded['player_name'], loaded['is_fresh_game'], loaded['version']) == ('Ann', True, 1)
+        assert 's1' in reopened and len(reopened) == 1
+    finally:
+        reopened.close()
+
+def test_close_flushes_pending_writes(db_path):
+    store = open_store(db_path)
+    for index in range(3):
+        store.put(f's{index}', new_session(f'P{index}'))
+    assert len(store.pending) == 3
+    store.close()
+
+    reopened = open_store(db_path)
+    try:
+        assert [reopened.get(f's{index}')['player_name'] for index in range(3)] == ['P0', 'P1', 'P2']
+    finally:
+        reopened.close()
+
+def test_hot_tier_drops_sessions_without_losing_them(db_path):
+    store = open_store(db_path, hot_size=2)
+    try:
+        games = {}
+        for index in range(4):
+            session = new_session(f'P{index}')
+            games[f's{index}'] = dump_game(session['game'])
+            store.put(f's{index}', session)
+        assert len(store.hot) == 2
+        # s0 is no longer hot: it comes back from the queued row, then from the file
+        assert dump_game(store.get('s0')['game']) == games['s0']
+        store.flush()
+        store.hot.clear()
+        assert {session_id: dump_game(store.get(session_id)['game']) for session_id in games} == games
+    finally:
+        store.close()
+
+def test_shared_stores_detect_conflicts(db_path):
+    first = open_store(db_path, shared=True)
+    second = open_store(db_path, shared=True)
+    try:
+        first.put('s1', new_session())
+        mine = second.get('s1')
+        assert mine['version'] == 1
+
+        theirs = first.get('s1')
+        theirs['game'].players[0].name = 'Changed'
+        first.put('s1', theirs)
+        with pytest.raises(SessionConflict):
+            second.put('s1', mine)
+
+        # The next read picks up the other process's save and can be saved again
+        reloaded = second.get('s1')
+        assert reloaded['version'] == 2 and reloaded['game'].players[0].name == 'Changed'
+        second.put('s1', reloaded)
+        assert first.get('s1')['version'] == 3
+
+        with pytest.raises(SessionConflict):
+            second.put('s1', new_session())  # Same id created twice
+    finally:
+        first.close()
+        second.close()
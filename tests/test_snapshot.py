@@ -0,0 +1,61 @@
+# tests/test_snapshot.py
+# Binary game snapshots (core/snapshot.py)
+
+import random
+
+import pytest
+
+from core.game import Game
+from core.snapshot import dump_game, load_game
+from core.strategy import create_strategy
+from server.serialization import serialize_game_state
+
+def played_game(seed, moves):
+    random.seed(seed)
+    game = Game()
+    for _ in range(moves):
+        if game.is_game_over() or game.check_automatic_wins()[0]:
+            break
+        game.bot_turn(game.players[game.current_player_index])
+    return game
+
+def same_game(copy, game):
+    assert serialize_game_state(copy) == serialize_game_state(game)
+    assert copy.position_hash == game.position_hash
+    assert [[str(card) for card in player.hand] for player in copy.players] == \
+           [[str(card) for card in player.hand] for player in game.players]
+    assert [record.to_dict() | {'timestamp': None} for record in copy.play_history] == \
+           [record.to_dict() | {'timestamp': None} for record in game.play_history]
+    assert [copy.play_history.player_stats(seat) for seat in range(4)] == \
+           [game.play_history.player_stats(seat) for seat in range(4)]
+
+@pytest.mark.parametrize('moves', [0, 5, 40, 200])
+def test_round_trip(moves):
+    game = played_game(moves, moves)
+    game.set_strategy(2, create_strategy('montecarlo'))
+    copy = load_game(dump_game(game))
+    same_game(copy, game)
+    assert copy.get_strategy(2).name == 'montecarlo'
+    assert dump_game(copy) == dump_game(game)
+
+def test_history_keeps_the_names_at_play_time():
+    game = played_game(3, 20)
+    game.players[1].name = 'Renamed'
+    copy = load_game(dump_game(game))
+    assert [record.player for record in copy.play_history] == \
+           [record.player for record in game.play_history]
+
+def test_undo_works_after_a_restore():
+    game = played_game(4, 40)
+    copy = load_game(dump_game(game))
+    assert len(copy.undo_stack) == len(game.undo_stack)
+    while game.undo_stack:
+        assert copy.undo() == game.undo()
+        same_game(copy, game)
+    assert not copy.can_undo()
+
+def test_rejects_other_data():
+    with pytest.raises(ValueError):
+        load_game(b'not a snapshot')
+    with pytest.raises(ValueError):
+        load_game(dump_game(Game())[:-3])
@@ -0,0 +1,29 @@
+# tests/test_state.py
+# GameState (core/state.py): apply/undo and the incremental Zobrist hash
+
+import random
+
+from core.game import Game
+from core.state import GameState
+
+def fields(state):
+    return (list(state.hands), state.table, state.passes, state.turn, state.leader,
+            state.round_number, state.winner, state.hash)
+
+def test_apply_undo_restores_the_state():
+    rng = random.Random(5)
+    for _ in range(20):
+        state = GameState.from_game(Game())
+        steps = []
+        while not state.is_over() and len(steps) < 200:
+            before = fields(state)
+            move = rng.choice(state.legal_moves())
+            steps.append((move, state.apply(move), before))
+            assert state.hash == state.compute_hash()
+        for move, record, before in reversed(steps):
+            state.undo(move, record)
+            assert fields(state) == before
+
+def test_hash_matches_the_game():
+    game = Game()
+    assert GameState.from_game(game).hash == game.position_hash == game.compute_position_hash()
@@ -0,0 +1,45 @@
+# tests/test_undo.py
+# Exact undo of Game moves (Game.undo / undo_to_player)
+
+import random
+
+from core.game import Game
+from server.serialization import serialize_game_state
+
+def snapshot(game):
+    return (serialize_game_state(game), game.position_hash,
+            [[str(card) for card in player.hand] for player in game.players],
+            [player.has_passed for player in game.players],
+            game.play_history.player_stats(0), len(game.play_history))
+
+def play_bots(game, moves):
+    states = []
+    for _ in range(moves):
+        if game.is_game_over() or game.check_automatic_wins()[0]:
+            break
+        states.append(snapshot(game))
+        game.bot_turn(game.players[game.current_player_index])
+    return states
+
+def test_undo_restores_every_earlier_state():
+    random.seed(7)
+    for _ in range(10):
+        game = Game()
+        states = play_bots(game, 80)
+        assert len(game.undo_stack) == len(states)
+        for before in reversed(states):
+            success, _ = game.undo()
+            assert success
+            assert snapshot(game) == before
+        assert game.undo() == (False, "Nothing to undo")
+
+def test_undo_to_player_reverts_the_bot_replies():
+    random.seed(8)
+    game = Game()
+    states = play_bots(game, 12)
+    movers = [entry[0] for entry in game.undo_stack]
+    assert 0 in movers  # Seat 0 is played by a bot here too
+    last = len(movers) - 1 - movers[::-1].index(0)
+    success, _, undone = game.undo_to_player(0)
+    assert success and undone == len(movers) - last
+    assert snapshot(game) == states[last]
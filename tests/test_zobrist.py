@@ -0,0 +1,65 @@
+# tests/test_zobrist.py
+# Incremental Game.position_hash and the TranspositionCache
+
+import random
+
+from core.game import Game
+from core.state import GameState
+from core.zobrist import TranspositionCache
+
+def assert_hash_in_sync(game):
+    assert game.position_hash == game.compute_position_hash()
+    assert game.position_hash == GameState.from_game(game).compute_hash()
+
+def test_position_hash_follows_plays_passes_and_rounds():
+    random.seed(11)
+    rounds_crossed = 0
+    for _ in range(10):
+        game = Game()
+        assert_hash_in_sync(game)
+        moves = 0
+        while moves < 200 and not game.is_game_over() and not game.check_automatic_wins()[0]:
+            round_before = game.round_number
+            game.bot_turn(game.players[game.current_player_index])
+            assert_hash_in_sync(game)
+            rounds_crossed += game.round_number - round_before
+            moves += 1
+        while game.can_undo():
+            game.undo()
+            assert_hash_in_sync(game)
+    assert rounds_crossed > 0
+
+def test_reset_round_rehashes():
+    random.seed(3)
+    game = Game()
+    game.bot_turn(game.players[game.current_player_index])
+    assert game.last_play
+    game.reset_round()
+    assert_hash_in_sync(game)
+
+def test_cache_evicts_least_recently_used():
+    cache = TranspositionCache(max_entries=2)
+    cache.put(1, 'a')
+    cache.put(2, 'b')
+    assert cache.get(1) == 'a'
+    cache.put(3, 'c')
+    assert 2 not in cache
+    assert 1 in cache and 3 in cache
+    assert len(cache) == 2
+    cache.put(1, 'A')
+    cache.put(4, 'd')
+    assert 3 not in cache
+    assert cache.get(1) == 'A'
+
+def test_cache_stats():
+    cache = TranspositionCache(max_entries=10)
+    assert cache.stats()['hit_rate'] == 0.0
+    cache.put(1, 'a')
+    cache.get(1)
+    cache.get(1)
+    assert cache.get(2, 'missing') == 'missing'
+    assert cache.stats() == {'entries': 1, 'max_entries': 10, 'hits': 2,
+                             'misses': 1, 'hit_rate': 0.667}
+    cache.clear()
+    assert cache.stats() == {'entries': 0, 'max_entries': 10, 'hits': 0,
+                             'misses': 0, 'hit_rate': 0.0}